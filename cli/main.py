@@ -39,6 +39,17 @@ app = typer.Typer(
 )
 
 
+SECTION_TITLES = {
+    "market_report": "Market Analysis",
+    "sentiment_report": "Social Sentiment",
+    "news_report": "News Analysis",
+    "fundamentals_report": "Fundamentals Analysis",
+    "investment_plan": "Research Team Decision",
+    "trader_investment_plan": "Trading Team Plan",
+    "final_trade_decision": "Portfolio Management Decision",
+}
+
+
 # Create a deque to store recent messages with a maximum length
 class MessageBuffer:
     def __init__(self, max_length=100):
@@ -75,6 +86,8 @@ class MessageBuffer:
             "trader_investment_plan": None,
             "final_trade_decision": None,
         }
+        # Text an agent is still writing, per section: (agent, partial text)
+        self.streaming = {}
 
     def add_message(self, message_type, content):
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
@@ -92,8 +105,20 @@ class MessageBuffer:
     def update_report_section(self, section_name, content):
         if section_name in self.report_sections:
             self.report_sections[section_name] = content
+            self.streaming.pop(section_name, None)
             self._update_current_report()
 
+    def add_report_delta(self, section_name, agent, text):
+        """Append streamed text of *agent* to the section it is writing and show it."""
+        if section_name not in self.report_sections:
+            return
+        current_agent, partial = self.streaming.get(section_name, (agent, ""))
+        if current_agent != agent:
+            partial = ""
+        partial += text
+        self.streaming[section_name] = (agent, partial)
+        self.current_report = f"### {SECTION_TITLES[section_name]} · {agent}\n{partial}"
+
     def _update_current_report(self):
         # For the panel display, only show the most recently updated section
         latest_section = None
@@ -107,17 +132,8 @@ class MessageBuffer:
                
         if latest_section and latest_content:
             # Format the current section for display
-            section_titles = {
-                "market_report": "Market Analysis",
-                "sentiment_report": "Social Sentiment",
-                "news_report": "News Analysis",
-                "fundamentals_report": "Fundamentals Analysis",
-                "investment_plan": "Research Team Decision",
-                "trader_investment_plan": "Trading Team Plan",
-                "final_trade_decision": "Portfolio Management Decision",
-            }
             self.current_report = (
-                f"### {section_titles[latest_section]}\n{latest_content}"
+                f"### {SECTION_TITLES[latest_section]}\n{latest_content}"
             )
 
         # Update the final complete report
@@ -827,6 +843,7 @@ def run_analysis(selections=None, company_name=None):
         # Reset report sections
         for section in message_buffer.report_sections:
             message_buffer.report_sections[section] = None
+        message_buffer.streaming.clear()
         message_buffer.current_report = None
         message_buffer.final_report = None
 
@@ -853,11 +870,26 @@ def run_analysis(selections=None, company_name=None):
         )
         # Add the actual company name to the state
         initial_state["company_name"] = selections["company_name"]
-        args = graph.propagator.get_graph_args()
 
-        # Stream the analysis
+        # Stream the analysis: report text token by token, states as nodes finish
         trace = []
-        for chunk in graph.graph.stream(initial_state, **args):
+        last_render = 0.0
+        for event in graph.stream_events(
+            selections["ticker"], selections["analysis_date"], initial_state
+        ):
+            if event["type"] != "state":
+                message_buffer.update_agent_status(event["agent"], "in_progress")
+                if event["type"] == "token":
+                    message_buffer.add_report_delta(
+                        event["section"], event["agent"], event["text"]
+                    )
+                # Redraw at most ten times per second while tokens arrive
+                if time.monotonic() - last_render >= 0.1:
+                    update_display(layout)
+                    last_render = time.monotonic()
+                continue
+
+            chunk = event["state"]
             if len(chunk["messages"]) > 0:
                 # Get the last message from the chunk
                 last_message = chunk["messages"][-1]
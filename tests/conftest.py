@@ -1,6 +1,13 @@
+import asyncio
 import pytest
 from unittest.mock import Mock, MagicMock
 import datetime
+import time
+
+import pandas as pd
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
 
 @pytest.fixture
 def mock_console():
@@ -122,4 +129,123 @@ def mock_markdown():
 @pytest.fixture
 def mock_spinner():
     """Provide a mocked rich spinner instance."""
-    return Mock()
\ No newline at end of file
+    return Mock()
+
+
+def write_price_csv(path, dates, start_price=100.0):
+    rows = []
+    for i, day in enumerate(dates):
+        price = start_price + i
+        rows.append(
+            {
+                "Date": day,
+                "Open": price,
+                "High": price + 1,
+                "Low": price - 1,
+                "Close": price + 0.5,
+                "Adj Close": price + 0.25,
+                "Volume": 1000 + i,
+            }
+        )
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+@pytest.fixture
+def price_data_dir(tmp_path):
+    data_dir = tmp_path / "data"
+    price_dir = data_dir / "market_data" / "price_data"
+    price_dir.mkdir(parents=True)
+    dates = [d.strftime("%Y-%m-%d") for d in pd.bdate_range("2024-01-01", "2024-03-29")]
+    write_price_csv(price_dir / "TEST-YFin-data-2015-01-01-2025-03-25.csv", dates)
+    from tradingagents.dataflows import interface
+    from tradingagents.dataflows.config import set_config
+
+    previous = interface.DATA_DIR
+    set_config({"data_dir": str(data_dir), "price_store_dir": None})
+    interface.DATA_DIR = str(data_dir)
+    yield price_dir
+    set_config({"data_dir": previous})
+    interface.DATA_DIR = previous
+
+
+@pytest.fixture(autouse=True)
+def fresh_source_health():
+    """Data source health is process-wide; keep breaker state from leaking between tests."""
+    from tradingagents.dataflows.source_health import reset_health_registry
+
+    reset_health_registry()
+    yield
+    reset_health_registry()
+
+
+LLM_SECONDS = 0.05
+
+
+class SleepyChatModel(BaseChatModel):
+    """Answers "BUY" after a delay; the async path sleeps without blocking a thread."""
+
+    delay: float = LLM_SECONDS
+
+    @property
+    def _llm_type(self) -> str:
+        return "sleepy"
+
+    @staticmethod
+    def _result() -> ChatResult:
+        message = AIMessage(
+            content="BUY",
+            usage_metadata={"input_tokens": 10, "output_tokens": 2, "total_tokens": 12},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.delay)
+        return self._result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.delay)
+        return self._result()
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+class NoMemory:
+    def get_memories(self, current_situation, n_matches=1):
+        return []
+
+
+def build_fake_graph(llm=None):
+    """Compile the market + news analyst graph on a fake LLM and empty memories."""
+    from langgraph.prebuilt import ToolNode
+
+    from tradingagents.agents.utils.agent_utils import Toolkit, as_async_tool
+    from tradingagents.graph.conditional_logic import ConditionalLogic
+    from tradingagents.graph.setup import GraphSetup
+
+    llm = llm or SleepyChatModel()
+    tool_nodes = {a: ToolNode([as_async_tool(Toolkit.get_stock_data)]) for a in ["market", "news"]}
+    setup = GraphSetup(
+        llm, llm, Toolkit(), tool_nodes,
+        NoMemory(), NoMemory(), NoMemory(), NoMemory(), NoMemory(), ConditionalLogic(),
+    )
+    return setup.setup_graph(["market", "news"])
+
+
+@pytest.fixture
+def fake_trading_graph(tmp_path, monkeypatch):
+    """A TradingAgentsGraph on the fake graph, logging under tmp_path."""
+    from tradingagents.default_config import DEFAULT_CONFIG
+    from tradingagents.graph.propagation import Propagator
+    from tradingagents.graph.signal_processing import SignalProcessor
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    monkeypatch.chdir(tmp_path)
+    ta = TradingAgentsGraph.__new__(TradingAgentsGraph)
+    ta.debug = False
+    ta.config = DEFAULT_CONFIG.copy()
+    ta.graph = build_fake_graph()
+    ta.propagator = Propagator()
+    ta.signal_processor = SignalProcessor(SleepyChatModel(delay=0))
+    ta.log_states_dict = {}
+    return ta
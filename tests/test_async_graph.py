@@ -0,0 +1,121 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from tradingagents.agents.utils.agent_utils import Toolkit, as_async_tool, create_llm_node
+from tradingagents.dataflows.blocking import reset_blocking_executor, run_blocking
+from tradingagents.dataflows.config import set_config
+from tradingagents.graph.propagation import Propagator
+
+from .conftest import LLM_SECONDS, SleepyChatModel, build_fake_graph
+
+
+@pytest.fixture
+def small_blocking_pool():
+    set_config({"blocking_io_workers": 2})
+    reset_blocking_executor()
+    yield
+    set_config({"blocking_io_workers": 16})
+    reset_blocking_executor()
+
+
+class TestRunBlocking:
+    def test_bounded_pool_and_context(self, small_blocking_pool):
+        request_id = contextvars.ContextVar("request_id")
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def work():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return request_id.get(), threading.current_thread().name
+
+        async def main():
+            request_id.set("r1")
+            return await asyncio.gather(*(run_blocking(work) for _ in range(6)))
+
+        results = asyncio.run(main())
+        assert peak[0] == 2
+        assert all(rid == "r1" and name.startswith("blocking-io") for rid, name in results)
+
+
+class TestAsyncTools:
+    def test_sync_tool_is_offloaded(self):
+        def lookup(ticker: str) -> str:
+            """Look a ticker up."""
+            return f"{ticker} on {threading.current_thread().name}"
+
+        wrapped = as_async_tool(lookup)
+        assert wrapped.invoke({"ticker": "AAPL"}).startswith("AAPL on MainThread")
+        assert asyncio.run(wrapped.ainvoke({"ticker": "AAPL"})).startswith("AAPL on blocking-io")
+
+    def test_native_coroutine_and_decorated_tool(self):
+        async def anews(ticker: str, curr_date: str) -> str:
+            return "async news"
+
+        wrapped = as_async_tool(Toolkit.get_stock_news_openai, anews)
+        assert wrapped.name == "get_stock_news_openai"
+        assert asyncio.run(wrapped.ainvoke({"ticker": "AAPL", "curr_date": "2024-05-10"})) == "async news"
+
+        decorated = as_async_tool(Toolkit.get_stock_individual_info)
+        assert decorated.name == "get_stock_individual_info"
+        assert decorated.args == Toolkit.get_stock_individual_info.args
+        assert "仅支持A股" in asyncio.run(decorated.ainvoke({"ticker": "AAPL"}))
+
+
+class TestLLMNode:
+    def test_sync_and_async_agree(self):
+        threads = []
+
+        def prepare(state):
+            threads.append(threading.current_thread().name)
+            return SleepyChatModel(delay=0), state["question"]
+
+        node = create_llm_node(prepare, lambda state, response: {"answer": response.content})
+        assert node.invoke({"question": "?"}) == {"answer": "BUY"}
+        assert asyncio.run(node.ainvoke({"question": "?"})) == {"answer": "BUY"}
+        assert threads[0] == "MainThread" and threads[1].startswith("blocking-io")
+
+
+class TestAsyncGraph:
+    def test_concurrent_runs_share_one_loop(self):
+        graph = build_fake_graph()
+        runs = 8
+
+        async def main():
+            states = [Propagator().create_initial_state(f"T{i}", "2024-05-10", "2024-05-10") for i in range(runs)]
+            return await asyncio.gather(*(graph.ainvoke(s) for s in states))
+
+        t0 = time.monotonic()
+        results = asyncio.run(main())
+        elapsed = time.monotonic() - t0
+
+        # 10 LLM calls per run; sequential runs would take runs * 10 * LLM_SECONDS
+        assert elapsed < runs * 10 * LLM_SECONDS / 2
+        assert [r["company_of_interest"] for r in results] == [f"T{i}" for i in range(runs)]
+        assert all(r["final_trade_decision"] == "BUY" and r["market_report"] == "BUY" for r in results)
+
+    def test_apropagate(self, fake_trading_graph, tmp_path):
+        ta = fake_trading_graph
+
+        final_state, decision = asyncio.run(ta.apropagate("AAPL", "2024-05-10"))
+
+        # The bare answer is extracted without another LLM call
+        assert decision == "买入"
+        assert final_state["trade_date"] == "2024-05-10"
+        assert (tmp_path / "eval_results" / "AAPL" / "TradingAgentsStrategy_logs" / "full_states_log.json").exists()
+
+    def test_astream_yields_updates(self, fake_trading_graph):
+        ta = fake_trading_graph
+
+        async def collect():
+            return [chunk async for chunk in ta.astream("AAPL", "2024-05-10", stream_mode="updates")]
+
+        nodes = [next(iter(chunk)) for chunk in asyncio.run(collect())]
+        assert nodes[0] == "Market Analyst" and nodes[-1] == "Risk Judge"
@@ -0,0 +1,141 @@
+import json
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.price_store import PriceStore
+from tradingagents.graph.backtest import Backtester, decision_to_position
+from tradingagents.graph.batch import BatchRunner
+
+from .conftest import write_price_csv
+
+
+class SpyStore(PriceStore):
+    """Records the last date of every price read next to the day being simulated."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.backtester = None
+        self.reads = []
+
+    def load(self, symbol, start_date=None, end_date=None):
+        self.reads.append((self.backtester.current_day, end_date))
+        return super().load(symbol, start_date, end_date)
+
+
+class FakeGraph:
+    """Buys TEST and sells OTHR every day; records reflections."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = []
+        self.reflections = []
+        self.curr_state = None
+
+    async def apropagate(self, ticker, trade_date, callbacks=None):
+        self.calls.append((ticker, trade_date))
+        if (ticker, trade_date) == self.fail_on:
+            raise RuntimeError("llm down")
+        decision = "买入" if ticker == "TEST" else "SELL"
+        return {"company_of_interest": ticker, "trade_date": trade_date, "market_report": "m"}, decision
+
+    def propagate_many(self, jobs, max_concurrency=None, progress_callback=None):
+        return BatchRunner(self, jobs, max_concurrency=2)
+
+    def reflect_and_remember(self, returns_losses):
+        self.reflections.append((self.curr_state["company_of_interest"], self.curr_state["trade_date"], returns_losses))
+
+
+@pytest.fixture
+def store(price_data_dir, tmp_path):
+    dates = [d.strftime("%Y-%m-%d") for d in pd.bdate_range("2024-01-01", "2024-03-29")]
+    # OTHR does not trade on 2024-01-03
+    write_price_csv(price_data_dir / "OTHR-YFin-data-2015-01-01-2025-03-25.csv", [d for d in dates if d != "2024-01-03"], 50.0)
+    return SpyStore(str(tmp_path / "store"), str(price_data_dir))
+
+
+def make_backtester(graph, store, **kwargs):
+    bt = Backtester(graph, ["TEST", "OTHR"], "2024-01-01", "2024-01-10", horizon=2, price_store=store, **kwargs)
+    store.backtester = bt
+    return bt
+
+
+class TestBacktester:
+    def test_decision_to_position(self):
+        assert [decision_to_position(d) for d in ["买入", "sell", "持有", "", "maybe"]] == [1, -1, 0, None, None]
+
+    def test_walk_forward_returns_reflection_and_equity(self, store):
+        graph = FakeGraph()
+        bt = make_backtester(graph, store)
+
+        results, equity = bt.run()
+
+        assert len(bt.completed_days) == 8
+        assert ("OTHR", "2024-01-03") not in graph.calls and len(results) == 15
+        # Never reads prices past the simulated day while walking forward
+        assert all(end <= day for day, end in store.reads if day is not None)
+
+        first = results[(results.ticker == "TEST") & (results.date == "2024-01-01")].iloc[0]
+        assert first.exit_date == "2024-01-03"
+        assert first["return"] == pytest.approx(102.25 / 100.25 - 1)
+        assert first.strategy_return == pytest.approx(first["return"])
+        short = results[(results.ticker == "OTHR") & (results.date == "2024-01-01")].iloc[0]
+        assert short.exit_date == "2024-01-04" and short.strategy_return < 0
+
+        # Reflections arrive in the order returns became known, all of them after the run
+        exits = [results.set_index(["ticker", "date"]).loc[(t, d), "exit_date"] for t, d, _ in graph.reflections]
+        assert exits == sorted(exits) and len(graph.reflections) == 15
+
+        assert list(equity.index.strftime("%Y-%m-%d")) == bt.completed_days
+        assert equity.iloc[0] == 1.0
+        # Long TEST and short OTHR from day one, equally weighted; OTHR is flat on its missing day
+        assert equity.iloc[2] / equity.iloc[1] == pytest.approx(1 + (102.25 / 101.25 - 1) / 2)
+        test_ret = 103.25 / 102.25 - 1
+        othr_ret = 52.25 / 51.25 - 1
+        assert equity.iloc[3] / equity.iloc[2] == pytest.approx(1 + (test_ret - othr_ret) / 2)
+
+    def test_resume_from_checkpoint(self, store, tmp_path):
+        path = tmp_path / "bt" / "checkpoint.json"
+        graph = FakeGraph(fail_on=("TEST", "2024-01-05"))
+        bt = make_backtester(graph, store, checkpoint_path=str(path))
+        days = bt.trading_days()
+
+        # Simulate a crash after three days
+        bt.trading_days = lambda: days[:3]
+        bt.run()
+        saved = json.loads(path.read_text())
+        assert saved["completed_days"] == days[:3]
+        assert all(d["state"] is None or d["exit_date"] is None for d in saved["decisions"])
+
+        graph.calls.clear()
+        resumed = make_backtester(graph, store, checkpoint_path=str(path))
+        results, _ = resumed.run()
+
+        assert {day for _, day in graph.calls} == set(days[3:])
+        assert resumed.completed_days == days
+        failed = results[results.error.notna()].iloc[0]
+        assert failed.date == "2024-01-05" and pd.isna(failed.position)
+
+        with pytest.raises(ValueError):
+            Backtester(graph, ["TEST"], "2024-01-01", "2024-01-10", horizon=2, checkpoint_path=str(path), price_store=store)
+
+    def test_crash_during_reflection_does_not_repeat_lessons(self, store, tmp_path):
+        path = tmp_path / "checkpoint.json"
+        graph = FakeGraph()
+        original = graph.reflect_and_remember
+
+        def crash_on_third(returns_losses):
+            if len(graph.reflections) == 2:
+                raise RuntimeError("killed")
+            original(returns_losses)
+
+        graph.reflect_and_remember = crash_on_third
+        with pytest.raises(RuntimeError):
+            make_backtester(graph, store, checkpoint_path=str(path)).run()
+
+        graph.reflect_and_remember = original
+        make_backtester(graph, store, checkpoint_path=str(path)).run()
+
+        reflected = [(ticker, day) for ticker, day, _ in graph.reflections]
+        # 8 TEST and 7 OTHR decisions, each reflected on exactly once
+        assert len(reflected) == len(set(reflected)) == 15
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from tradingagents.graph.batch import BatchRunner, TokenUsageCounter
+
+
+class FakeGraph:
+    """Stands in for TradingAgentsGraph.apropagate: sleeps, fails for 'BAD'."""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def apropagate(self, ticker, trade_date, callbacks=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay * (3 if ticker == "SLOW" else 1))
+            if ticker == "BAD":
+                raise ValueError("no data")
+            for callback in callbacks or []:
+                callback.on_llm_end(LLMResult(generations=[], llm_output={"token_usage": {"prompt_tokens": 80, "completion_tokens": 20}}))
+            return {"company_of_interest": ticker}, "BUY"
+        finally:
+            self.active -= 1
+
+
+class TestTokenUsageCounter:
+    def test_usage_metadata_and_llm_output(self):
+        counter = TokenUsageCounter()
+        message = AIMessage(content="x", usage_metadata={"input_tokens": 5, "output_tokens": 3, "total_tokens": 8})
+        counter.on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]))
+        counter.on_llm_end(LLMResult(generations=[], llm_output={"token_usage": {"total_tokens": 4, "prompt_tokens": 3, "completion_tokens": 1}}))
+        assert (counter.prompt_tokens, counter.completion_tokens, counter.total_tokens, counter.llm_calls) == (8, 4, 12, 2)
+
+
+class TestBatchRunner:
+    def test_bounded_concurrency_error_isolation_and_progress(self):
+        graph = FakeGraph()
+        progress = []
+        jobs = [("SLOW", "2024-05-10"), ("AAPL", "2024-05-10"), ("BAD", "2024-05-10"), ("MSFT", "2024-05-10")]
+        runner = BatchRunner(graph, jobs, max_concurrency=2, progress_callback=lambda d, t, r: progress.append((d, t, r["ticker"])))
+
+        results = list(runner)
+
+        assert graph.peak == 2
+        # Results stream back in completion order, not job order
+        assert [r["ticker"] for r in results][:2] == ["AAPL", "BAD"]
+        assert {r["ticker"] for r in results} == {"SLOW", "AAPL", "BAD", "MSFT"}
+        bad = next(r for r in results if r["ticker"] == "BAD")
+        assert bad["status"] == "error" and bad["error"] == "ValueError: no data" and bad["decision"] is None
+        assert [p[:2] for p in progress] == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+        summary = runner.summary()
+        assert (summary["jobs"], summary["succeeded"], summary["failed"]) == (4, 3, 1)
+        assert summary["tokens"] == 300 and summary["tokens_per_min"] > 0
+        assert summary["jobs_per_min"] > 0
+
+    def test_async_iteration(self):
+        runner = BatchRunner(FakeGraph(delay=0.01), [("A", "2024-05-10"), ("B", "2024-05-10")], max_concurrency=4)
+
+        async def collect():
+            return [r async for r in runner]
+
+        assert sorted(r["ticker"] for r in asyncio.run(collect())) == ["A", "B"]
+
+    def test_early_break_stops_the_batch(self):
+        graph = FakeGraph(delay=0.05)
+        runner = BatchRunner(graph, [(f"T{i}", "2024-05-10") for i in range(20)], max_concurrency=1)
+        for result in runner:
+            break
+        time.sleep(0.3)
+        assert len(runner.results) < 20
+
+
+class TestPropagateMany:
+    def test_shared_graph_counts_tokens(self, fake_trading_graph):
+        jobs = [("AAPL", "2024-05-10"), ("MSFT", "2024-05-10"), ("NVDA", "2024-05-11")]
+        runner = fake_trading_graph.propagate_many(jobs, max_concurrency=3)
+
+        results = list(runner)
+
+        assert all(r["status"] == "ok" and r["decision"] == "买入" for r in results)
+        # 10 graph LLM calls, 12 tokens each; the signal is extracted without the LLM
+        assert all(r["llm_calls"] == 10 and r["tokens"] == 120 for r in results)
+        assert runner.summary()["tokens"] == 3 * 120
+
+    def test_state_logs_are_kept_per_ticker(self, fake_trading_graph, tmp_path):
+        jobs = [("AAPL", "2024-05-10"), ("MSFT", "2024-05-10"), ("AAPL", "2024-05-11")]
+        list(fake_trading_graph.propagate_many(jobs, max_concurrency=3))
+
+        assert set(fake_trading_graph.log_states_dict) == {"AAPL", "MSFT"}
+        for ticker, dates in (("AAPL", {"2024-05-10", "2024-05-11"}), ("MSFT", {"2024-05-10"})):
+            path = tmp_path / "eval_results" / ticker / "TradingAgentsStrategy_logs" / "full_states_log.json"
+            logged = json.loads(path.read_text())
+            assert set(logged) == dates
+            assert all(entry["company_of_interest"] == ticker for entry in logged.values())
@@ -81,6 +81,18 @@ class TestMessageBuffer:
         assert message_buffer.report_sections[section] == content
         assert "市场分析" in message_buffer.current_report
 
+    def test_add_report_delta(self, message_buffer):
+        message_buffer.add_report_delta("investment_plan", "Bull Researcher", "Strong ")
+        message_buffer.add_report_delta("investment_plan", "Bull Researcher", "growth")
+        assert message_buffer.current_report.endswith("Bull Researcher\nStrong growth")
+
+        # A new speaker starts a new partial text; finished sections replace it
+        message_buffer.add_report_delta("investment_plan", "Bear Researcher", "Risks")
+        assert message_buffer.current_report.endswith("Bear Researcher\nRisks")
+        message_buffer.update_report_section("investment_plan", "Final plan")
+        assert message_buffer.streaming == {}
+        assert message_buffer.report_sections["investment_plan"] == "Final plan"
+
 @patch('cli.main.typer.prompt')
 def test_get_ticker(mock_prompt):
     mock_prompt.return_value = "603127.SH"
@@ -0,0 +1,93 @@
+import time
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import enhanced_data_source_manager as edsm
+from tradingagents.dataflows.data_cache import TieredDataCache
+
+
+def _bars():
+    index = pd.DatetimeIndex(pd.bdate_range("2024-01-01", periods=5), name="Date")
+    return pd.DataFrame({"Close": [1.0, 2.0, 3.0, 4.0, 5.0], "Volume": [1, 2, 3, 4, 5]}, index=index)
+
+
+class TestTieredDataCache:
+    def test_round_trip_keeps_index_and_dtypes(self, tmp_path):
+        TieredDataCache(str(tmp_path)).put("stock_data_historical", _bars(), symbol="AAA")
+
+        # a fresh instance has an empty memory tier and reads the disk tier
+        cache = TieredDataCache(str(tmp_path))
+        loaded = cache.get("stock_data_historical", symbol="AAA")
+        pd.testing.assert_frame_equal(loaded, _bars())
+        assert cache.stats()["disk_hits"] == 1
+
+        cache.get("stock_data_historical", symbol="AAA")
+        assert cache.stats()["memory_hits"] == 1
+
+    def test_memory_copy_is_detached(self, tmp_path):
+        cache = TieredDataCache(str(tmp_path))
+        cache.put("stock_data", _bars(), symbol="AAA")
+        cache.get("stock_data", symbol="AAA")["Close"] = 0.0
+        assert cache.get("stock_data", symbol="AAA")["Close"].iloc[0] == 1.0
+
+    def test_ttl_per_data_type(self, tmp_path):
+        cache = TieredDataCache(str(tmp_path), ttls={"news": 0.05})
+        cache.put("news", "headline", symbol="AAA")
+        cache.put("stock_data_historical", _bars(), symbol="AAA")
+        assert cache.get("news", symbol="AAA") == "headline"
+
+        time.sleep(0.1)
+        assert cache.get("news", symbol="AAA") is None
+        assert cache.get("stock_data_historical", symbol="AAA") is not None
+        assert [e["expires_at"] for e in cache.list_entries("stock_data_historical")] == [None]
+
+    def test_max_age_override(self, tmp_path):
+        cache = TieredDataCache(str(tmp_path))
+        cache.put("company_info", {"name": "A"}, symbol="AAA")
+        time.sleep(0.02)
+        assert cache.get("company_info", max_age=0.01, symbol="AAA") is None
+        assert cache.get("company_info", max_age=60, symbol="AAA") == {"name": "A"}
+
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        payload = "x" * 1000
+        cache = TieredDataCache(str(tmp_path), max_bytes=2500)
+        cache.put("news", payload, n=1)
+        time.sleep(0.01)
+        cache.put("news", payload, n=2)
+        time.sleep(0.01)
+        cache.get("news", n=1)
+        cache.put("news", payload, n=3)
+
+        keys = {tuple(e["params"].values()) for e in cache.list_entries()}
+        assert keys == {(1,), (3,)}
+        stats = cache.stats()
+        assert stats["bytes"] <= 2500 and stats["evictions"] == 1
+
+    def test_purge(self, tmp_path):
+        cache = TieredDataCache(str(tmp_path), ttls={"news": 0})
+        cache.put("news", "old", symbol="AAA")
+        cache.put("company_info", {"a": 1}, symbol="AAA")
+        assert cache.purge(expired_only=True) == 1
+        assert cache.purge(data_type="company_info") == 1
+        assert cache.stats()["entries"] == 0
+        assert not list(tmp_path.glob("*.pkl"))
+
+
+class TestEnhancedManagerCache:
+    def test_historical_stock_data_served_from_cache(self, tmp_path, monkeypatch):
+        calls = []
+
+        def fake_get_stock_data(symbol, start_date, end_date):
+            calls.append(symbol)
+            return _bars()
+
+        monkeypatch.setattr(edsm.yfin_utils, "get_stock_data", fake_get_stock_data, raising=False)
+        manager = edsm.EnhancedDataSourceManager(cache_dir=str(tmp_path))
+        first = manager.get_stock_data_enhanced("AAPL", "2024-01-01", "2024-01-05")
+        second = manager.get_stock_data_enhanced("AAPL", "2024-01-01", "2024-01-05")
+
+        assert calls == ["AAPL"]
+        pd.testing.assert_frame_equal(first, second)
+        assert manager.list_cache_entries()[0]["data_type"] == "stock_data_historical"
+        assert manager.get_cache_stats()["memory_hits"] == 1
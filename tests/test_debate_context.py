@@ -0,0 +1,103 @@
+from langchain_core.messages import AIMessage
+
+from tradingagents.agents.researchers.bear_researcher import create_bear_researcher
+from tradingagents.agents.researchers.bull_researcher import create_bull_researcher
+from tradingagents.agents.utils.debate_context import DebateContext, estimate_tokens, truncate_to_tokens
+from tradingagents.graph.propagation import Propagator
+
+from .conftest import NoMemory
+
+
+class RecordingLLM:
+    """Answers debate turns with a long argument and summaries with a short one."""
+
+    def __init__(self):
+        self.turn_prompts = []
+        self.summary_prompts = []
+
+    def invoke(self, prompt, config=None):
+        if prompt.startswith("你负责为一场投资辩论维护一份滚动摘要"):
+            self.summary_prompts.append(prompt)
+            return AIMessage(content=f"摘要{len(self.summary_prompts)}")
+        self.turn_prompts.append(prompt)
+        return AIMessage(content="论点" * 300)
+
+
+def debate_state(rounds, llm, context):
+    state = Propagator().create_initial_state("AAPL", "2024-05-10", "2024-05-10")
+    for key in ["market_report", "sentiment_report", "news_report", "fundamentals_report"]:
+        state[key] = "报告" * 3000
+    bull = create_bull_researcher(llm, NoMemory(), context)
+    bear = create_bear_researcher(llm, NoMemory(), context)
+    for _ in range(rounds):
+        for node in (bull, bear):
+            state.update(node.invoke(state))
+    return state
+
+
+class TestDebateContext:
+    def test_token_helpers(self):
+        assert estimate_tokens("看多") == 2 and estimate_tokens("abcdefgh") == 2
+        cut = truncate_to_tokens("报告" * 100, 50)
+        assert cut.startswith("报告" * 25) and cut.endswith("（已截断）")
+
+    def test_prompts_stay_bounded_as_rounds_grow(self):
+        llm = RecordingLLM()
+        context = DebateContext(llm, token_budget=6000, recent_turns=2)
+
+        state = debate_state(5, llm, context)
+
+        sizes = [estimate_tokens(p) for p in llm.turn_prompts]
+        assert len(sizes) == 10
+        assert max(sizes) < 6000 + 1000  # budget plus the fixed instructions
+        assert sizes[-1] <= sizes[3]
+
+        debate = state["investment_debate_state"]
+        assert len(debate["turns"]) == 10 and debate["turns"][0]["speaker"] == "Bull Analyst"
+        assert debate["summarized_turns"] == 7
+        # The full history is still kept for logs and reflection
+        assert debate["history"].count("Bull Analyst:") == 5
+
+    def test_summary_is_incremental_and_shared_between_prepare_and_record(self):
+        llm = RecordingLLM()
+        context = DebateContext(llm, token_budget=6000, recent_turns=2)
+
+        state = debate_state(3, llm, context)
+
+        # Turns 1..3 are folded one at a time, each fold sees one new turn
+        assert len(llm.summary_prompts) == 3
+        assert all(p.count("Analyst: ") == 1 for p in llm.summary_prompts)
+        assert "摘要1" in llm.summary_prompts[1]
+        assert state["investment_debate_state"]["summary"] == "摘要3"
+        # The judge's view folds the next turn
+        assert context.history(state["investment_debate_state"]).startswith("（早前辩论摘要）摘要4")
+
+    def test_history_leaves_out_latest_arguments_quoted_separately(self):
+        context = DebateContext(None, recent_turns=5)
+        turns = [
+            {"speaker": "Bull Analyst", "content": "一"},
+            {"speaker": "Bear Analyst", "content": "二"},
+            {"speaker": "Bull Analyst", "content": "三"},
+        ]
+        state = {"turns": turns, "summary": "", "summarized_turns": 0}
+
+        assert context.history(state, exclude=("Bull Analyst",)) == "Bull Analyst: 一\nBear Analyst: 二"
+        assert context.history(state, exclude=("Bear Analyst", "Neutral Analyst")) == "Bull Analyst: 一\nBull Analyst: 三"
+
+    def test_opponent_argument_appears_once_in_prompt(self):
+        llm = RecordingLLM()
+        state = Propagator().create_initial_state("AAPL", "2024-05-10", "2024-05-10")
+        bear = create_bear_researcher(llm, NoMemory(), DebateContext(llm))
+        state.update(create_bull_researcher(llm, NoMemory(), DebateContext(llm)).invoke(state))
+        state["investment_debate_state"]["turns"][-1]["content"] = "独特的看多论据"
+        state["investment_debate_state"]["current_response"] = "Bull Analyst: 独特的看多论据"
+
+        bear.invoke(state)
+
+        assert llm.turn_prompts[-1].count("独特的看多论据") == 1
+
+    def test_reports_trimmed_proportionally(self):
+        context = DebateContext(None, token_budget=300)
+        short, long = context.reports(["a" * 400, "b" * 1200])
+        assert estimate_tokens(short) <= 85 and estimate_tokens(long) <= 235
+        assert context.reports(["x", "y"], "debate") == ["x", "y"]
@@ -0,0 +1,75 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from tradingagents.agents.utils.embedding_cache import EmbeddingCache, get_embedding_cache, reset_embedding_cache
+from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.dataflows.config import set_config
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.requests = []
+
+    def create(self, model, input):
+        self.requests.append(list(input))
+        # Out of order on purpose: callers must use the index
+        data = [SimpleNamespace(index=i, embedding=[float(len(text)), float(i)]) for i, text in enumerate(input)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+@pytest.fixture
+def shared_cache():
+    reset_embedding_cache()
+    yield get_embedding_cache()
+    reset_embedding_cache()
+
+
+def make_memory(embeddings):
+    memory = FinancialSituationMemory(f"memory-{uuid.uuid4().hex}", {"embedding_provider": "ollama", "embedding_model": "nomic"})
+    memory.client = SimpleNamespace(embeddings=embeddings)
+    return memory
+
+
+class TestEmbeddingCache:
+    def test_disk_tier_survives_a_new_instance(self, tmp_path):
+        cache = EmbeddingCache(max_entries=1, cache_dir=str(tmp_path))
+        cache.put("a", [1.0, 2.0])
+        cache.put("b", [3.0])
+        assert cache.get("a") == [1.0, 2.0]  # evicted from memory, read from disk
+        assert EmbeddingCache(cache_dir=str(tmp_path)).get("b") == [3.0]
+        assert cache.stats()["disk_hits"] == 1 and cache.get("c") is None
+
+    def test_memories_share_one_request_per_situation(self, shared_cache):
+        embeddings = FakeEmbeddings()
+        memories = [make_memory(embeddings) for _ in range(5)]
+        for memory in memories:
+            memory.add_situations([("rates rising", "buy staples")])
+
+        situation = "market report\n\nsentiment\n\nnews\n\nfundamentals"
+        for memory in memories:
+            memory.get_memories(situation, n_matches=1)
+
+        assert embeddings.requests == [["rates rising"], [situation]]
+        assert shared_cache.stats()["hits"] == 8
+
+    def test_add_situations_sends_one_batched_request(self, shared_cache):
+        embeddings = FakeEmbeddings()
+        memory = make_memory(embeddings)
+        memory.get_embedding("known")
+
+        memory.add_situations([("known", "a"), ("new one", "b"), ("new one", "c"), ("other", "d")])
+
+        assert embeddings.requests == [["known"], ["new one", "other"]]
+        assert memory.situation_collection.count() == 4
+        assert memory.get_embeddings(["other", "new one"]) == [[5.0, 1.0], [7.0, 0.0]]
+
+    def test_configured_from_config(self, shared_cache, tmp_path):
+        set_config({"embedding_cache_size": 7, "embedding_cache_dir": str(tmp_path / "emb")})
+        try:
+            reset_embedding_cache()
+            cache = get_embedding_cache()
+            assert cache.max_entries == 7 and cache.cache_dir == str(tmp_path / "emb")
+        finally:
+            set_config({"embedding_cache_size": 1024, "embedding_cache_dir": None})
@@ -0,0 +1,82 @@
+import json
+import os
+import time
+
+import pytest
+
+from tradingagents.dataflows import finnhub_utils, interface
+from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.finnhub_utils import FinnhubStore, get_data_in_range
+
+
+NEWS = {
+    "2024-01-05": [{"headline": "c", "summary": "s3"}],
+    "2024-01-02": [{"headline": "a", "summary": "s1"}],
+    "2024-01-03": [],
+    "2024-01-04": [{"headline": "b", "summary": "s2"}],
+    "2024-01-09": [{"headline": "d", "summary": "s4"}],
+}
+
+
+@pytest.fixture
+def finnhub_dir(tmp_path):
+    news_dir = tmp_path / "finnhub_data" / "news_data"
+    news_dir.mkdir(parents=True)
+    with open(news_dir / "TEST_data_formatted.json", "w") as f:
+        json.dump(NEWS, f)
+    finnhub_utils.reset_finnhub_store()
+    yield tmp_path
+    set_config({"finnhub_sqlite_path": None})
+    finnhub_utils.reset_finnhub_store()
+
+
+def _reference(start, end):
+    return {k: v for k, v in NEWS.items() if start <= k <= end and len(v) > 0}
+
+
+class TestFinnhubStore:
+    @pytest.mark.parametrize("start,end", [("2024-01-01", "2024-01-31"), ("2024-01-03", "2024-01-05"), ("2024-02-01", "2024-02-02")])
+    def test_memory_query_matches_linear_scan(self, finnhub_dir, start, end):
+        result = get_data_in_range("TEST", start, end, "news_data", str(finnhub_dir))
+        assert result == _reference(start, end)
+        assert list(result) == list(_reference(start, end))
+
+    def test_file_is_parsed_once(self, finnhub_dir, monkeypatch):
+        store = FinnhubStore()
+        path = str(finnhub_dir / "finnhub_data" / "news_data" / "TEST_data_formatted.json")
+        calls = []
+        original = FinnhubStore._read_json
+        monkeypatch.setattr(FinnhubStore, "_read_json", staticmethod(lambda p: calls.append(p) or original(p)))
+
+        store.query(path, "2024-01-01", "2024-01-04")
+        store.query(path, "2024-01-04", "2024-01-09")
+        assert len(calls) == 1
+
+        time.sleep(0.01)
+        with open(path, "w") as f:
+            json.dump({"2024-01-04": [{"headline": "new"}]}, f)
+        assert store.query(path, "2024-01-01", "2024-01-31") == {"2024-01-04": [{"headline": "new"}]}
+        assert len(calls) == 2
+
+    def test_lru_bounds_parsed_files(self, finnhub_dir):
+        store = FinnhubStore(max_files=1)
+        news_dir = finnhub_dir / "finnhub_data" / "news_data"
+        with open(news_dir / "OTHER_data_formatted.json", "w") as f:
+            json.dump(NEWS, f)
+        store.query(str(news_dir / "TEST_data_formatted.json"), "2024-01-01", "2024-01-31")
+        store.query(str(news_dir / "OTHER_data_formatted.json"), "2024-01-01", "2024-01-31")
+        assert list(store._files) == [os.path.abspath(news_dir / "OTHER_data_formatted.json")]
+
+    def test_sqlite_store_matches_memory(self, finnhub_dir, tmp_path):
+        set_config({"finnhub_sqlite_path": str(tmp_path / "finnhub.sqlite")})
+        finnhub_utils.reset_finnhub_store()
+        for start, end in [("2024-01-01", "2024-01-31"), ("2024-01-03", "2024-01-05")]:
+            result = get_data_in_range("TEST", start, end, "news_data", str(finnhub_dir))
+            assert list(result.items()) == list(_reference(start, end).items())
+        assert finnhub_utils.get_finnhub_store().convert_all(str(finnhub_dir)) == []
+
+    def test_finnhub_news_uses_store(self, finnhub_dir, monkeypatch):
+        monkeypatch.setattr(interface, "DATA_DIR", str(finnhub_dir))
+        text = interface.get_finnhub_news("TEST", "2024-01-05", 3)
+        assert "### a (2024-01-02)" in text and "### c (2024-01-05)" in text
+        assert "### d" not in text
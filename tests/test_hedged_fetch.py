@@ -0,0 +1,98 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from tradingagents.dataflows.china_stock_data_sources import ChinaStockDataManager
+from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows import hedged_fetch as hedged_fetch_module
+from tradingagents.dataflows.hedged_fetch import fetch_settings, hedged_fetch
+
+ROWS = pd.DataFrame({"close": [1.0]})
+
+
+def _slow(seconds, result=ROWS, started=None, name=None):
+    def run():
+        if started is not None:
+            started.append(name)
+        time.sleep(seconds)
+        return result
+
+    return run
+
+
+def _fail():
+    raise RuntimeError("boom")
+
+
+class TestHedgedFetch:
+    def test_fast_primary_wins_without_hedging(self):
+        started = []
+        source, result, errors = hedged_fetch(
+            [("a", _slow(0, started=started, name="a")), ("b", _slow(0, started=started, name="b"))],
+            hedge_delay=1.0,
+        )
+        assert source == "a" and result is ROWS and errors == []
+        assert started == ["a"]
+
+    def test_slow_primary_is_hedged(self):
+        t0 = time.monotonic()
+        source, _, _ = hedged_fetch([("slow", _slow(2.0)), ("fast", _slow(0.01))], hedge_delay=0.05)
+        assert source == "fast"
+        assert time.monotonic() - t0 < 1.0
+
+    def test_failure_starts_next_source_immediately(self):
+        t0 = time.monotonic()
+        source, _, errors = hedged_fetch(
+            [("bad", _fail), ("empty", lambda: pd.DataFrame()), ("good", _slow(0))], hedge_delay=5.0
+        )
+        assert source == "good"
+        assert errors == ["bad: boom", "empty: No data returned"]
+        assert time.monotonic() - t0 < 1.0
+
+    def test_sequential_mode_waits_for_failure(self):
+        started = []
+        source, _, _ = hedged_fetch(
+            [("a", _slow(0.1, started=started, name="a")), ("b", _slow(0, started=started, name="b"))],
+            hedge_delay=None,
+        )
+        assert source == "a" and started == ["a"]
+
+    def test_deadline(self):
+        t0 = time.monotonic()
+        source, result, errors = hedged_fetch([("slow", _slow(2.0))], hedge_delay=None, deadline=0.1)
+        assert source is None and result is None
+        assert errors[-1] == "deadline of 0.1s exceeded"
+        assert time.monotonic() - t0 < 1.0
+
+    def test_nested_fetch_runs_inline(self, monkeypatch):
+        # A single worker: a nested fetch queued on the pool would wait until the deadline
+        monkeypatch.setattr(hedged_fetch_module, "_executor", ThreadPoolExecutor(max_workers=1))
+        inner = lambda: hedged_fetch([("x", _fail), ("y", _slow(0))], hedge_delay=0.01, deadline=5)[1]
+
+        t0 = time.monotonic()
+        source, result, _ = hedged_fetch([("outer", inner)], hedge_delay=0.01, deadline=5)
+
+        assert source == "outer" and result is ROWS
+        assert time.monotonic() - t0 < 1.0
+
+    def test_settings_from_config(self):
+        set_config({"data_fetch_mode": "sequential", "fetch_deadline_seconds": 5})
+        try:
+            assert fetch_settings() == (None, 5)
+        finally:
+            set_config({"data_fetch_mode": "hedged", "fetch_deadline_seconds": 60.0})
+        assert fetch_settings()[0] is not None
+
+
+class TestChinaManagerHedging:
+    def test_slow_jqdata_falls_over_to_tushare(self, monkeypatch):
+        manager = ChinaStockDataManager()
+        monkeypatch.setattr(manager.sources["jqdata"], "get_stock_data", lambda *a: time.sleep(2.0) or ROWS)
+        monkeypatch.setattr(manager.sources["tushare"], "get_stock_data", lambda *a: ROWS.assign(source="tushare"))
+        set_config({"hedge_delay_seconds": 0.05})
+        try:
+            df = manager.get_stock_data_enhanced("600000.SH", "2024-01-01", "2024-01-05")
+        finally:
+            set_config({"hedge_delay_seconds": 2.0})
+        assert list(df["source"]) == ["tushare"]
@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import indicator_cache
+from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.indicator_cache import IndicatorCache, price_fingerprint
+from tradingagents.dataflows.stockstats_utils import StockstatsUtils
+
+
+def _prices(days, start_price=100.0):
+    index = pd.bdate_range("2024-01-01", periods=days, name="Date")
+    close = [start_price + i for i in range(days)]
+    return pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": [1000] * days},
+        index=index,
+    )
+
+
+@pytest.fixture
+def fresh_cache():
+    indicator_cache.reset_indicator_cache()
+    yield
+    set_config({"indicator_cache_dir": None})
+    indicator_cache.reset_indicator_cache()
+
+
+class TestPriceFingerprint:
+    def test_changes_when_bars_are_appended(self):
+        assert price_fingerprint(_prices(30)) != price_fingerprint(_prices(31))
+
+    def test_changes_when_values_are_revised(self):
+        revised = _prices(30)
+        revised.iloc[5, 3] += 1
+        assert price_fingerprint(_prices(30)) != price_fingerprint(revised)
+
+    def test_stable_for_same_content(self):
+        assert price_fingerprint(_prices(30)) == price_fingerprint(_prices(30))
+
+
+class TestIndicatorCache:
+    def test_lru_evicts_oldest(self):
+        cache = IndicatorCache(max_entries=2)
+        series = pd.Series([1.0])
+        cache.put("A", "fp", "rsi", series)
+        cache.put("B", "fp", "rsi", series)
+        assert cache.get("A", "fp", "rsi") is not None
+        cache.put("C", "fp", "rsi", series)
+
+        assert cache.get("B", "fp", "rsi") is None
+        assert cache.get("A", "fp", "rsi") is not None
+        stats = cache.stats()
+        assert stats["hits"] == 2 and stats["misses"] == 1 and stats["entries"] == 2
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        series = pd.Series([1.0, 2.0], index=pd.bdate_range("2024-01-01", periods=2))
+        IndicatorCache(cache_dir=str(tmp_path)).put("A", "fp", "macd", series)
+
+        cache = IndicatorCache(cache_dir=str(tmp_path))
+        pd.testing.assert_series_equal(cache.get("A", "fp", "macd"), series)
+        assert cache.stats()["disk_hits"] == 1
+        assert cache.get("A", "fp", "macd") is not None
+        assert cache.stats()["hits"] == 1
+
+
+class TestStockstatsUsesCache:
+    def test_repeated_lookup_hits_cache(self, price_data_dir, fresh_cache):
+        first = StockstatsUtils.get_stock_stats("TEST", "close_10_ema", "2024-02-15", str(price_data_dir), online=False)
+        second = StockstatsUtils.get_stock_stats("TEST", "close_10_ema", "2024-02-15", str(price_data_dir), online=False)
+
+        assert first == second
+        stats = StockstatsUtils.cache_stats()
+        assert stats["misses"] == 1 and stats["hits"] == 1
+
+    def test_new_history_is_not_served_from_cache(self, price_data_dir, fresh_cache):
+        StockstatsUtils.get_stock_stats("TEST", "rsi", "2024-02-15", str(price_data_dir), online=False)
+        StockstatsUtils.get_stock_stats("TEST", "rsi", "2024-02-16", str(price_data_dir), online=False)
+        assert StockstatsUtils.cache_stats()["misses"] == 2
+
+    def test_configured_disk_tier(self, price_data_dir, fresh_cache, tmp_path):
+        set_config({"indicator_cache_dir": str(tmp_path / "indicators")})
+        StockstatsUtils.get_stock_stats("TEST", "boll", "2024-02-15", str(price_data_dir), online=False)
+        assert len(list((tmp_path / "indicators").glob("*.pkl"))) == 1
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from tradingagents.agents.utils.llm_cache import LLMCacheMiss, LLMResponseCache, create_llm_cache
+
+from .conftest import SleepyChatModel
+
+CALLS = []
+
+
+class CountingModel(SleepyChatModel):
+    delay: float = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        CALLS.append(messages[-1].content)
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        CALLS.append(messages[-1].content)
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    CALLS.clear()
+
+
+def model(cache, **kwargs):
+    return CountingModel(cache=cache, **kwargs)
+
+
+class TestLLMResponseCache:
+    def test_read_through_keys_on_messages_params_and_tools(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm.sqlite"))
+        llm = model(cache)
+
+        first = llm.invoke([HumanMessage("analyze AAPL")])
+        again = llm.invoke([HumanMessage("analyze AAPL")])
+        assert first.content == again.content == "BUY"
+        assert again.usage_metadata["total_tokens"] == 12
+        assert CALLS == ["analyze AAPL"]
+
+        llm.invoke([HumanMessage("analyze MSFT")])
+        llm.invoke([HumanMessage("analyze AAPL")], temperature=0.7)
+        llm.invoke([HumanMessage("analyze AAPL")], tools=[{"type": "function", "function": {"name": "get_news"}}])
+        assert len(CALLS) == 4
+
+        asyncio.run(llm.ainvoke([HumanMessage("analyze AAPL")]))
+        assert len(CALLS) == 4
+        assert cache.stats()["entries"] == 4 and cache.hits == 2
+
+    def test_record_then_replay_across_processes(self, tmp_path):
+        path = str(tmp_path / "llm.sqlite")
+        recorder = model(LLMResponseCache(path, "record"))
+        recorder.invoke([HumanMessage("analyze AAPL")])
+        recorder.invoke([HumanMessage("analyze AAPL")])
+        assert len(CALLS) == 2
+
+        replay = model(LLMResponseCache(path, "replay"))
+        assert replay.invoke([HumanMessage("analyze AAPL")]).content == "BUY"
+        assert len(CALLS) == 2
+        with pytest.raises(LLMCacheMiss):
+            replay.invoke([HumanMessage("analyze TSLA")])
+        assert len(CALLS) == 2 and replay.cache.stats()["entries"] == 1
+
+    def test_create_from_config(self, tmp_path):
+        assert create_llm_cache({"llm_cache_mode": None}) is None
+        cache = create_llm_cache({"llm_cache_mode": "Replay", "data_cache_dir": str(tmp_path)})
+        assert cache.mode == "replay" and cache.path == str(tmp_path / "llm_cache.sqlite")
+        with pytest.raises(ValueError):
+            create_llm_cache({"llm_cache_mode": "sometimes", "llm_cache_path": str(tmp_path / "x.sqlite")})
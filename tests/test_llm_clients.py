@@ -0,0 +1,95 @@
+"""
+Tests for the pooled LLM client factory
+"""
+
+import asyncio
+
+import pytest
+
+from tradingagents.dataflows import llm_clients
+from tradingagents.dataflows.llm_clients import (
+    get_async_openai_client,
+    get_chat_model,
+    get_http_client,
+    get_openai_client,
+    provider_name,
+    reset_llm_clients,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    reset_llm_clients()
+    yield
+    reset_llm_clients()
+
+
+def groq_config(**overrides):
+    config = {
+        "llm_provider": "groq",
+        "groq_api_key": "gsk-test",
+        "api_endpoints": {"groq": "https://api.groq.com/openai/v1"},
+    }
+    config.update(overrides)
+    return config
+
+
+class TestProviders:
+    def test_provider_name(self):
+        assert provider_name({"llm_provider": "OpenRouter (推荐)"}) == "openrouter"
+        assert provider_name({"llm_provider": "智谱AI"}) == "zhipuai"
+        with pytest.raises(ValueError, match="Unsupported LLM provider"):
+            provider_name({"llm_provider": "nope"})
+
+
+class TestChatModels:
+    def test_models_are_shared_per_provider_url_key_and_model(self):
+        quick = get_chat_model(groq_config(), "llama-8b")
+
+        assert get_chat_model(groq_config(), "llama-8b") is quick
+        assert get_chat_model(groq_config(), "llama-70b") is not quick
+        assert get_chat_model(groq_config(groq_api_key="other"), "llama-8b") is not quick
+        assert quick.openai_api_base == "https://api.groq.com/openai/v1"
+
+    def test_models_share_one_connection_pool(self):
+        quick = get_chat_model(groq_config(), "llama-8b")
+        deep = get_chat_model(groq_config(), "llama-70b")
+
+        assert quick.root_client._client is deep.root_client._client is get_http_client()
+
+    def test_scheduler_owns_retries(self):
+        model = get_chat_model(groq_config(), "llama-8b")
+
+        assert model.max_retries == 0 and model.root_client.max_retries == 0
+        assert get_openai_client("http://localhost:11434/v1", "ollama").max_retries == 0
+        assert get_async_openai_client("http://localhost:11434/v1", "ollama").max_retries == 0
+
+    def test_cached_copy_keeps_shared_model_uncached(self):
+        shared = get_chat_model(groq_config(), "llama-8b")
+        copy = shared.model_copy(update={"cache": False})
+
+        assert shared.cache is None and copy.cache is False
+        assert copy.root_client is shared.root_client
+
+
+class TestOpenAIClients:
+    def test_clients_are_shared(self):
+        client = get_openai_client("http://localhost:11434/v1", "ollama")
+
+        assert get_openai_client("http://localhost:11434/v1", "ollama") is client
+        assert client._client is get_http_client()
+        assert get_async_openai_client("http://localhost:11434/v1", "ollama") is not client
+
+
+class TestLoopLocalTransport:
+    def test_one_pool_per_event_loop(self):
+        transport = llm_clients._LoopLocalTransport()
+
+        async def pools():
+            return transport._pool(), transport._pool()
+
+        first_a, first_b = asyncio.run(pools())
+        second, _ = asyncio.run(pools())
+
+        assert first_a is first_b
+        assert second is not first_a
@@ -0,0 +1,180 @@
+"""
+Tests for the LLM rate limiter and request scheduler
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from tradingagents.dataflows import llm_scheduler
+from tradingagents.dataflows.llm_scheduler import (
+    HIGH,
+    AsyncRateLimitedTransport,
+    LLMScheduler,
+    RateLimitedTransport,
+    TokenBucket,
+    describe_request,
+    llm_flow,
+    llm_priority,
+    parse_reset,
+)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = LLMScheduler(hosts={"api.groq.com": "groq"}, max_retries=2)
+    monkeypatch.setattr(llm_scheduler, "_scheduler", scheduler)
+    return scheduler
+
+
+def chat_request(model="llama-8b"):
+    body = json.dumps({"model": model, "messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 50})
+    return httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions", content=body.encode())
+
+
+class TestParsing:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("2", 2.0),
+            ("1m2.5s", 62.5),
+            ("120ms", 0.12),
+            # Epoch seconds and milliseconds
+            ("1700000030", 30.0),
+            ("1700000030000", 30.0),
+            ("soon", None),
+        ],
+    )
+    def test_parse_reset(self, value, expected):
+        seconds = parse_reset(value, now=1700000000)
+        assert seconds is None if expected is None else seconds == pytest.approx(expected)
+
+    def test_describe_request(self):
+        model, tokens = describe_request(chat_request())
+        assert model == "llama-8b" and tokens > 150
+
+
+class TestScheduling:
+    def test_bucket_wait_time(self):
+        bucket = TokenBucket(60)
+        now = time.monotonic()
+        bucket.take(60, now)
+
+        assert bucket.wait_time(1, now) == pytest.approx(1.0)
+        assert bucket.wait_time(1, now + 1) == pytest.approx(0.0)
+
+    def test_model_overrides(self):
+        scheduler = LLMScheduler(limits={"groq": {"rpm": 30, "tpm": 6000, "models": {"big": {"tpm": 100}}}})
+
+        big, small = scheduler._lane("groq", "big"), scheduler._lane("groq", "small")
+
+        assert big.requests.capacity == small.requests.capacity == 30
+        assert big.tokens.capacity == 100 and small.tokens.capacity == 6000
+
+    def test_priority_then_fair_order(self, scheduler):
+        # Hold the lane so every request queues
+        scheduler.observe("groq", "m", 429, {"retry-after-ms": "100"})
+        order = []
+
+        def submit(label):
+            scheduler.submit("groq", "m").add_done_callback(lambda _: order.append(label))
+
+        with llm_flow("A"):
+            for label in ["A1", "A2", "A3"]:
+                submit(label)
+            with llm_priority(HIGH):
+                submit("judge")
+        with llm_flow("B"):
+            submit("B1")
+
+        deadline = time.monotonic() + 2
+        while len(order) < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert order == ["judge", "A1", "B1", "A2", "A3"]
+
+    def test_idle_flows_are_forgotten(self, scheduler):
+        for i in range(50):
+            with llm_flow(f"run-{i}"):
+                scheduler.acquire("groq", "m")
+
+        lane = scheduler._lane("groq", "m")
+        assert lane.flow_clock == {} and lane.flow_waiting == {}
+
+    def test_remaining_headers_drain_bucket(self):
+        scheduler = LLMScheduler(limits={"groq": {"rpm": 60}})
+        scheduler.observe("groq", "m", 200, {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "0.2s"})
+
+        t0 = time.monotonic()
+        scheduler.acquire("groq", "m")
+        assert time.monotonic() - t0 >= 0.15
+
+
+class TestTransports:
+    @staticmethod
+    def flaky_handler(calls):
+        def handler(request):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"retry-after-ms": "100"})
+            return httpx.Response(200, json={"ok": True})
+
+        return handler
+
+    def test_sync_retry_after_429(self, scheduler):
+        calls = []
+        client = httpx.Client(transport=RateLimitedTransport(httpx.MockTransport(self.flaky_handler(calls))))
+
+        response = client.send(chat_request())
+
+        assert response.status_code == 200
+        assert calls[1] - calls[0] >= 0.09
+        assert scheduler.stats()["rate_limited"] == 1 and scheduler.stats()["retries"] == 1
+
+    def test_async_retry_after_429(self, scheduler):
+        calls = []
+
+        async def send():
+            transport = AsyncRateLimitedTransport(httpx.MockTransport(self.flaky_handler(calls)))
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await client.send(chat_request())
+
+        assert asyncio.run(send()).status_code == 200
+        assert len(calls) == 2 and scheduler.stats()["retries"] == 1
+
+    def test_gives_up_after_max_retries(self, scheduler):
+        scheduler.max_backoff = 0.01
+        client = httpx.Client(transport=RateLimitedTransport(httpx.MockTransport(lambda request: httpx.Response(429))))
+
+        assert client.send(chat_request()).status_code == 429
+        assert scheduler.stats()["rate_limited"] == 3
+
+    def test_transient_errors_are_retried(self, scheduler):
+        scheduler.base_backoff = 0.01
+        responses = iter([httpx.Response(503), httpx.Response(200, json={"ok": True})])
+        client = httpx.Client(transport=RateLimitedTransport(httpx.MockTransport(lambda request: next(responses))))
+
+        assert client.send(chat_request()).status_code == 200
+        assert scheduler.stats()["retries"] == 1 and scheduler.stats()["rate_limited"] == 0
+
+    def test_async_connection_errors_are_retried_then_given_up(self, scheduler):
+        scheduler.base_backoff = 0.01
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("connection reset")
+            return httpx.Response(500)
+
+        async def send():
+            transport = AsyncRateLimitedTransport(httpx.MockTransport(handler))
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await client.send(chat_request())
+
+        # One connection error and two 500s use up the two transient retries
+        assert asyncio.run(send()).status_code == 500
+        assert len(calls) == 3
+        assert scheduler.retry_delay({}, 400) is None
@@ -0,0 +1,92 @@
+import logging
+import subprocess
+import sys
+import threading
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from tradingagents.agents.utils.embedding_cache import reset_embedding_cache
+from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.memory_store import get_memory_collection, reset_memory_clients
+
+
+class FakeEmbeddings:
+    def create(self, model, input):
+        return SimpleNamespace(
+            data=[SimpleNamespace(index=i, embedding=[float(len(t)), float(t.count("a"))]) for i, t in enumerate(input)]
+        )
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    reset_memory_clients()
+    reset_embedding_cache()
+    yield
+    reset_memory_clients()
+    reset_embedding_cache()
+
+
+def make_memory(name, memory_dir=None, **config):
+    config = {"embedding_provider": "ollama", "embedding_model": "nomic", "memory_dir": memory_dir, **config}
+    memory = FinancialSituationMemory(name, config)
+    memory.client = SimpleNamespace(embeddings=FakeEmbeddings())
+    return memory
+
+
+class TestMemoryStore:
+    def test_lazy_open_and_hnsw_parameters(self, tmp_path):
+        memory_dir = tmp_path / "memory"
+        memory = make_memory("bull_memory", str(memory_dir), memory_hnsw={"ef_search": 42, "max_neighbors": 8})
+        assert memory._collection is None and not memory_dir.exists()
+
+        assert memory.get_memories("anything") == []
+        hnsw = memory.situation_collection.configuration["hnsw"]
+        assert (hnsw["ef_search"], hnsw["max_neighbors"], hnsw["space"]) == (42, 8, "l2")
+        assert memory_dir.exists()
+
+    def test_reopening_updates_ef_search_and_warns_on_fixed_parameters(self, tmp_path, caplog):
+        memory_dir = str(tmp_path / "memory")
+        get_memory_collection("trader_memory", memory_dir, {"ef_search": 42})
+
+        with caplog.at_level(logging.WARNING, logger="tradingagents.agents.utils.memory_store"):
+            collection = get_memory_collection("trader_memory", memory_dir, {"ef_search": 64, "space": "cosine"})
+
+        hnsw = collection.configuration["hnsw"]
+        assert (hnsw["ef_search"], hnsw["space"]) == (64, "l2")
+        assert get_memory_collection("trader_memory", memory_dir, {"ef_search": 64}).configuration["hnsw"]["ef_search"] == 64
+        assert [r.message for r in caplog.records if "space" in r.message]
+
+    def test_same_names_in_one_process_share_the_collection(self):
+        name = f"trader-{uuid.uuid4().hex}"
+        first, second = make_memory(name), make_memory(name)
+        first.add_situations([("rates rising", "buy staples")])
+        assert second.get_memories("rates rising")[0]["recommendation"] == "buy staples"
+
+    def test_memories_survive_the_process(self, tmp_path):
+        memory_dir = str(tmp_path / "memory")
+        make_memory("risk_manager_memory", memory_dir).add_situations([("tech selloff", "reduce beta"), ("calm", "hold")])
+
+        code = (
+            "from tradingagents.agents.utils.memory_store import get_memory_collection;"
+            f"print(get_memory_collection('risk_manager_memory', {memory_dir!r}).count())"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "2"
+
+    def test_concurrent_graph_instances_add_safely(self, tmp_path):
+        memory_dir = str(tmp_path / "memory")
+        memories = [make_memory("bear_memory", memory_dir) for _ in range(4)]
+
+        def add(memory, worker):
+            for i in range(5):
+                memory.add_situations([(f"situation {worker}-{i}", f"advice {worker}-{i}")])
+
+        threads = [threading.Thread(target=add, args=(m, w)) for w, m in enumerate(memories)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert memories[0].situation_collection.count() == 20
@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+from langgraph.prebuilt import ToolNode
+
+from tradingagents.graph import setup as graph_setup_module
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.propagation import Propagator
+from tradingagents.graph.setup import GraphSetup
+
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+REPORT_KEYS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+TOOL_SECONDS = 0.3
+
+
+def _fake_analyst(analyst_type, seen):
+    """Calls its tool once, then writes a report naming the tool results it saw."""
+
+    def node(state):
+        messages = state["messages"]
+        seen.setdefault(analyst_type, []).append([m.content for m in messages])
+        tool_results = [m.content for m in messages if m.type == "tool"]
+        if not tool_results:
+            call = {"name": f"lookup_{analyst_type}", "args": {}, "id": f"call_{analyst_type}"}
+            return {"messages": [AIMessage(content="", tool_calls=[call])]}
+        return {
+            "messages": [AIMessage(content="done")],
+            REPORT_KEYS[analyst_type]: f"{analyst_type}: {', '.join(tool_results)}",
+        }
+
+    return node
+
+
+def _make_tool(analyst_type, active, overlaps):
+    @tool(f"lookup_{analyst_type}")
+    def lookup() -> str:
+        """Slow data lookup."""
+        with active["lock"]:
+            active["count"] += 1
+            overlaps.append(active["count"])
+        time.sleep(TOOL_SECONDS)
+        with active["lock"]:
+            active["count"] -= 1
+        return f"{analyst_type} data"
+
+    return lookup
+
+
+@pytest.fixture
+def fake_agents(monkeypatch):
+    seen = {}
+    bull_inputs = []
+
+    for analyst_type, factory in [
+        ("market", "create_market_analyst"),
+        ("social", "create_social_media_analyst"),
+        ("news", "create_news_analyst"),
+        ("fundamentals", "create_fundamentals_analyst"),
+    ]:
+        monkeypatch.setattr(
+            graph_setup_module, factory, lambda llm, toolkit, a=analyst_type: _fake_analyst(a, seen)
+        )
+
+    def bull(llm, memory, debate_context=None):
+        def node(state):
+            bull_inputs.append({key: state[key] for key in REPORT_KEYS.values()})
+            return {
+                "investment_debate_state": {
+                    "history": "", "bull_history": "", "bear_history": "",
+                    "current_response": "Bull", "judge_decision": "", "count": 2,
+                }
+            }
+        return node
+
+    monkeypatch.setattr(graph_setup_module, "create_bull_researcher", bull)
+    monkeypatch.setattr(graph_setup_module, "create_bear_researcher", lambda llm, memory, debate_context=None: lambda state: {})
+    monkeypatch.setattr(graph_setup_module, "create_research_manager", lambda llm, memory, debate_context=None: lambda state: {"investment_plan": "plan"})
+    monkeypatch.setattr(graph_setup_module, "create_trader", lambda llm, memory: lambda state: {"trader_investment_plan": "trade"})
+    risk_done = lambda llm=None, debate_context=None: lambda state: {"risk_debate_state": {"count": 3, "latest_speaker": "Risky"}}
+    monkeypatch.setattr(graph_setup_module, "create_risky_debator", risk_done)
+    monkeypatch.setattr(graph_setup_module, "create_safe_debator", risk_done)
+    monkeypatch.setattr(graph_setup_module, "create_neutral_debator", risk_done)
+    monkeypatch.setattr(graph_setup_module, "create_risk_manager", lambda llm, memory, debate_context=None: lambda state: {"final_trade_decision": "BUY"})
+
+    active = {"lock": threading.Lock(), "count": 0}
+    overlaps = []
+    tool_nodes = {a: ToolNode([_make_tool(a, active, overlaps)]) for a in ANALYSTS}
+    graph_setup = GraphSetup(None, None, None, tool_nodes, None, None, None, None, None, ConditionalLogic())
+    return graph_setup, seen, bull_inputs, overlaps
+
+
+def _initial_state():
+    return Propagator().create_initial_state("AAPL", "2024-05-10", "2024-05-10")
+
+
+class TestParallelAnalysts:
+    def test_analysts_overlap_and_all_reports_reach_bull(self, fake_agents):
+        graph_setup, _, bull_inputs, overlaps = fake_agents
+        graph = graph_setup.setup_graph(ANALYSTS, parallel_analysts=True)
+
+        t0 = time.monotonic()
+        final = graph.invoke(_initial_state())
+        elapsed = time.monotonic() - t0
+
+        assert max(overlaps) == len(ANALYSTS)
+        assert elapsed < TOOL_SECONDS * len(ANALYSTS)
+        # The join waits for every analyst before the Bull Researcher runs once
+        assert len(bull_inputs) == 1
+        for analyst_type, key in REPORT_KEYS.items():
+            assert bull_inputs[0][key] == f"{analyst_type}: {analyst_type} data"
+        assert final["final_trade_decision"] == "BUY"
+
+    def test_each_analyst_only_sees_its_own_conversation(self, fake_agents):
+        graph_setup, seen, _, _ = fake_agents
+        final = graph_setup.setup_graph(ANALYSTS, parallel_analysts=True).invoke(_initial_state())
+
+        for analyst_type in ANALYSTS:
+            first_call, second_call = seen[analyst_type]
+            assert first_call == ["AAPL"]
+            assert second_call == ["AAPL", "", f"{analyst_type} data"]
+            # Msg Clear only emptied this analyst's channel
+            assert [m.content for m in final[f"{analyst_type}_messages"]] == ["Continue"]
+        # Only the finished reports reach the shared channel
+        assert [m.content for m in final["messages"]] == ["AAPL"] + ["done"] * len(ANALYSTS)
+        assert not any(getattr(m, "tool_calls", None) for m in final["messages"])
+
+    def test_serial_mode_is_unchanged(self, fake_agents):
+        graph_setup, _, bull_inputs, overlaps = fake_agents
+        final = graph_setup.setup_graph(["market", "news"]).invoke(_initial_state())
+
+        assert max(overlaps) == 1
+        assert bull_inputs[0]["market_report"] == "market: market data"
+        assert bull_inputs[0]["news_report"] == "news: news data"
+        assert not final.get("market_messages")
@@ -0,0 +1,61 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.price_store import PriceStore, get_price_store
+from tradingagents.dataflows.stockstats_utils import StockstatsUtils
+
+from tests.conftest import write_price_csv
+
+
+class TestPriceStore:
+    def test_load_range_is_inclusive(self, price_data_dir, tmp_path):
+        store = PriceStore(str(tmp_path / "store"), str(price_data_dir))
+        df = store.load("TEST", "2024-01-03", "2024-01-05")
+        assert list(df.index.strftime("%Y-%m-%d")) == ["2024-01-03", "2024-01-04", "2024-01-05"]
+        assert list(df.columns) == ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+        assert df["Volume"].dtype.kind == "i"
+
+    def test_load_rows_keeps_csv_layout(self, price_data_dir, tmp_path):
+        store = PriceStore(str(tmp_path / "store"), str(price_data_dir))
+        csv = pd.read_csv(price_data_dir / "TEST-YFin-data-2015-01-01-2025-03-25.csv")
+        expected = csv[(csv["Date"] >= "2024-02-01") & (csv["Date"] <= "2024-02-10")]
+        rows = store.load_rows("TEST", "2024-02-01", "2024-02-10")
+        pd.testing.assert_frame_equal(rows, expected, check_index_type=False)
+
+    def test_rebuilds_when_source_changes(self, price_data_dir, tmp_path):
+        store = PriceStore(str(tmp_path / "store"), str(price_data_dir))
+        assert store.load("TEST", "2024-01-02", "2024-01-02")["Close"].iloc[0] == 101.5
+
+        time.sleep(0.01)
+        csv_path = price_data_dir / "TEST-YFin-data-2015-01-01-2025-03-25.csv"
+        write_price_csv(csv_path, ["2024-01-01", "2024-01-02"], start_price=10.0)
+        os.utime(csv_path, None)
+        assert store.load("TEST", "2024-01-02", "2024-01-02")["Close"].iloc[0] == 11.5
+
+    def test_missing_symbol_raises(self, price_data_dir, tmp_path):
+        store = PriceStore(str(tmp_path / "store"), str(price_data_dir))
+        with pytest.raises(FileNotFoundError):
+            store.load("NOPE")
+
+
+class TestInterfaceReadsStore:
+    def test_get_yfin_data(self, price_data_dir):
+        df = interface.get_YFin_data("TEST", "2024-01-08", "2024-01-12")
+        assert list(df["Date"]) == ["2024-01-08", "2024-01-09", "2024-01-10", "2024-01-11", "2024-01-12"]
+        assert list(df.index) == list(range(5))
+        assert os.path.isdir(os.path.join(os.path.dirname(price_data_dir), "price_store", "TEST"))
+
+    def test_get_yfin_data_window(self, price_data_dir):
+        text = interface.get_YFin_data_window("TEST", "2024-01-05", 3)
+        assert text.startswith("## Raw Market Data for TEST from 2024-01-02 to 2024-01-05")
+        assert "2024-01-05" in text and "2024-01-01" not in text
+
+    def test_read_cached_price_data_trims_to_end_date(self, price_data_dir):
+        df = StockstatsUtils._read_cached_price_data("TEST", str(price_data_dir), end_date="2024-01-10")
+        assert df.index[-1] == pd.Timestamp("2024-01-10")
+        assert "close" in df.columns
+        assert get_price_store(source_dir=str(price_data_dir)).has("TEST")
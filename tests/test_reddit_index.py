@@ -0,0 +1,128 @@
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from tradingagents.dataflows import reddit_utils
+from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.reddit_utils import REDDIT_INDEX_FILENAME, fetch_top_from_category
+
+
+def _post(day, hour, title, ups, selftext=""):
+    created = datetime.strptime(day, "%Y-%m-%d").replace(hour=hour, tzinfo=timezone.utc).timestamp()
+    return {"created_utc": created, "title": title, "selftext": selftext, "url": f"https://x/{title}", "ups": ups}
+
+
+def _write_jsonl(path, posts):
+    with open(path, "w", encoding="utf-8") as f:
+        for post in posts:
+            f.write(json.dumps(post) + "\n")
+        f.write("\n")
+
+
+@pytest.fixture
+def reddit_dir(tmp_path):
+    data_path = tmp_path / "reddit_data"
+    (data_path / "global_news").mkdir(parents=True)
+    (data_path / "company_news").mkdir(parents=True)
+    _write_jsonl(
+        data_path / "global_news" / "worldnews.jsonl",
+        [
+            _post("2024-03-01", 1, "a", 5),
+            _post("2024-03-02", 1, "b", 7),
+            _post("2024-03-01", 23, "c", 9),
+            _post("2024-03-01", 12, "d", 1),
+        ],
+    )
+    _write_jsonl(data_path / "global_news" / "news.jsonl", [_post("2024-03-01", 3, "e", 2)])
+    _write_jsonl(
+        data_path / "company_news" / "stocks.jsonl",
+        [
+            _post("2024-03-01", 1, "Apple beats estimates", 3),
+            _post("2024-03-01", 2, "Nothing here", 50),
+            _post("2024-03-01", 3, "Quiet day", 4, selftext="AAPL is flat"),
+        ],
+    )
+    reddit_utils._indexes.clear()
+    yield str(data_path)
+    reddit_utils._indexes.clear()
+
+
+class TestRedditIndex:
+    def test_fetch_returns_day_sorted_by_upvotes(self, reddit_dir):
+        posts = fetch_top_from_category("global_news", "2024-03-01", 4, data_path=reddit_dir)
+        by_file = {p["title"] for p in posts}
+        assert by_file == {"c", "a", "e"}
+        worldnews = [p for p in posts if p["title"] in {"a", "c", "d"}]
+        assert [p["upvotes"] for p in worldnews] == [9, 5]
+        assert all(p["posted_date"] == "2024-03-01" for p in posts)
+        assert posts[0].keys() == {"title", "content", "url", "upvotes", "posted_date"}
+
+    def test_company_query_filter(self, reddit_dir):
+        posts = fetch_top_from_category("company_news", "2024-03-01", 10, "AAPL", data_path=reddit_dir)
+        assert [p["title"] for p in posts] == ["Quiet day", "Apple beats estimates"]
+
+    def test_index_is_built_once(self, reddit_dir):
+        fetch_top_from_category("global_news", "2024-03-01", 4, data_path=reddit_dir)
+        index_path = os.path.join(reddit_dir, REDDIT_INDEX_FILENAME)
+        with sqlite3.connect(index_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM posts WHERE category = 'global_news'").fetchone()[0] == 5
+
+        reddit_utils._indexes.clear()
+        index = reddit_utils.get_reddit_index(reddit_dir)
+        index._index_file = None  # any re-index attempt would fail
+        index.ensure_category("global_news")
+
+    def test_changed_file_is_reindexed(self, reddit_dir):
+        assert fetch_top_from_category("global_news", "2024-03-02", 4, data_path=reddit_dir)[0]["title"] == "b"
+
+        time.sleep(0.01)
+        _write_jsonl(os.path.join(reddit_dir, "global_news", "worldnews.jsonl"), [_post("2024-03-02", 5, "z", 1)])
+        posts = fetch_top_from_category("global_news", "2024-03-02", 4, data_path=reddit_dir)
+        assert [p["title"] for p in posts] == ["z"]
+
+    def test_max_limit_check_is_kept(self, reddit_dir):
+        with pytest.raises(ValueError):
+            fetch_top_from_category("global_news", "2024-03-01", 1, data_path=reddit_dir)
+
+
+class TestMentionTagging:
+    def test_matcher_reports_overlapping_terms(self):
+        from tradingagents.dataflows.reddit_utils import MentionMatcher
+
+        matcher = MentionMatcher({"META": ["Meta", "Facebook"], "MPL": ["Meta Platforms"], "V": ["Visa"]})
+        assert matcher.tickers_in("meta platforms and FACEBOOK") == {"META", "MPL"}
+        assert matcher.tickers_in("", "pay with visa") == {"V"}
+        assert matcher.tickers_in("nothing") == set()
+
+    def test_mentions_are_stored_at_ingest(self, reddit_dir):
+        fetch_top_from_category("company_news", "2024-03-01", 10, "AAPL", data_path=reddit_dir)
+        with sqlite3.connect(os.path.join(reddit_dir, REDDIT_INDEX_FILENAME)) as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM mentions WHERE ticker = 'AAPL'").fetchone()[0]
+            global_rows = conn.execute("SELECT COUNT(*) FROM mentions WHERE category = 'global_news'").fetchone()[0]
+        assert rows == 2
+        assert global_rows == 0
+
+    def test_alias_file_extends_table(self, reddit_dir):
+        with open(os.path.join(reddit_dir, "ticker_aliases.json"), "w") as f:
+            json.dump({"NOTH": "Nothing OR Nada"}, f)
+        posts = fetch_top_from_category("company_news", "2024-03-01", 10, "NOTH", data_path=reddit_dir)
+        assert [p["title"] for p in posts] == ["Nothing here"]
+
+    def test_alias_change_retags_existing_index(self, reddit_dir):
+        assert fetch_top_from_category("company_news", "2024-03-01", 10, "ZZQ", data_path=reddit_dir) == []
+
+        reddit_utils._indexes.clear()
+        set_config({"reddit_ticker_aliases": {"ZZQ": ["quiet day"]}})
+        try:
+            posts = fetch_top_from_category("company_news", "2024-03-01", 10, "ZZQ", data_path=reddit_dir)
+        finally:
+            set_config({"reddit_ticker_aliases": {}})
+        assert [p["title"] for p in posts] == ["Quiet day"]
+
+    def test_unknown_ticker_scans_day(self, reddit_dir):
+        posts = fetch_top_from_category("company_news", "2024-03-01", 10, "beats", data_path=reddit_dir)
+        assert [p["title"] for p in posts] == ["Apple beats estimates"]
@@ -0,0 +1,52 @@
+import threading
+
+from tradingagents.graph.reflection import COMPONENTS, Reflector
+
+from .conftest import SleepyChatModel
+
+
+class RecordingMemory:
+    embed_calls = 0
+
+    def __init__(self):
+        self.added = []
+
+    def get_embedding(self, text):
+        RecordingMemory.embed_calls += 1
+        return [1.0, 2.0]
+
+    def add_situations(self, situations_and_advice, embeddings=None):
+        self.added.append((situations_and_advice, embeddings, threading.current_thread().name))
+
+
+class TestReflectAll:
+    def test_reflections_run_concurrently_and_share_the_situation(self, sample_state_data):
+        RecordingMemory.embed_calls = 0
+        reflector = Reflector(SleepyChatModel(delay=0.2))
+        memories = {component: RecordingMemory() for component in COMPONENTS}
+
+        timings = reflector.reflect_all(sample_state_data, 0.05, memories)
+
+        assert RecordingMemory.embed_calls == 1
+        situation = reflector._extract_current_situation(sample_state_data)
+        for memory in memories.values():
+            [(entries, embeddings, thread)] = memory.added
+            assert entries == [(situation, "BUY")] and embeddings == [[1.0, 2.0]]
+            assert thread.startswith("reflection")
+
+        assert set(timings) == set(COMPONENTS) | {"situation", "embedding", "total"}
+        assert all(timings[c] >= 0.2 for c in COMPONENTS)
+        # Five 0.2s reflections overlap instead of taking a second
+        assert timings["total"] < 0.6
+
+    def test_bounded_workers_and_single_component_api(self, sample_state_data):
+        reflector = Reflector(SleepyChatModel(delay=0.1))
+        memories = {component: RecordingMemory() for component in COMPONENTS}
+
+        timings = reflector.reflect_all(sample_state_data, -0.02, memories, max_workers=2)
+        assert timings["total"] >= 0.3
+
+        trader = RecordingMemory()
+        reflector.reflect_trader(sample_state_data, -0.02, trader)
+        [(entries, embeddings, _)] = trader.added
+        assert entries[0][1] == "BUY" and embeddings is None
@@ -0,0 +1,149 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import akshare_utils, segment_cache
+from tradingagents.dataflows.data_source_manager import DataSourceManager
+from tradingagents.dataflows.segment_cache import SegmentPriceCache, find_gaps, merge_intervals
+
+
+def _source(calls, indexed=True, holidays=()):
+    """A fake daily-bar source over 2024 business days that records each fetch."""
+
+    def fetch(start, end):
+        calls.append((start, end))
+        days = pd.bdate_range(start, end).difference(pd.DatetimeIndex(holidays))
+        frame = pd.DataFrame({"close": [float(d.day) for d in days]})
+        if indexed:
+            frame.index = pd.DatetimeIndex(days, name="date")
+        else:
+            frame.insert(0, "date", days)
+        return frame
+
+    return fetch
+
+
+@pytest.fixture(autouse=True)
+def fresh_shared_cache():
+    segment_cache.reset_segment_cache()
+    yield
+    segment_cache.reset_segment_cache()
+
+
+class TestIntervals:
+    def test_merge_adjacent(self):
+        d = date
+        assert merge_intervals([(d(2024, 1, 5), d(2024, 1, 9)), (d(2024, 1, 1), d(2024, 1, 4))]) == [
+            (d(2024, 1, 1), d(2024, 1, 9))
+        ]
+
+    def test_gaps(self):
+        d = date
+        covered = [(d(2024, 1, 3), d(2024, 1, 5)), (d(2024, 1, 10), d(2024, 1, 12))]
+        assert find_gaps(d(2024, 1, 1), d(2024, 1, 15), covered) == [
+            (d(2024, 1, 1), d(2024, 1, 2)),
+            (d(2024, 1, 6), d(2024, 1, 9)),
+            (d(2024, 1, 13), d(2024, 1, 15)),
+        ]
+        assert find_gaps(d(2024, 1, 3), d(2024, 1, 4), covered) == []
+
+
+class TestSegmentPriceCache:
+    def test_shifted_window_fetches_only_new_day(self):
+        calls = []
+        cache = SegmentPriceCache()
+        first = cache.get_range("t", "AAA", "2024-01-01", "2024-06-28", _source(calls))
+        second = cache.get_range("t", "AAA", "2024-01-01", "2024-07-01", _source(calls))
+
+        assert calls == [("2024-01-01", "2024-06-28"), ("2024-06-29", "2024-07-01")]
+        pd.testing.assert_frame_equal(second.iloc[:-1], first)
+        assert second.index[-1] == pd.Timestamp("2024-07-01")
+
+    def test_sub_range_is_served_locally(self):
+        calls = []
+        cache = SegmentPriceCache()
+        cache.get_range("t", "AAA", "2024-01-01", "2024-03-29", _source(calls))
+        sub = cache.get_range("t", "AAA", "2024-02-05", "2024-02-09", _source(calls))
+        assert len(calls) == 1
+        assert list(sub["close"]) == [5.0, 6.0, 7.0, 8.0, 9.0]
+        assert cache.stats()["full_hits"] == 1
+
+    def test_weekend_only_gap_is_skipped(self):
+        calls = []
+        cache = SegmentPriceCache()
+        cache.get_range("t", "AAA", "2024-01-01", "2024-01-05", _source(calls))
+        cache.get_range("t", "AAA", "2024-01-01", "2024-01-07", _source(calls))
+        assert len(calls) == 1
+
+    def test_bare_empty_frame_is_not_recorded(self):
+        calls = []
+        cache = SegmentPriceCache()
+        empty = lambda start, end: calls.append((start, end)) or pd.DataFrame()
+        assert cache.get_range("t", "AAA", "2024-01-01", "2024-01-05", empty).empty
+        cache.get_range("t", "AAA", "2024-01-01", "2024-01-05", _source(calls))
+        assert len(calls) == 2
+        assert cache.coverage("t", "AAA") == [("2024-01-01", "2024-01-05")]
+
+    def test_holiday_gap_is_recorded(self):
+        calls = []
+        cache = SegmentPriceCache()
+        source = _source(calls, holidays=["2024-01-01"])
+        cache.get_range("t", "AAA", "2024-01-02", "2024-01-05", source)
+        holiday = cache.get_range("t", "AAA", "2024-01-01", "2024-01-01", source)
+        week = cache.get_range("t", "AAA", "2024-01-01", "2024-01-05", source)
+
+        assert holiday.empty and len(week) == 4
+        assert calls == [("2024-01-02", "2024-01-05"), ("2024-01-01", "2024-01-01")]
+        assert cache.coverage("t", "AAA") == [("2024-01-01", "2024-01-05")]
+
+    def test_none_gap_keeps_cached_rows(self):
+        calls = []
+        cache = SegmentPriceCache()
+        cache.get_range("t", "AAA", "2024-01-01", "2024-01-05", _source(calls))
+
+        no_data = lambda start, end: calls.append((start, end))
+        week = cache.get_range("t", "AAA", "2024-01-01", "2024-01-08", no_data)
+
+        assert calls[-1] == ("2024-01-06", "2024-01-08")
+        assert len(week) == 5
+        assert cache.coverage("t", "AAA") == [("2024-01-01", "2024-01-05")]
+        # Nothing cached for the range: the source's answer is passed through
+        assert cache.get_range("t", "AAA", "2024-01-08", "2024-01-08", no_data) is None
+
+    def test_today_is_never_covered(self):
+        calls = []
+        cache = SegmentPriceCache()
+        today = date.today().strftime("%Y-%m-%d")
+        cache.get_range("t", "AAA", today, today, _source(calls))
+        cache.get_range("t", "AAA", today, today, _source(calls))
+        assert cache.coverage("t", "AAA") == []
+
+    def test_column_dated_frames_keep_range_index(self):
+        calls = []
+        cache = SegmentPriceCache()
+        cache.get_range("t", "AAA", "2024-01-08", "2024-01-12", _source(calls, indexed=False))
+        result = cache.get_range("t", "AAA", "2024-01-01", "2024-01-12", _source(calls, indexed=False))
+        assert list(result.index) == list(range(10))
+        assert result["date"].is_monotonic_increasing
+
+    def test_persisted_segments(self, tmp_path):
+        calls = []
+        SegmentPriceCache(str(tmp_path)).get_range("t", "AAA", "2024-01-01", "2024-01-31", _source(calls))
+        result = SegmentPriceCache(str(tmp_path)).get_range("t", "AAA", "2024-01-10", "2024-01-20", _source(calls))
+        assert len(calls) == 1 and len(result) == 8
+
+
+class TestCallers:
+    def test_akshare_daily_fetches_gaps(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(akshare_utils, "_fetch_stock_zh_a_daily", lambda s, a, b: _source(calls)(a, b))
+        akshare_utils.get_stock_zh_a_daily("000001.SZ", "2024-01-01", "2024-01-31")
+        akshare_utils.get_stock_zh_a_daily("000001.SZ", "2024-01-02", "2024-02-01")
+        assert calls == [("2024-01-01", "2024-01-31"), ("2024-02-01", "2024-02-01")]
+
+    def test_data_source_manager_raises_without_data(self, monkeypatch):
+        manager = DataSourceManager()
+        monkeypatch.setattr(manager, "_fetch_stock_data", lambda s, a, b: pd.DataFrame())
+        with pytest.raises(Exception, match="Failed to get data from all sources"):
+            manager.get_stock_data("AAPL", "2024-01-01", "2024-01-05")
@@ -0,0 +1,115 @@
+"""
+Tests for the rule-based decision extraction in SignalProcessor
+"""
+
+import asyncio
+
+import pytest
+
+from tradingagents.graph.signal_processing import SignalProcessor, extract_decision
+
+from .conftest import SleepyChatModel
+
+
+class CountingModel(SleepyChatModel):
+    calls: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+class TestExtractDecision:
+    @pytest.mark.parametrize(
+        "text, decision, rule",
+        [
+            ("持有", "持有", "exact"),
+            ("**SELL**", "卖出", "exact"),
+            ("分析……\nFINAL TRANSACTION PROPOSAL: **买入**", "买入", "final_proposal"),
+            ("综上，风险偏高。\n最终决策：卖出", "卖出", "final_marker"),
+            ("**最终决策：买入** … 保守分析师的建议：卖出，但其担忧已被充分反驳。", "买入", "final_marker"),
+            ("Final decision: BUY. The safe analyst's recommendation: SELL was considered and rejected.", "买入", "final_marker"),
+            ("风险可控。\n建议：卖出", "卖出", "marker"),
+            ("Recommendation: **Buy** with a tight stop.", "买入", "marker"),
+            ("| 项目 | 内容 |\n|---|---|\n| **建议** | 持有 |", "持有", "table"),
+        ],
+    )
+    def test_markers(self, text, decision, rule):
+        found, confidence, used = extract_decision(text)
+        assert (found, used) == (decision, rule)
+        assert confidence >= 0.8
+
+    def test_marker_beats_keywords(self):
+        text = "看涨方主张买入，看跌方主张卖出，买入理由更多：买入。\n最终建议：持有"
+        assert extract_decision(text)[0] == "持有"
+
+    def test_conflicting_markers_are_ambiguous(self):
+        decision, confidence, rule = extract_decision("激进分析师建议：买入。\n保守分析师建议：卖出。")
+        assert rule == "marker_conflict" and confidence < 0.8
+        text = "FINAL TRANSACTION PROPOSAL: **HOLD**\n更新后 FINAL TRANSACTION PROPOSAL: **卖出**"
+        assert extract_decision(text)[1] < 0.8
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "不建议卖出，不推荐买入，继续持有，持有为主，坚定持有",
+            "We do not recommend to SELL and don't BUY here; HOLD, HOLD and HOLD.",
+        ],
+    )
+    def test_keywords_skip_negations(self, text):
+        decision, confidence, rule = extract_decision(text)
+        assert (decision, rule) == ("持有", "keywords")
+        assert confidence >= 0.8
+
+    @pytest.mark.parametrize(
+        "text, decision",
+        [
+            ("Recommendation: Buy-side consensus is mixed; SELL.", "卖出"),
+            (
+                "Sellers dominated the sell-off while insiders kept selling; holding is costly for "
+                "shareholders, although the buyback and new buyers may help. BUY",
+                "买入",
+            ),
+        ],
+    )
+    def test_english_words_inside_other_words_do_not_count(self, text, decision):
+        # Only the standalone word counts, once, which is too weak for the fast path
+        found, confidence, rule = extract_decision(text)
+        assert (found, rule) == (decision, "keywords")
+        assert confidence < 0.8
+
+    def test_english_word_next_to_cjk_still_counts(self):
+        assert extract_decision("综上所述，建议BUY")[0] == "买入"
+
+    def test_split_or_missing_signal_is_ambiguous(self):
+        assert extract_decision("买入的理由和卖出的理由一样多")[1] < 0.8
+        assert extract_decision("The outlook is unclear.") == (None, 0.0, "none")
+
+
+class TestSignalProcessor:
+    def test_fast_path_skips_llm(self):
+        llm = CountingModel(delay=0)
+        processor = SignalProcessor(llm)
+
+        assert processor.process_signal("FINAL TRANSACTION PROPOSAL: **卖出**") == "卖出"
+        assert asyncio.run(processor.aprocess_signal("最终决策：持有")) == "持有"
+
+        assert llm.calls == 0
+        stats = processor.stats()
+        assert stats["fast_path"] == 2 and stats["llm"] == 0
+        assert stats["rule:final_proposal"] == 1 and stats["rule:final_marker"] == 1
+
+    def test_ambiguous_signal_falls_back_to_llm(self):
+        llm = CountingModel(delay=0)
+        processor = SignalProcessor(llm)
+
+        assert processor.process_signal("买入还是卖出，尚无定论") == "BUY"
+        assert llm.calls == 1
+        assert processor.stats()["fast_path_rate"] == 0.0
+
+    def test_threshold_above_one_disables_fast_path(self):
+        llm = CountingModel(delay=0)
+        processor = SignalProcessor(llm, min_confidence=1.1)
+
+        assert processor.process_signal("持有") == "BUY"
+        assert llm.calls == 1
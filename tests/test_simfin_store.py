@@ -0,0 +1,103 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.simfin_store import SimFinStore
+
+
+ROWS = [
+    # Ticker, SimFinId, Report Date, Publish Date, Revenue, Currency
+    ("AAA", 1, "2023-03-31", "2023-05-01", 10.0, "USD"),
+    ("BBB", 2, "2023-03-31", "2023-04-20", 20.0, "USD"),
+    ("AAA", 1, "2023-06-30", "2023-08-01", 11.0, "USD"),
+    ("AAA", 1, "2022-12-31", "2023-02-15", None, "USD"),
+    ("BBB", 2, "2023-06-30", "2023-08-01", 21.0, "USD"),
+    ("BBB", 2, "2023-06-30", "2023-08-01", 22.0, "USD"),
+]
+
+
+def _write_bulk(data_dir, rows=ROWS):
+    path = os.path.join(
+        data_dir, "fundamental_data", "simfin_data_all", "balance_sheet", "companies", "us", "us-balance-quarterly.csv"
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame(
+        rows, columns=["Ticker", "SimFinId", "Report Date", "Publish Date", "Revenue", "Currency"]
+    ).to_csv(path, sep=";", index=False)
+    return path
+
+
+def _reference(csv_path, ticker, curr_date):
+    df = pd.read_csv(csv_path, sep=";")
+    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    if filtered_df.empty:
+        return None
+    return filtered_df.loc[filtered_df["Publish Date"].idxmax()]
+
+
+@pytest.fixture
+def simfin_dir(tmp_path):
+    csv_path = _write_bulk(str(tmp_path))
+    return tmp_path, csv_path
+
+
+class TestSimFinStore:
+    @pytest.mark.parametrize(
+        "ticker,curr_date",
+        [("AAA", "2023-02-15"), ("AAA", "2023-07-01"), ("AAA", "2024-01-01"), ("BBB", "2023-08-01"), ("AAA", "2023-01-01"), ("CCC", "2024-01-01")],
+    )
+    def test_as_of_matches_bulk_scan(self, simfin_dir, ticker, curr_date):
+        data_dir, csv_path = simfin_dir
+        store = SimFinStore(str(data_dir))
+        row = store.as_of("balance_sheet", "quarterly", ticker, curr_date)
+        expected = _reference(csv_path, ticker, curr_date)
+        if expected is None:
+            assert row is None
+        else:
+            pd.testing.assert_series_equal(row, expected)
+            assert str(row) == str(expected)
+
+    def test_reconverts_when_source_changes(self, simfin_dir):
+        data_dir, csv_path = simfin_dir
+        store = SimFinStore(str(data_dir))
+        assert store.as_of("balance_sheet", "quarterly", "AAA", "2024-01-01")["Revenue"] == 11.0
+
+        time.sleep(0.01)
+        _write_bulk(str(data_dir), ROWS + [("AAA", 1, "2023-09-30", "2023-11-01", 12.0, "USD")])
+        assert store.as_of("balance_sheet", "quarterly", "AAA", "2024-01-01")["Revenue"] == 12.0
+
+    def test_batch_matches_single_lookups(self, simfin_dir):
+        data_dir, _ = simfin_dir
+        store = SimFinStore(str(data_dir))
+        requests = pd.DataFrame(
+            {
+                "Ticker": ["AAA", "BBB", "AAA", "CCC", "AAA"],
+                "Date": ["2024-01-01", "2023-08-01", "2023-01-01", "2024-01-01", "2023-05-15"],
+            }
+        )
+        result = store.as_of_batch("balance_sheet", "quarterly", requests)
+
+        assert list(result["Ticker"]) == list(requests["Ticker"])
+        for i, (ticker, date) in requests.iterrows():
+            single = store.as_of("balance_sheet", "quarterly", ticker, date)
+            if single is None:
+                assert pd.isna(result.loc[i, "Publish Date"])
+            else:
+                assert result.loc[i, "Publish Date"] == single["Publish Date"]
+                assert result.loc[i, "Revenue"] == single["Revenue"] or (
+                    pd.isna(result.loc[i, "Revenue"]) and pd.isna(single["Revenue"])
+                )
+
+    def test_interface_output_is_unchanged(self, simfin_dir, monkeypatch):
+        data_dir, csv_path = simfin_dir
+        monkeypatch.setattr(interface, "DATA_DIR", str(data_dir))
+        text = interface.get_simfin_balance_sheet("BBB", "quarterly", "2023-12-31")
+        expected = _reference(csv_path, "BBB", "2023-12-31").drop("SimFinId")
+        assert text.startswith("## quarterly balance sheet for BBB released on 2023-08-01: \n" + str(expected))
+        assert interface.get_simfin_balance_sheet("BBB", "quarterly", "2020-01-01") == ""
@@ -0,0 +1,161 @@
+import time
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import finnhub_utils, yfin_utils
+from tradingagents.dataflows.china_stock_data_sources import ChinaStockDataManager
+from tradingagents.dataflows.enhanced_data_source_manager import EnhancedDataSourceManager
+from tradingagents.dataflows.hedged_fetch import hedged_fetch
+from tradingagents.dataflows.source_health import (
+    CLOSED,
+    HALF_OPEN,
+    CircuitOpenError,
+    OPEN,
+    SourceHealthRegistry,
+    get_health_registry,
+)
+
+ROWS = pd.DataFrame({"close": [1.0]})
+
+
+def _fail():
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def registry():
+    return SourceHealthRegistry(window=10, failure_threshold=0.5, min_calls=4, open_seconds=0.1)
+
+
+def _fail_n(registry, source, n):
+    for _ in range(n):
+        registry.record(source, False, 0.01, "boom")
+
+
+class TestBreaker:
+    def test_opens_after_failure_threshold(self, registry):
+        _fail_n(registry, "akshare", 3)
+        # Below min_calls: still closed
+        assert registry._sources["akshare"].state == CLOSED
+        _fail_n(registry, "akshare", 1)
+        assert registry._sources["akshare"].state == OPEN
+        assert registry.status("akshare") == "circuit_open"
+        assert registry.order(["akshare", "yfin"]) == ["yfin"]
+
+    def test_mixed_results_below_threshold_stay_closed(self, registry):
+        for ok in (True, True, False, True, True, False):
+            registry.record("yfin", ok, 0.01)
+        assert registry._sources["yfin"].state == CLOSED
+        assert registry.status("yfin") == "degraded"
+
+    def test_half_open_probe_success_closes(self, registry):
+        _fail_n(registry, "akshare", 4)
+        time.sleep(0.15)
+        assert registry.order(["akshare"]) == ["akshare"]
+
+        def probe():
+            assert registry._sources["akshare"].state == HALF_OPEN
+            # Only one probe at a time
+            assert registry.allow("akshare") is False
+            with pytest.raises(CircuitOpenError):
+                registry.track("akshare", lambda: ROWS)()
+            return ROWS
+
+        assert registry.track("akshare", probe)() is ROWS
+        assert registry._sources["akshare"].state == CLOSED
+        assert registry.status("akshare") == "available"
+
+    def test_half_open_probe_failure_reopens(self, registry):
+        _fail_n(registry, "akshare", 4)
+        time.sleep(0.15)
+        assert registry.allow("akshare")
+        with pytest.raises(RuntimeError):
+            registry.track("akshare", _fail)()
+        assert registry._sources["akshare"].state == OPEN
+        assert registry.order(["akshare", "yfin"]) == ["yfin"]
+
+    def test_order_does_not_claim_the_probe(self, registry):
+        _fail_n(registry, "akshare", 4)
+        time.sleep(0.15)
+        for _ in range(3):
+            assert registry.order(["akshare", "yfin"]) == ["akshare", "yfin"]
+        # Ordering alone leaves the breaker open, ready for the first real call
+        assert registry._sources["akshare"].state == OPEN
+        assert registry.allow("akshare")
+
+    def test_all_open_keeps_configured_order(self, registry):
+        _fail_n(registry, "a", 4)
+        _fail_n(registry, "b", 4)
+        assert registry.order(["a", "b"]) == ["a", "b"]
+        # The last attempt still runs and leaves the breaker as it was
+        assert registry.track("a", lambda: ROWS)() is ROWS
+        assert registry._sources["a"].state == OPEN
+
+
+class TestOrderingAndTracking:
+    def test_orders_by_mean_latency_unmeasured_last(self, registry):
+        registry.record("slow", True, 1.5)
+        registry.record("fast", True, 0.2)
+        assert registry.order(["unseen", "slow", "fast"]) == ["fast", "slow", "unseen"]
+
+    def test_track_records_exceptions_and_empty_results(self, registry):
+        with pytest.raises(RuntimeError):
+            registry.track("a", _fail)()
+        assert registry.track("a", lambda: pd.DataFrame())().empty
+        assert registry.track("a", lambda: ROWS)() is ROWS
+        assert registry.track("a", lambda: "", is_valid=bool)() == ""
+
+        stats = registry.snapshot()["a"]
+        assert stats["window_calls"] == 4
+        assert stats["success_rate"] == 0.25
+        assert stats["last_error"] == "no data returned"
+        assert stats["total_failures"] == 3
+
+    def test_status_unseen_is_none(self, registry):
+        assert registry.status("never") is None
+
+
+class TestManagerIntegration:
+    def test_china_manager_skips_source_with_open_breaker(self, monkeypatch):
+        manager = ChinaStockDataManager()
+        calls = []
+
+        def failing(*args):
+            calls.append("jqdata")
+            raise RuntimeError("jqdata down")
+
+        monkeypatch.setattr(manager.sources["jqdata"], "get_stock_data", failing)
+        monkeypatch.setattr(manager.sources["tushare"], "get_stock_data", lambda *a: ROWS.assign(source="tushare"))
+
+        df = manager.get_stock_data_enhanced("600000.SH", "2024-01-01", "2024-01-05")
+        assert list(df["source"]) == ["tushare"] and calls == ["jqdata"]
+
+        # A source with failures only has no measured latency, so the healthy one now goes first
+        assert get_health_registry().order(["jqdata", "tushare"]) == ["tushare", "jqdata"]
+
+        for _ in range(4):
+            get_health_registry().record("jqdata", False, 0.01, "jqdata down")
+        assert get_health_registry().status("jqdata") == "circuit_open"
+        assert get_health_registry().order(["jqdata", "tushare", "alltick"]) == ["tushare", "alltick"]
+
+    def test_finnhub_stock_data_is_a_frame_and_tracked_alike(self, monkeypatch, tmp_path):
+        def yfin_down(*args):
+            raise RuntimeError("yfin down")
+
+        payload = {"2024-01-02": [{"c": 185.6, "v": 100}], "2024-01-03": [{"c": 184.2, "v": 120}]}
+        monkeypatch.setattr(yfin_utils, "get_stock_data", yfin_down)
+        monkeypatch.setattr(finnhub_utils, "get_data_in_range", lambda *args, **kwargs: payload)
+
+        manager = EnhancedDataSourceManager(cache_dir=str(tmp_path))
+        df = manager.get_stock_data_enhanced("AAPL", "2024-01-01", "2024-01-05", use_cache=False)
+
+        assert list(df["c"]) == [185.6, 184.2]
+        assert df.index[0] == pd.Timestamp("2024-01-02")
+        assert get_health_registry().snapshot()["finnhub"]["success_rate"] == 1.0
+
+        # Without data both the registry and hedged_fetch count the call as failed
+        monkeypatch.setattr(finnhub_utils, "get_data_in_range", lambda *args, **kwargs: {})
+        tracked = get_health_registry().track("finnhub", lambda: finnhub_utils.get_stock_data_frame("AAPL", "a", "b", "."))
+        assert hedged_fetch([("finnhub", tracked)])[0] is None
+        assert get_health_registry().snapshot()["finnhub"]["total_failures"] == 1
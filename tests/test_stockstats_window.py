@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.stockstats_utils import StockstatsUtils
+
+
+def _parse_lines(text):
+    lines = {}
+    for line in text.split("\n\n")[1].splitlines():
+        day, value = line.split(": ", 1)
+        lines[day] = value
+    return lines
+
+
+class TestIndicatorWindow:
+    def test_window_series_keeps_prior_bar(self, price_data_dir):
+        series = StockstatsUtils.get_stock_stats_window(
+            "TEST", "close_10_ema", "2024-02-10", "2024-02-20", str(price_data_dir), online=False
+        )
+        assert series.index[0] == pd.Timestamp("2024-02-09")
+        assert series.index[-1] == pd.Timestamp("2024-02-20")
+
+    @pytest.mark.parametrize("indicator", ["close_10_ema", "macd", "rsi"])
+    def test_offline_window_matches_single_day_values(self, price_data_dir, indicator):
+        text = interface.get_stock_stats_indicators_window("TEST", indicator, "2024-03-04", 10, False)
+        lines = _parse_lines(text)
+
+        # Only trading days inside the window are listed, newest first
+        assert list(lines) == [
+            "2024-03-04", "2024-03-01", "2024-02-29", "2024-02-28", "2024-02-27", "2024-02-26", "2024-02-23",
+        ]
+        for day, value in lines.items():
+            assert value == interface.get_stockstats_indicator("TEST", indicator, day, False)
+
+    def test_window_computes_indicator_once(self, price_data_dir, monkeypatch):
+        calls = []
+        original = StockstatsUtils._compute_indicator
+
+        def counting(price_df, indicator, symbol=None):
+            calls.append(indicator)
+            return original(price_df, indicator, symbol)
+
+        monkeypatch.setattr(StockstatsUtils, "_compute_indicator", staticmethod(counting))
+        interface.get_stock_stats_indicators_window("TEST", "boll", "2024-03-29", 30, False)
+        assert calls == ["boll"]
+
+    def test_online_window_carries_values_over_weekends(self, price_data_dir, monkeypatch):
+        offline = StockstatsUtils._read_cached_price_data
+        monkeypatch.setattr(
+            StockstatsUtils,
+            "_download_price_data",
+            staticmethod(lambda symbol, end_date, lookback_days=None: offline(symbol, str(price_data_dir), end_date)),
+        )
+        lines = _parse_lines(interface.get_stock_stats_indicators_window("TEST", "close_10_ema", "2024-03-04", 3, True))
+        assert list(lines) == ["2024-03-04", "2024-03-03", "2024-03-02", "2024-03-01"]
+        assert lines["2024-03-03"] == lines["2024-03-02"] == lines["2024-03-01"]
@@ -0,0 +1,86 @@
+"""
+Tests for token-level streaming of graph runs
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessageChunk, ToolMessage
+from langchain_core.outputs import ChatGenerationChunk
+
+from tradingagents.graph.propagation import Propagator
+from tradingagents.graph.streaming import to_event
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+from .conftest import SleepyChatModel, build_fake_graph
+
+
+class StreamingChatModel(SleepyChatModel):
+    """Streams "BUY" one letter at a time."""
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for letter in "BUY":
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=letter))
+            if run_manager:
+                run_manager.on_llm_new_token(letter, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        for letter in "BUY":
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=letter))
+            if run_manager:
+                await run_manager.on_llm_new_token(letter, chunk=chunk)
+            yield chunk
+
+
+@pytest.fixture
+def streaming_graph():
+    ta = TradingAgentsGraph.__new__(TradingAgentsGraph)
+    ta.graph = build_fake_graph(StreamingChatModel(delay=0))
+    ta.propagator = Propagator()
+    return ta
+
+
+class TestToEvent:
+    def test_tokens_of_report_nodes(self):
+        event = to_event("messages", (AIMessageChunk(content="Bu"), {"langgraph_node": "Risk Judge"}))
+        assert event == {
+            "type": "token", "node": "Risk Judge", "agent": "Portfolio Manager",
+            "section": "final_trade_decision", "text": "Bu",
+        }
+
+    def test_ignores_tools_and_empty_chunks(self):
+        assert to_event("messages", (ToolMessage(content="data", tool_call_id="1"), {"langgraph_node": "tools_market"})) is None
+        assert to_event("messages", (AIMessageChunk(content=""), {"langgraph_node": "Market Analyst"})) is None
+
+    def test_status_and_state(self):
+        assert to_event("custom", {"event": "llm_start", "node": "Trader"})["status"] == "in_progress"
+        assert to_event("values", {"a": 1}) == {"type": "state", "state": {"a": 1}}
+
+
+class TestStreamEvents:
+    @staticmethod
+    def check(events):
+        tokens = [e for e in events if e["type"] == "token"]
+        sections = {e["section"] for e in tokens}
+        assert {"market_report", "news_report", "investment_plan", "final_trade_decision"} <= sections
+
+        market = [e["text"] for e in tokens if e["node"] == "Market Analyst"]
+        assert "".join(market) == "BUY" and len(market) == 3
+
+        # Every agent announces itself before its first token
+        first_status = next(i for i, e in enumerate(events) if e["type"] == "status" and e["node"] == "Trader")
+        first_token = next(i for i, e in enumerate(events) if e["type"] == "token" and e["node"] == "Trader")
+        assert first_status < first_token
+
+        assert events[-1]["type"] == "state"
+        assert events[-1]["state"]["final_trade_decision"] == "BUY"
+
+    def test_sync(self, streaming_graph):
+        self.check(list(streaming_graph.stream_events("AAPL", "2024-05-10")))
+
+    def test_async(self, streaming_graph):
+        async def collect():
+            return [event async for event in streaming_graph.astream_events("AAPL", "2024-05-10")]
+
+        self.check(asyncio.run(collect()))
@@ -0,0 +1,89 @@
+import asyncio
+import contextvars
+import json
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.prebuilt import ToolNode
+
+from tradingagents.agents.utils.agent_utils import Toolkit, as_async_tool
+from tradingagents.agents.utils.tool_memo import get_tool_memo, tool_memo_scope
+from tradingagents.dataflows import interface
+
+
+@pytest.fixture
+def fundamentals_calls(monkeypatch):
+    calls = []
+
+    def fake(ticker, curr_date):
+        calls.append((ticker, curr_date))
+        time.sleep(0.05)
+        if ticker == "BAD":
+            raise RuntimeError("quota")
+        return f"fundamentals of {ticker}"
+
+    async def afake(ticker, curr_date):
+        return fake(ticker, curr_date)
+
+    monkeypatch.setattr(interface, "get_fundamentals_openai", fake)
+    monkeypatch.setattr(interface, "aget_fundamentals_openai", afake)
+    return calls
+
+
+class TestToolMemo:
+    def test_no_memo_outside_a_run(self, fundamentals_calls):
+        Toolkit.get_fundamentals("AAPL", "2024-05-10")
+        Toolkit.get_fundamentals("AAPL", "2024-05-10")
+        assert get_tool_memo() is None and len(fundamentals_calls) == 2
+
+    def test_canonical_args_and_async_variant_share_results(self, fundamentals_calls):
+        with tool_memo_scope() as memo:
+            assert Toolkit.get_fundamentals("AAPL", "2024-05-10") == "fundamentals of AAPL"
+            Toolkit.get_fundamentals(curr_date="2024-05-10", ticker="AAPL")
+            asyncio.run(Toolkit.aget_fundamentals("AAPL", "2024-05-10"))
+            Toolkit.get_fundamentals("MSFT", "2024-05-10")
+            stats = memo.stats()
+
+        assert fundamentals_calls == [("AAPL", "2024-05-10"), ("MSFT", "2024-05-10")]
+        assert stats["get_fundamentals"] == {"calls": 4, "hits": 2}
+        # Cleared at the end of the run
+        Toolkit.get_fundamentals("AAPL", "2024-05-10")
+        assert len(fundamentals_calls) == 3
+
+    def test_concurrent_calls_coalesce_and_errors_are_not_memoized(self, fundamentals_calls):
+        with tool_memo_scope():
+            tool_node = ToolNode([as_async_tool(Toolkit.get_fundamentals, Toolkit.aget_fundamentals)])
+            message = AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": "get_fundamentals", "args": {"ticker": "AAPL", "curr_date": "2024-05-10"}, "id": str(i)}
+                    for i in range(4)
+                ],
+            )
+            results = tool_node.invoke({"messages": [message]})["messages"]
+            threads = [
+                threading.Thread(target=contextvars.copy_context().run, args=(Toolkit.get_fundamentals, "AAPL", "2024-05-10"))
+                for _ in range(4)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            for _ in range(2):
+                with pytest.raises(RuntimeError):
+                    Toolkit.get_fundamentals("BAD", "2024-05-10")
+
+        assert [r.content for r in results] == ["fundamentals of AAPL"] * 4
+        assert fundamentals_calls.count(("AAPL", "2024-05-10")) == 1
+        assert fundamentals_calls.count(("BAD", "2024-05-10")) == 2
+
+    def test_propagate_logs_tool_hits(self, fake_trading_graph, tmp_path):
+        fake_trading_graph.propagate("AAPL", "2024-05-10")
+
+        log = json.loads((tmp_path / "eval_results" / "AAPL" / "TradingAgentsStrategy_logs" / "full_states_log.json").read_text())
+        info = log["2024-05-10"]["tool_calls"]["get_stock_individual_info"]
+        # Market and news analysts both look up the company name
+        assert info["calls"] >= 2 and info["hits"] == info["calls"] - 1
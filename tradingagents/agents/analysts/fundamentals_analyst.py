@@ -4,9 +4,11 @@ import json
 from langchain_core.tools import tool
 from ..utils.tool_validation import ToolCallValidator, enhance_system_message_with_validation
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+
 
 def create_fundamentals_analyst(llm, toolkit):
-    def fundamentals_analyst_node(state):
+    def fundamentals_analyst_prompt(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state.get("company_name", ticker)
@@ -91,8 +93,9 @@ def create_fundamentals_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        return chain, state["messages"]
 
+    def fundamentals_analyst_node(state, result):
         # 创建工具调用验证器
         validator = ToolCallValidator()
 
@@ -112,4 +115,4 @@ def create_fundamentals_analyst(llm, toolkit):
             "messages": [result],
             "fundamentals_report": report,
         }
-    return fundamentals_analyst_node
+    return create_llm_node(fundamentals_analyst_prompt, fundamentals_analyst_node)
@@ -3,9 +3,11 @@ import time
 import json
 from langchain_core.tools import tool
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+
 
 def create_market_analyst(llm, toolkit):
-    def market_analyst_node(state):
+    def market_analyst_prompt(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state.get("company_name", ticker)
@@ -75,8 +77,9 @@ def create_market_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        return chain, state["messages"]
 
+    def market_analyst_node(state, result):
         report = ""
 
         if len(getattr(result, "tool_calls", [])) == 0:
@@ -86,4 +89,4 @@ def create_market_analyst(llm, toolkit):
             "messages": [result],
             "market_report": report,
         }
-    return market_analyst_node
+    return create_llm_node(market_analyst_prompt, market_analyst_node)
@@ -3,9 +3,11 @@ import time
 import json
 from langchain_core.tools import tool
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+
 
 def create_news_analyst(llm, toolkit):
-    def news_analyst_node(state):
+    def news_analyst_prompt(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state.get("company_name", ticker)
@@ -79,8 +81,9 @@ def create_news_analyst(llm, toolkit):
         prompt = prompt.partial(company_name=company_name)
 
         chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
+        return chain, state["messages"]
 
+    def news_analyst_node(state, result):
         report = ""
 
         if len(getattr(result, "tool_calls", [])) == 0:
@@ -90,4 +93,4 @@ def create_news_analyst(llm, toolkit):
             "messages": [result],
             "news_report": report,
         }
-    return news_analyst_node
+    return create_llm_node(news_analyst_prompt, news_analyst_node)
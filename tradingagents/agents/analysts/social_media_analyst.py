@@ -3,9 +3,11 @@ import time
 import json
 from langchain_core.tools import tool, BaseTool
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+
 
 def create_social_media_analyst(llm, toolkit):
-    def social_media_analyst_node(state):
+    def social_media_analyst_prompt(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state.get("company_name", ticker)
@@ -73,8 +75,9 @@ def create_social_media_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        return chain, state["messages"]
 
+    def social_media_analyst_node(state, result):
         report = ""
 
         if len(getattr(result, "tool_calls", [])) == 0:
@@ -84,4 +87,4 @@ def create_social_media_analyst(llm, toolkit):
             "messages": [result],
             "sentiment_report": report,
         }
-    return social_media_analyst_node
+    return create_llm_node(social_media_analyst_prompt, social_media_analyst_node)
@@ -1,10 +1,16 @@
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+from tradingagents.dataflows.llm_scheduler import HIGH
+from tradingagents.agents.utils.debate_context import DebateContext
 
-def create_research_manager(llm, memory):
-    def research_manager_node(state) -> dict:
-        history = state["investment_debate_state"].get("history", "")
+
+def create_research_manager(llm, memory, debate_context=None):
+    debate_context = debate_context or DebateContext(llm)
+
+    def research_manager_prompt(state):
+        history = debate_context.history(state["investment_debate_state"])
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
         news_report = state["news_report"]
@@ -38,7 +44,10 @@ def create_research_manager(llm, memory):
 以下是辩论内容：
 辩论历史：
 {history}"""
-        response = llm.invoke(prompt)
+        return llm, prompt
+
+    def research_manager_node(state, response) -> dict:
+        investment_debate_state = state["investment_debate_state"]
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -46,6 +55,7 @@ def create_research_manager(llm, memory):
             "bear_history": investment_debate_state.get("bear_history", ""),
             "bull_history": investment_debate_state.get("bull_history", ""),
             "current_response": response.content,
+            **DebateContext.carry(investment_debate_state),
             "count": investment_debate_state["count"],
         }
 
@@ -54,4 +64,5 @@ def create_research_manager(llm, memory):
             "investment_plan": response.content,
         }
 
-    return research_manager_node
+    # The judge's call goes ahead of queued debate turns under rate limits
+    return create_llm_node(research_manager_prompt, research_manager_node, priority=HIGH)
@@ -1,13 +1,19 @@
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+from tradingagents.dataflows.llm_scheduler import HIGH
+from tradingagents.agents.utils.debate_context import DebateContext
 
-def create_risk_manager(llm, memory):
-    def risk_manager_node(state) -> dict:
+
+def create_risk_manager(llm, memory, debate_context=None):
+    debate_context = debate_context or DebateContext(llm)
+
+    def risk_manager_prompt(state):
 
         company_name = state["company_of_interest"]
 
-        history = state["risk_debate_state"]["history"]
+        history = debate_context.history(state["risk_debate_state"])
         risk_debate_state = state["risk_debate_state"]
         market_research_report = state["market_report"]
         news_report = state["news_report"]
@@ -45,7 +51,10 @@ def create_risk_manager(llm, memory):
 
 Focus on actionable insights and continuous improvement. Build on past lessons, critically evaluate all perspectives, and ensure each decision advances better outcomes."""
 
-        response = llm.invoke(prompt)
+        return llm, prompt
+
+    def risk_manager_node(state, response) -> dict:
+        risk_debate_state = state["risk_debate_state"]
 
         new_risk_debate_state = {
             "judge_decision": response.content,
@@ -57,6 +66,7 @@ Focus on actionable insights and continuous improvement. Build on past lessons,
             "current_risky_response": risk_debate_state["current_risky_response"],
             "current_safe_response": risk_debate_state["current_safe_response"],
             "current_neutral_response": risk_debate_state["current_neutral_response"],
+            **DebateContext.carry(risk_debate_state),
             "count": risk_debate_state["count"],
         }
 
@@ -65,4 +75,5 @@ Focus on actionable insights and continuous improvement. Build on past lessons,
             "final_trade_decision": response.content,
         }
 
-    return risk_manager_node
+    # The judge's call goes ahead of queued debate turns under rate limits
+    return create_llm_node(risk_manager_prompt, risk_manager_node, priority=HIGH)
@@ -2,14 +2,20 @@ from langchain_core.messages import AIMessage
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+from tradingagents.agents.utils.debate_context import DebateContext
 
-def create_bear_researcher(llm, memory):
-    def bear_node(state) -> dict:
+
+def create_bear_researcher(llm, memory, debate_context=None):
+    debate_context = debate_context or DebateContext(llm)
+
+    def bear_prompt(state):
         investment_debate_state = state["investment_debate_state"]
-        history = investment_debate_state.get("history", "")
+        # The latest arguments are quoted below, not repeated in the history
+        history = debate_context.history(investment_debate_state, exclude=("Bull Analyst",))
         bear_history = investment_debate_state.get("bear_history", "")
 
-        current_response = investment_debate_state.get("current_response", "")
+        current_response = debate_context.latest(investment_debate_state.get("current_response", ""))
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
         news_report = state["news_report"]
@@ -22,6 +28,12 @@ def create_bear_researcher(llm, memory):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        market_research_report, sentiment_report, news_report, fundamentals_report = debate_context.reports(
+            [market_research_report, sentiment_report, news_report, fundamentals_report],
+            history,
+            current_response,
+        )
+
         prompt = f"""你是一名看空分析师，负责论证不投资该股票的理由。你的目标是提出合理的论证，强调风险、挑战和负面指标。利用提供的研究和数据来突出潜在的不利因素并有效反驳看多论点。
 
 **重要要求：你的所有分析和论证必须完全使用简体中文。**
@@ -46,7 +58,12 @@ def create_bear_researcher(llm, memory):
 使用这些信息提出令人信服的看空论点，反驳看多声明，并参与动态辩论以展示投资该股票的风险和弱点。你还必须处理反思并从过去的经验教训和错误中学习。
 """
 
-        response = llm.invoke(prompt)
+        return llm, prompt
+
+    def bear_node(state, response) -> dict:
+        investment_debate_state = state["investment_debate_state"]
+        history = investment_debate_state.get("history", "")
+        bear_history = investment_debate_state.get("bear_history", "")
 
         argument = f"Bear Analyst: {response.content}"
 
@@ -55,9 +72,10 @@ def create_bear_researcher(llm, memory):
             "bear_history": bear_history + "\n" + argument,
             "bull_history": investment_debate_state.get("bull_history", ""),
             "current_response": argument,
+            **debate_context.record(investment_debate_state, "Bear Analyst", response.content),
             "count": investment_debate_state["count"] + 1,
         }
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bear_node
+    return create_llm_node(bear_prompt, bear_node)
@@ -2,14 +2,20 @@ from langchain_core.messages import AIMessage
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+from tradingagents.agents.utils.debate_context import DebateContext
 
-def create_bull_researcher(llm, memory):
-    def bull_node(state) -> dict:
+
+def create_bull_researcher(llm, memory, debate_context=None):
+    debate_context = debate_context or DebateContext(llm)
+
+    def bull_prompt(state):
         investment_debate_state = state["investment_debate_state"]
-        history = investment_debate_state.get("history", "")
+        # The latest arguments are quoted below, not repeated in the history
+        history = debate_context.history(investment_debate_state, exclude=("Bear Analyst",))
         bull_history = investment_debate_state.get("bull_history", "")
 
-        current_response = investment_debate_state.get("current_response", "")
+        current_response = debate_context.latest(investment_debate_state.get("current_response", ""))
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
         news_report = state["news_report"]
@@ -22,6 +28,12 @@ def create_bull_researcher(llm, memory):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        market_research_report, sentiment_report, news_report, fundamentals_report = debate_context.reports(
+            [market_research_report, sentiment_report, news_report, fundamentals_report],
+            history,
+            current_response,
+        )
+
         prompt = f"""你是一名看多分析师，负责为投资该股票建立强有力的论证。你的任务是构建基于证据的强有力案例，强调增长潜力、竞争优势和积极的市场指标。利用提供的研究和数据来解决担忧并有效反驳看空论点。
 
 **重要要求：你的所有分析和论证必须完全使用简体中文。**
@@ -44,7 +56,12 @@ def create_bull_researcher(llm, memory):
 使用这些信息提出令人信服的看多论点，反驳看空担忧，并参与动态辩论以展示看多立场的优势。你还必须处理反思并从过去的经验教训和错误中学习。
 """
 
-        response = llm.invoke(prompt)
+        return llm, prompt
+
+    def bull_node(state, response) -> dict:
+        investment_debate_state = state["investment_debate_state"]
+        history = investment_debate_state.get("history", "")
+        bull_history = investment_debate_state.get("bull_history", "")
 
         argument = f"Bull Analyst: {response.content}"
 
@@ -53,9 +70,10 @@ def create_bull_researcher(llm, memory):
             "bull_history": bull_history + "\n" + argument,
             "bear_history": investment_debate_state.get("bear_history", ""),
             "current_response": argument,
+            **debate_context.record(investment_debate_state, "Bull Analyst", response.content),
             "count": investment_debate_state["count"] + 1,
         }
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bull_node
+    return create_llm_node(bull_prompt, bull_node)
@@ -1,15 +1,21 @@
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+from tradingagents.agents.utils.debate_context import DebateContext
 
-def create_risky_debator(llm):
-    def risky_node(state) -> dict:
+
+def create_risky_debator(llm, debate_context=None):
+    debate_context = debate_context or DebateContext(llm)
+
+    def risky_prompt(state):
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
+        # The latest arguments are quoted below, not repeated in the history
+        history = debate_context.history(risk_debate_state, exclude=("Safe Analyst", "Neutral Analyst"))
         risky_history = risk_debate_state.get("risky_history", "")
 
-        current_safe_response = risk_debate_state.get("current_safe_response", "")
-        current_neutral_response = risk_debate_state.get("current_neutral_response", "")
+        current_safe_response = debate_context.latest(risk_debate_state.get("current_safe_response", ""))
+        current_neutral_response = debate_context.latest(risk_debate_state.get("current_neutral_response", ""))
 
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
@@ -18,6 +24,14 @@ def create_risky_debator(llm):
 
         trader_decision = state["trader_investment_plan"]
 
+        market_research_report, sentiment_report, news_report, fundamentals_report = debate_context.reports(
+            [market_research_report, sentiment_report, news_report, fundamentals_report],
+            history,
+            trader_decision,
+            current_safe_response,
+            current_neutral_response,
+        )
+
         prompt = f"""作为激进风险分析师，你的职责是积极倡导高回报、高风险的机会，强调大胆的策略和竞争优势。在评估交易员的决定或计划时，专注于潜在的上升空间、增长潜力和创新收益——即使这些伴随着较高的风险。利用提供的市场数据和情绪分析来加强你的论点并挑战对立观点。具体来说，直接回应保守和中性分析师提出的每一点，用数据驱动的反驳和有说服力的推理进行反击。突出他们的谨慎可能错过的关键机会或他们的假设可能过于保守的地方。
 
 **重要要求：你的所有分析和论证必须完全使用简体中文。**
@@ -36,7 +50,12 @@ def create_risky_debator(llm):
 
 通过解决提出的任何具体担忧，反驳他们逻辑中的弱点，并断言承担风险的好处以超越市场常规，积极参与。专注于辩论和说服，而不仅仅是呈现数据。挑战每个反驳点以强调为什么高风险方法是最优的。以对话方式输出，就像你在说话一样，不使用任何特殊格式。"""
 
-        response = llm.invoke(prompt)
+        return llm, prompt
+
+    def risky_node(state, response) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        risky_history = risk_debate_state.get("risky_history", "")
 
         argument = f"Risky Analyst: {response.content}"
 
@@ -51,9 +70,10 @@ def create_risky_debator(llm):
             "current_neutral_response": risk_debate_state.get(
                 "current_neutral_response", ""
             ),
+            **debate_context.record(risk_debate_state, "Risky Analyst", response.content),
             "count": risk_debate_state["count"] + 1,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return risky_node
+    return create_llm_node(risky_prompt, risky_node)
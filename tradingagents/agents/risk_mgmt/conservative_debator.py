@@ -2,15 +2,21 @@ from langchain_core.messages import AIMessage
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+from tradingagents.agents.utils.debate_context import DebateContext
 
-def create_safe_debator(llm):
-    def safe_node(state) -> dict:
+
+def create_safe_debator(llm, debate_context=None):
+    debate_context = debate_context or DebateContext(llm)
+
+    def safe_prompt(state):
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
+        # The latest arguments are quoted below, not repeated in the history
+        history = debate_context.history(risk_debate_state, exclude=("Risky Analyst", "Neutral Analyst"))
         safe_history = risk_debate_state.get("safe_history", "")
 
-        current_risky_response = risk_debate_state.get("current_risky_response", "")
-        current_neutral_response = risk_debate_state.get("current_neutral_response", "")
+        current_risky_response = debate_context.latest(risk_debate_state.get("current_risky_response", ""))
+        current_neutral_response = debate_context.latest(risk_debate_state.get("current_neutral_response", ""))
 
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
@@ -19,6 +25,14 @@ def create_safe_debator(llm):
 
         trader_decision = state["trader_investment_plan"]
 
+        market_research_report, sentiment_report, news_report, fundamentals_report = debate_context.reports(
+            [market_research_report, sentiment_report, news_report, fundamentals_report],
+            history,
+            trader_decision,
+            current_risky_response,
+            current_neutral_response,
+        )
+
         prompt = f"""作为安全/保守风险分析师，你的主要目标是保护资产、最小化波动性并确保稳定、可靠的增长。你优先考虑稳定性、安全性和风险缓解，仔细评估潜在损失、经济衰退和市场波动。在评估交易员的决定或计划时，批判性地审查高风险要素，指出决定可能使公司面临不当风险的地方，以及更谨慎的替代方案如何能够确保长期收益。
 
 **重要要求：你的所有分析和论证必须完全使用简体中文。**
@@ -37,7 +51,12 @@ def create_safe_debator(llm):
 
 通过质疑他们的乐观情绪并强调他们可能忽视的潜在不利因素来参与。解决他们的每个反驳点，展示为什么保守立场最终是公司资产最安全的道路。专注于辩论和批评他们的论点，以证明低风险策略相对于他们方法的优势。以对话方式输出，就像你在说话一样，不使用任何特殊格式。"""
 
-        response = llm.invoke(prompt)
+        return llm, prompt
+
+    def safe_node(state, response) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        safe_history = risk_debate_state.get("safe_history", "")
 
         argument = f"Safe Analyst: {response.content}"
 
@@ -54,9 +73,10 @@ def create_safe_debator(llm):
             "current_neutral_response": risk_debate_state.get(
                 "current_neutral_response", ""
             ),
+            **debate_context.record(risk_debate_state, "Safe Analyst", response.content),
             "count": risk_debate_state["count"] + 1,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return safe_node
+    return create_llm_node(safe_prompt, safe_node)
@@ -1,15 +1,21 @@
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+from tradingagents.agents.utils.debate_context import DebateContext
 
-def create_neutral_debator(llm):
-    def neutral_node(state) -> dict:
+
+def create_neutral_debator(llm, debate_context=None):
+    debate_context = debate_context or DebateContext(llm)
+
+    def neutral_prompt(state):
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
+        # The latest arguments are quoted below, not repeated in the history
+        history = debate_context.history(risk_debate_state, exclude=("Risky Analyst", "Safe Analyst"))
         neutral_history = risk_debate_state.get("neutral_history", "")
 
-        current_risky_response = risk_debate_state.get("current_risky_response", "")
-        current_safe_response = risk_debate_state.get("current_safe_response", "")
+        current_risky_response = debate_context.latest(risk_debate_state.get("current_risky_response", ""))
+        current_safe_response = debate_context.latest(risk_debate_state.get("current_safe_response", ""))
 
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
@@ -18,6 +24,14 @@ def create_neutral_debator(llm):
 
         trader_decision = state["trader_investment_plan"]
 
+        market_research_report, sentiment_report, news_report, fundamentals_report = debate_context.reports(
+            [market_research_report, sentiment_report, news_report, fundamentals_report],
+            history,
+            trader_decision,
+            current_risky_response,
+            current_safe_response,
+        )
+
         prompt = f"""作为中性风险分析师，你的职责是提供平衡的观点，权衡交易员决定或计划的潜在收益和风险。你优先考虑全面的方法，评估上升和下降空间，同时考虑更广泛的市场趋势、潜在的经济变化和多元化策略。
 
 **重要要求：你的所有分析和论证必须完全使用简体中文。**
@@ -36,7 +50,12 @@ def create_neutral_debator(llm):
 
 通过批判性地分析双方，解决激进和保守论点中的弱点来倡导更平衡的方法，积极参与。挑战他们的每个观点，说明为什么适度风险策略可能提供两全其美的效果，提供增长潜力同时防范极端波动。专注于辩论而不是简单地呈现数据，旨在表明平衡的观点可以带来最可靠的结果。以对话方式输出，就像你在说话一样，不使用任何特殊格式。"""
 
-        response = llm.invoke(prompt)
+        return llm, prompt
+
+    def neutral_node(state, response) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        neutral_history = risk_debate_state.get("neutral_history", "")
 
         argument = f"Neutral Analyst: {response.content}"
 
@@ -51,9 +70,10 @@ def create_neutral_debator(llm):
             ),
             "current_safe_response": risk_debate_state.get("current_safe_response", ""),
             "current_neutral_response": argument,
+            **debate_context.record(risk_debate_state, "Neutral Analyst", response.content),
             "count": risk_debate_state["count"] + 1,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return neutral_node
+    return create_llm_node(neutral_prompt, neutral_node)
@@ -2,9 +2,11 @@ import functools
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+
 
 def create_trader(llm, memory):
-    def trader_node(state, name):
+    def trader_prompt(state):
         company_name = state["company_of_interest"]
         investment_plan = state["investment_plan"]
         market_research_report = state["market_report"]
@@ -32,12 +34,13 @@ def create_trader(llm, memory):
             context,
         ]
 
-        result = llm.invoke(messages)
+        return llm, messages
 
+    def trader_node(state, result, name):
         return {
             "messages": [result],
             "trader_investment_plan": result.content,
             "sender": name,
         }
 
-    return functools.partial(trader_node, name="Trader")
+    return create_llm_node(trader_prompt, functools.partial(trader_node, name="Trader"))
@@ -5,6 +5,7 @@ from langchain_openai import ChatOpenAI
 from tradingagents.agents import *
 from langgraph.prebuilt import ToolNode
 from langgraph.graph import END, StateGraph, START, MessagesState
+from langgraph.graph.message import AnyMessage, add_messages
 
 
 # Researcher team state
@@ -19,6 +20,9 @@ class InvestDebateState(TypedDict):
     current_response: Annotated[str, "Latest response"]  # Last response
     judge_decision: Annotated[str, "Final judge decision"]  # Last response
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    turns: Annotated[list, "Structured turns, {speaker, content} dicts"]
+    summary: Annotated[str, "Rolling summary of the turns older than the recent ones"]
+    summarized_turns: Annotated[int, "Number of turns folded into the summary"]
 
 
 # Risk management team state
@@ -45,6 +49,9 @@ class RiskDebateState(TypedDict):
     ]  # Last response
     judge_decision: Annotated[str, "Judge's decision"]
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    turns: Annotated[list, "Structured turns, {speaker, content} dicts"]
+    summary: Annotated[str, "Rolling summary of the turns older than the recent ones"]
+    summarized_turns: Annotated[int, "Number of turns folded into the summary"]
 
 
 class AgentState(MessagesState):
@@ -62,6 +69,12 @@ class AgentState(MessagesState):
     ]
     fundamentals_report: Annotated[str, "Report from the Fundamentals Researcher"]
 
+    # per-analyst conversations, used when the analysts run in parallel
+    market_messages: Annotated[list[AnyMessage], add_messages]
+    social_messages: Annotated[list[AnyMessage], add_messages]
+    news_messages: Annotated[list[AnyMessage], add_messages]
+    fundamentals_messages: Annotated[list[AnyMessage], add_messages]
+
     # researcher team discussion step
     investment_debate_state: Annotated[
         InvestDebateState, "Current state of the debate on if to invest or not"
@@ -3,7 +3,9 @@ from typing import List
 from typing import Annotated
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import RemoveMessage
-from langchain_core.tools import tool
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import BaseTool, StructuredTool, tool
+from langgraph.constants import CONFIG_KEY_STREAM_WRITER
 from datetime import date, timedelta, datetime
 import functools
 import pandas as pd
@@ -14,14 +16,17 @@ import tradingagents.dataflows.interface as interface
 from tradingagents.dataflows import akshare_utils
 from tradingagents.utils import formatters
 from tradingagents.dataflows.data_source_manager import DataSourceManager
+from tradingagents.dataflows.blocking import run_blocking
+from tradingagents.dataflows.llm_scheduler import NORMAL, llm_priority
+from tradingagents.agents.utils.tool_memo import memoize_tool
 from tradingagents.default_config import DEFAULT_CONFIG
 from langchain_core.messages import HumanMessage
 
 
-def create_msg_delete():
+def create_msg_delete(messages_key="messages"):
     def delete_messages(state):
         """Clear messages and add placeholder for Anthropic compatibility"""
-        messages = state["messages"]
+        messages = state.get(messages_key) or []
         
         # Remove all messages
         removal_operations = [RemoveMessage(id=m.id) for m in messages]
@@ -29,11 +34,70 @@ def create_msg_delete():
         # Add a minimal placeholder message
         placeholder = HumanMessage(content="Continue")
         
-        return {"messages": removal_operations + [placeholder]}
+        return {messages_key: removal_operations + [placeholder]}
     
     return delete_messages
 
 
+def write_stream_event(config, event):
+    """Send *event* to the ``custom`` stream of the running graph, if any."""
+    configurable = (config or {}).get("configurable") or {}
+    writer = configurable.get(CONFIG_KEY_STREAM_WRITER)
+    if writer is not None:
+        writer({**event, "node": (config.get("metadata") or {}).get("langgraph_node")})
+
+
+def create_llm_node(prepare, finish, priority=NORMAL):
+    """Build a graph node around one LLM call that runs under both invoke and ainvoke.
+
+    Args:
+        prepare: ``prepare(state) -> (runnable, input)``; may block (memory
+            lookups, data fetches) and runs on the blocking pool when async.
+        finish: ``finish(state, response) -> dict`` state update.
+        priority: Scheduling priority of the LLM request under rate limits.
+    """
+
+    def node(state, config):
+        runnable, inputs = prepare(state)
+        write_stream_event(config, {"event": "llm_start"})
+        with llm_priority(priority):
+            response = runnable.invoke(inputs, config)
+        return finish(state, response)
+
+    async def anode(state, config):
+        runnable, inputs = await run_blocking(prepare, state)
+        write_stream_event(config, {"event": "llm_start"})
+        with llm_priority(priority):
+            response = await runnable.ainvoke(inputs, config)
+        return finish(state, response)
+
+    return RunnableLambda(node, afunc=anode)
+
+
+def as_async_tool(fn, coroutine=None):
+    """Turn a Toolkit tool into a tool that also supports ``ainvoke``.
+
+    ``coroutine`` is a native async implementation; without one the
+    synchronous tool runs on the bounded blocking pool.
+    """
+    if isinstance(fn, BaseTool):
+        func, name, description, args_schema = fn.func, fn.name, fn.description, fn.args_schema
+    else:
+        func, name, description, args_schema = fn, fn.__name__, None, None
+
+    if coroutine is None:
+        async def coroutine(*args, **kwargs):
+            return await run_blocking(func, *args, **kwargs)
+
+    return StructuredTool.from_function(
+        func=func,
+        coroutine=coroutine,
+        name=name,
+        description=description,
+        args_schema=args_schema,
+    )
+
+
 class Toolkit:
     _config = DEFAULT_CONFIG.copy()
 
@@ -323,6 +387,14 @@ class Toolkit:
         from tradingagents.dataflows.interface import get_stock_news_openai as _get_stock_news_openai
         return _get_stock_news_openai(ticker, curr_date)
 
+    @staticmethod
+    async def aget_stock_news_openai(ticker: str, curr_date: str) -> str:
+        """
+        Async version of get_stock_news_openai.
+        """
+        from tradingagents.dataflows.interface import aget_stock_news_openai as _aget_stock_news_openai
+        return await _aget_stock_news_openai(ticker, curr_date)
+
     @staticmethod
     def get_reddit_stock_info(ticker: str, curr_date: str, look_back_days: int = 7, max_limit_per_day: int = 10) -> str:
         """
@@ -340,6 +412,14 @@ class Toolkit:
         from tradingagents.dataflows.interface import get_global_news_openai as _get_global_news_openai
         return _get_global_news_openai(curr_date)
 
+    @staticmethod
+    async def aget_global_news_openai(curr_date: str) -> str:
+        """
+        Async version of get_global_news_openai.
+        """
+        from tradingagents.dataflows.interface import aget_global_news_openai as _aget_global_news_openai
+        return await _aget_global_news_openai(curr_date)
+
     @staticmethod
     def get_google_news(query: str, curr_date: str, look_back_days: int = 7) -> str:
         """
@@ -373,6 +453,14 @@ class Toolkit:
         from tradingagents.dataflows.interface import get_fundamentals_openai as _get_fundamentals_openai
         return _get_fundamentals_openai(ticker, curr_date)
 
+    @staticmethod
+    async def aget_fundamentals_openai(ticker: str, curr_date: str) -> str:
+        """
+        Async version of get_fundamentals_openai.
+        """
+        from tradingagents.dataflows.interface import aget_fundamentals_openai as _aget_fundamentals_openai
+        return await _aget_fundamentals_openai(ticker, curr_date)
+
     @staticmethod
     def get_fundamentals(ticker: str, curr_date: str) -> str:
         """
@@ -380,6 +468,13 @@ class Toolkit:
         """
         return Toolkit.get_fundamentals_openai(ticker, curr_date)
 
+    @staticmethod
+    async def aget_fundamentals(ticker: str, curr_date: str) -> str:
+        """
+        Async version of get_fundamentals.
+        """
+        return await Toolkit.aget_fundamentals_openai(ticker, curr_date)
+
     @staticmethod
     def get_finnhub_company_insider_sentiment(ticker: str, curr_date: str, look_back_days: int = 30) -> str:
         """
@@ -450,3 +545,23 @@ class Toolkit:
             except Exception as e:
                 return f"获取A股公告出错: {e}"
         return "Only US stocks notice/announcement supported or not implemented."
+
+
+def _memoize_toolkit_tools(cls):
+    """Route every Toolkit data tool through the run-scoped tool memo.
+
+    ``aget_x`` shares its results with ``get_x``.
+    """
+    for attr, value in list(vars(cls).items()):
+        if not isinstance(value, staticmethod):
+            continue
+        fn = value.__func__
+        if isinstance(fn, BaseTool):
+            fn.func = memoize_tool(fn.func, fn.name)
+        elif attr.startswith("get_"):
+            setattr(cls, attr, staticmethod(memoize_tool(fn, attr)))
+        elif attr.startswith("aget_"):
+            setattr(cls, attr, staticmethod(memoize_tool(fn, attr[1:])))
+
+
+_memoize_toolkit_tools(Toolkit)
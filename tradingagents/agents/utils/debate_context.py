@@ -0,0 +1,223 @@
+"""
+Bounded prompt context for the investment and risk debates.
+
+The debaters used to re-embed the whole ``history`` string and all four
+analyst reports on every turn, so prompt tokens grew quadratically with the
+number of rounds.  :class:`DebateContext` keeps the turns as a structured
+list in the debate state (``turns``) and folds every turn older than the last
+``recent_turns`` into a rolling ``summary`` written by the quick model, one
+new batch of turns at a time.  Prompts get the summary, the recent turns
+verbatim and the reports, trimmed together to ``token_budget`` tokens.
+
+The ``history``/``*_history`` strings are still maintained for the judges'
+logs, the reflector and the UIs.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_CJK = re.compile(r"[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]")
+
+TRUNCATED = "\n…（已截断）"
+
+SUMMARY_PROMPT = """你负责为一场投资辩论维护一份滚动摘要。请把下面的新发言合并进已有摘要，保留每位发言者的核心论点、关键数据和尚未解决的分歧，删除重复内容。只输出更新后的摘要，使用简体中文，不超过{max_words}字。
+
+已有摘要：
+{summary}
+
+新发言：
+{turns}"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: one per CJK character, one per four other characters."""
+    if not text:
+        return 0
+    cjk = len(_CJK.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the head of *text* that fits in *max_tokens*."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + TRUNCATED
+
+
+def _format_turns(turns: List[Dict[str, str]]) -> str:
+    return "\n".join(f"{turn['speaker']}: {turn['content']}" for turn in turns)
+
+
+class DebateContext:
+    """Builds the debate part of debater and judge prompts within a token budget."""
+
+    def __init__(
+        self,
+        llm,
+        token_budget: int = 16000,
+        recent_turns: int = 3,
+        summary_tokens: int = 800,
+        cache_size: int = 256,
+    ):
+        """Initialize the context manager.
+
+        Args:
+            llm: Model writing the rolling summary (the quick thinking model).
+            token_budget: Estimated tokens allowed for the reports plus the debate
+                in one prompt; the history gets at most half of it and each
+                latest argument at most a quarter.
+            recent_turns: Turns kept verbatim; older turns are summarized.
+            summary_tokens: Target length of the rolling summary.
+            cache_size: Summaries kept in memory, so the node that prepares a
+                prompt and the one that records the turn share one LLM call.
+        """
+        self.llm = llm
+        self.token_budget = int(token_budget)
+        self.recent_turns = max(1, int(recent_turns))
+        self.summary_tokens = int(summary_tokens)
+        self.cache_size = cache_size
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, llm, config: Dict[str, Any]) -> "DebateContext":
+        return cls(
+            llm,
+            token_budget=config.get("debate_token_budget", 16000),
+            recent_turns=config.get("debate_recent_turns", 3),
+            summary_tokens=config.get("debate_summary_tokens", 800),
+        )
+
+    # ------------------------------------------------------------------
+    # Rolling summary
+    # ------------------------------------------------------------------
+    def _fold(self, summary: str, turns: List[Dict[str, str]]) -> str:
+        """Merge *turns* into *summary* with one LLM call (memoized)."""
+        new_turns = _format_turns(turns)
+        key = hashlib.sha256(f"{summary}\x00{new_turns}".encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._summaries:
+                self._summaries.move_to_end(key)
+                return self._summaries[key]
+
+        prompt = SUMMARY_PROMPT.format(
+            max_words=self.summary_tokens, summary=summary or "（无）", turns=new_turns
+        )
+        try:
+            # Kept out of the token stream, which carries the debaters' own words
+            folded = self.llm.invoke(prompt, config={"tags": ["nostream"]}).content
+        except Exception as e:
+            # Without a model answer, fall back to the previous summary plus the turns
+            logger.warning(f"Debate summary failed, keeping turns verbatim: {e}")
+            folded = f"{summary}\n{new_turns}".strip()
+        folded = truncate_to_tokens(folded, self.summary_tokens * 2)
+
+        with self._lock:
+            self._summaries[key] = folded
+            while len(self._summaries) > self.cache_size:
+                self._summaries.popitem(last=False)
+        return folded
+
+    def summarized(self, debate_state: Dict[str, Any]) -> Tuple[str, int]:
+        """``(summary, summarized_turns)`` with all but the recent turns folded in."""
+        turns = debate_state.get("turns") or []
+        summary = debate_state.get("summary", "")
+        done = debate_state.get("summarized_turns", 0)
+        keep_from = max(done, len(turns) - self.recent_turns)
+        if keep_from > done:
+            summary = self._fold(summary, turns[done:keep_from])
+        return summary, keep_from
+
+    def record(self, debate_state: Dict[str, Any], speaker: str, content: str) -> Dict[str, Any]:
+        """State fields after *speaker* said *content*: the turn list and the summary."""
+        summary, done = self.summarized(debate_state)
+        return {
+            "turns": list(debate_state.get("turns") or []) + [{"speaker": speaker, "content": content}],
+            "summary": summary,
+            "summarized_turns": done,
+        }
+
+    @staticmethod
+    def carry(debate_state: Dict[str, Any]) -> Dict[str, Any]:
+        """The structured fields unchanged, for nodes that do not add a turn."""
+        return {
+            "turns": list(debate_state.get("turns") or []),
+            "summary": debate_state.get("summary", ""),
+            "summarized_turns": debate_state.get("summarized_turns", 0),
+        }
+
+    # ------------------------------------------------------------------
+    # Prompt rendering
+    # ------------------------------------------------------------------
+    def history(
+        self,
+        debate_state: Dict[str, Any],
+        max_tokens: Optional[int] = None,
+        exclude: Tuple[str, ...] = (),
+    ) -> str:
+        """The debate so far: rolling summary plus recent turns, newest kept first.
+
+        The latest turn of every speaker in *exclude* is left out; debaters
+        quote those separately as the latest arguments to answer.
+        """
+        max_tokens = self.token_budget // 2 if max_tokens is None else max_tokens
+        turns = debate_state.get("turns")
+        if turns is None:
+            # State from before structured turns
+            return truncate_to_tokens(debate_state.get("history", ""), max_tokens)
+
+        summary, done = self.summarized(debate_state)
+        unsummarized = list(turns[done:])
+        for speaker in exclude:
+            for i in range(len(unsummarized) - 1, -1, -1):
+                if unsummarized[i]["speaker"] == speaker:
+                    del unsummarized[i]
+                    break
+
+        recent = []
+        used = 0
+        for turn in reversed(unsummarized):
+            text = f"{turn['speaker']}: {turn['content']}"
+            cost = estimate_tokens(text)
+            if used + cost > max_tokens:
+                if not recent:
+                    recent.append(truncate_to_tokens(text, max_tokens))
+                break
+            recent.append(text)
+            used += cost
+
+        parts = []
+        if summary:
+            summary_text = truncate_to_tokens(summary, max_tokens - used)
+            if summary_text:
+                parts.append(f"（早前辩论摘要）{summary_text}")
+        parts.extend(reversed(recent))
+        return "\n".join(parts)
+
+    def latest(self, text: str) -> str:
+        """A previous speaker's latest argument, capped at a quarter of the budget."""
+        return truncate_to_tokens(text or "", self.token_budget // 4)
+
+    def reports(self, reports: List[str], *debate: str) -> List[str]:
+        """Trim the reports proportionally to what the budget leaves after the *debate* texts."""
+        available = max(0, self.token_budget - sum(estimate_tokens(text) for text in debate))
+        sizes = [estimate_tokens(text or "") for text in reports]
+        total = sum(sizes)
+        if total <= available:
+            return list(reports)
+        return [truncate_to_tokens(text or "", available * size // total) for text, size in zip(reports, sizes)]
@@ -0,0 +1,143 @@
+"""
+Cache of text embeddings shared by all ``FinancialSituationMemory`` instances.
+
+In one run the bull and bear researchers, the research manager, the trader
+and the risk manager all embed the same situation text.  Embeddings are keyed
+by a content hash of ``(backend, model, text)``, so the first memory pays for
+the request and the others are answered locally.
+
+Two tiers are used:
+
+- an in-memory LRU of recent embeddings;
+- an optional on-disk tier (one pickle file per entry) shared across runs.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from ...dataflows.config import get_config
+
+logger = logging.getLogger(__name__)
+
+Embedding = List[float]
+
+
+def embedding_key(namespace: str, text: str) -> str:
+    """Content hash of *text* embedded by the model described by *namespace*."""
+    return hashlib.sha256(f"{namespace}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + optional disk) cache of embeddings."""
+
+    def __init__(self, max_entries: int = 1024, cache_dir: Optional[str] = None):
+        """
+        Args:
+            max_entries: Number of embeddings kept in the in-memory LRU.
+            cache_dir: Directory for the on-disk tier; ``None`` disables it.
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[str, Embedding]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _remember(self, key: str, embedding: Embedding) -> None:
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Embedding]:
+        """Return the cached embedding or ``None`` (counts a hit or a miss)."""
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return embedding
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                try:
+                    with open(path, "rb") as f:
+                        embedding = pickle.load(f)
+                except Exception as e:
+                    logger.warning(f"Failed to read embedding cache file {path}: {e}")
+                    embedding = None
+                if embedding is not None:
+                    with self._lock:
+                        self._remember(key, embedding)
+                        self._stats["disk_hits"] += 1
+                    return embedding
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def put(self, key: str, embedding: Embedding) -> None:
+        """Store an embedding in memory and, if enabled, on disk."""
+        embedding = list(embedding)
+        with self._lock:
+            self._remember(key, embedding)
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+            try:
+                with open(tmp, "wb") as f:
+                    pickle.dump(embedding, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+            except Exception as e:
+                logger.warning(f"Failed to write embedding cache file {path}: {e}")
+
+    def clear(self) -> None:
+        """Drop the in-memory tier and reset the counters (disk files are kept)."""
+        with self._lock:
+            self._entries.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the hit rate."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Return the process-wide :class:`EmbeddingCache` configured from ``get_config()``."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = get_config()
+            _cache = EmbeddingCache(
+                max_entries=int(config.get("embedding_cache_size", 1024)),
+                cache_dir=config.get("embedding_cache_dir"),
+            )
+        return _cache
+
+
+def reset_embedding_cache() -> None:
+    """Forget the shared cache so the next access re-reads the configuration."""
+    global _cache
+    with _cache_lock:
+        _cache = None
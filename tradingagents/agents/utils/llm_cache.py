@@ -0,0 +1,131 @@
+"""
+Disk-backed cache of chat model responses.
+
+:class:`LLMResponseCache` is a LangChain ``BaseCache`` stored in SQLite.  It
+is attached to the quick/deep thinking models of ``TradingAgentsGraph`` when
+``llm_cache_mode`` is set, so every agent, the reflector and the signal
+processor go through it.  Entries are keyed on a hash of the model
+description LangChain passes as ``llm_string`` (provider class, model name,
+sampling parameters and bound tool schemas) and the serialized message list.
+
+Modes:
+
+- ``read_through``: answer from the cache, call the model on a miss and store the answer.
+- ``record``: always call the model and store (overwrite) the answer.
+- ``replay``: only answer from the cache; a miss raises :class:`LLMCacheMiss`.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ("read_through", "record", "replay")
+
+
+class LLMCacheMiss(LookupError):
+    """Raised in replay mode when a call has no recorded response."""
+
+
+class LLMResponseCache(BaseCache):
+    """SQLite-backed LLM response cache with read-through, record and replay modes."""
+
+    def __init__(self, path: str, mode: str = "read_through"):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode} (expected one of {', '.join(CACHE_MODES)})")
+        self.path = path
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # One connection shared by the graph's threads, serialized by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, llm_string TEXT, generations TEXT, created REAL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        """Return the recorded generations, ``None`` to call the model."""
+        if self.mode == "record":
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generations FROM responses WHERE key = ?", (self._key(prompt, llm_string),)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            if self.mode == "replay":
+                raise LLMCacheMiss(f"No recorded LLM response in {self.path} for this call")
+            return None
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", LangChainBetaWarning)
+                return loads(row[0])
+        except Exception as e:
+            logger.warning(f"LLM cache: dropping unreadable entry: {e}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        """Store the generations of a model call."""
+        if self.mode == "replay":
+            return
+        value = dumps(list(return_val))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, llm_string, generations, created) VALUES (?, ?, ?, ?)",
+                (self._key(prompt, llm_string), llm_string, value, time.time()),
+            )
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """Delete every recorded response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Mode, entry count and hit/miss counters since creation."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"mode": self.mode, "path": self.path, "entries": entries, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_llm_cache(config: Dict[str, Any]) -> Optional[LLMResponseCache]:
+    """Build the cache configured by ``llm_cache_mode``/``llm_cache_path``, ``None`` when disabled."""
+    mode = (config.get("llm_cache_mode") or "").strip().lower()
+    if mode in ("", "off", "none", "false"):
+        return None
+    path = config.get("llm_cache_path") or os.path.join(
+        config.get("data_cache_dir") or ".", "llm_cache.sqlite"
+    )
+    logger.info(f"LLM cache: {mode} mode at {path}")
+    return LLMResponseCache(path, mode)
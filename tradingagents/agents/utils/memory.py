@@ -1,8 +1,10 @@
 import os
-import chromadb
-from chromadb.config import Settings
-from openai import OpenAI
+import threading
+import uuid
 from ...dataflows.config import get_config
+from ...dataflows.llm_clients import get_openai_client
+from .embedding_cache import embedding_key, get_embedding_cache
+from .memory_store import get_memory_collection
 
 
 class FinancialSituationMemory:
@@ -21,44 +23,85 @@ class FinancialSituationMemory:
         if embedding_provider == "ollama":
             self.backend_url = "http://localhost:11434/v1"
             api_key = "ollama"  # Ollama uses a dummy API key
-            self.client = OpenAI(base_url=self.backend_url, api_key=api_key)
         else:
             # Default to OpenAI API for embeddings
             self.backend_url = "https://api.openai.com/v1"
             api_key = os.getenv("OPENAI_API_KEY")
-            self.client = OpenAI(api_key=api_key)
-
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        self.situation_collection = self.chroma_client.create_collection(name=name)
+        # One pooled client per backend, shared by all memories
+        self.client = get_openai_client(base_url=self.backend_url, api_key=api_key)
+
+        # The collection is opened on first use, so startup does not load the index
+        self.name = name
+        self.memory_dir = config.get("memory_dir")
+        self.hnsw = config.get("memory_hnsw")
+        self._collection = None
+        self._collection_lock = threading.Lock()
+
+    @property
+    def situation_collection(self):
+        """The chroma collection holding this memory's situations."""
+        if self._collection is None:
+            with self._collection_lock:
+                if self._collection is None:
+                    self._collection = get_memory_collection(self.name, self.memory_dir, self.hnsw)
+        return self._collection
 
     def get_embedding(self, text):
         """Get embedding for a text (Ollama or OpenAI)"""
-        response = self.client.embeddings.create(
-            model=self.embedding, input=text
-        )
-        return response.data[0].embedding
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts):
+        """Get embeddings for several texts with at most one request.
+
+        Embeddings are served from the shared embedding cache when possible;
+        the texts it does not know are sent in one batched request.
+        """
+        cache = get_embedding_cache()
+        namespace = f"{self.backend_url}|{self.embedding}"
+        keys = [embedding_key(namespace, text) for text in texts]
+        embeddings = {key: cache.get(key) for key in set(keys)}
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if embeddings[key] is None:
+                missing.setdefault(key, text)
+        if missing:
+            response = self.client.embeddings.create(
+                model=self.embedding, input=list(missing.values())
+            )
+            for key, item in zip(missing, sorted(response.data, key=lambda d: d.index)):
+                embeddings[key] = item.embedding
+                cache.put(key, item.embedding)
+
+        return [embeddings[key] for key in keys]
+
+    def add_situations(self, situations_and_advice, embeddings=None):
+        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)
 
-    def add_situations(self, situations_and_advice):
-        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+        ``embeddings`` may hold the situations' embeddings when the caller
+        already has them.
+        """
         situations = []
         advice = []
         ids = []
-        embeddings = []
-        offset = self.situation_collection.count()
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
+        for situation, recommendation in situations_and_advice:
             situations.append(situation)
             advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+            # Unique across graph instances adding to the same shared collection
+            ids.append(uuid.uuid4().hex)
+        if not situations:
+            return
         self.situation_collection.add(
             documents=situations,
             metadatas=[{"recommendation": rec} for rec in advice],
-            embeddings=embeddings,
+            embeddings=embeddings if embeddings is not None else self.get_embeddings(situations),
             ids=ids,
         )
 
     def get_memories(self, current_situation, n_matches=1):
         """Find matching recommendations using embeddings"""
+        if self.situation_collection.count() == 0:
+            return []
         query_embedding = self.get_embedding(current_situation)
         results = self.situation_collection.query(
             query_embeddings=[query_embedding],
@@ -0,0 +1,82 @@
+"""
+Chroma clients and collections backing ``FinancialSituationMemory``.
+
+With ``memory_dir`` set, memories live in a ``chromadb.PersistentClient``
+under that directory and survive the process, so reflections from earlier
+runs are available to later ones.  Without it they live in one in-process
+client.  Either way there is one client per location, shared by every memory
+of every ``TradingAgentsGraph`` in the process, and collections are opened
+with get-or-create semantics, so building several graphs (e.g. a worker pool
+of threads) reuses the same five collections instead of colliding on their
+names.  Collections are created with the configured HNSW parameters.  Of an
+existing collection only ``ef_search`` can still change and is updated; the
+parameters fixed when the index was built are kept, with a warning when the
+configuration asks for different ones.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import chromadb
+from chromadb.config import Settings
+
+# chromadb defaults, except for an explicit distance space
+DEFAULT_HNSW = {
+    "space": "l2",
+    "ef_construction": 100,
+    "ef_search": 100,
+    "max_neighbors": 16,
+}
+
+# Fixed once the index exists
+IMMUTABLE_HNSW = ("space", "ef_construction", "max_neighbors")
+
+logger = logging.getLogger(__name__)
+
+_clients: Dict[Optional[str], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_memory_client(memory_dir: Optional[str] = None):
+    """Return the shared chroma client for *memory_dir* (``None`` = in-process)."""
+    with _clients_lock:
+        client = _clients.get(memory_dir)
+        if client is None:
+            settings = Settings(allow_reset=True, anonymized_telemetry=False)
+            if memory_dir:
+                client = chromadb.PersistentClient(path=memory_dir, settings=settings)
+            else:
+                client = chromadb.EphemeralClient(settings=settings)
+            _clients[memory_dir] = client
+        return client
+
+
+def get_memory_collection(name: str, memory_dir: Optional[str] = None, hnsw: Optional[Dict[str, Any]] = None):
+    """Open (creating if needed) the collection *name* in the store at *memory_dir*."""
+    client = get_memory_client(memory_dir)
+    wanted = {**DEFAULT_HNSW, **(hnsw or {})}
+    collection = client.get_or_create_collection(
+        name=name,
+        configuration={"hnsw": wanted},
+        # Embeddings are always computed by the memory itself
+        embedding_function=None,
+    )
+
+    # get_or_create ignores the configuration of a collection that already exists
+    stored = (collection.configuration or {}).get("hnsw") or {}
+    for key in IMMUTABLE_HNSW:
+        if key in stored and stored[key] != wanted[key]:
+            logger.warning(
+                f"Memory collection {name}: HNSW {key} is {stored[key]!r}, not the configured "
+                f"{wanted[key]!r}; it cannot change without rebuilding the collection"
+            )
+    if "ef_search" in stored and stored["ef_search"] != wanted["ef_search"]:
+        collection.modify(configuration={"hnsw": {"ef_search": wanted["ef_search"]}})
+    return collection
+
+
+def reset_memory_clients() -> None:
+    """Forget the shared clients; the next access opens new ones."""
+    with _clients_lock:
+        _clients.clear()
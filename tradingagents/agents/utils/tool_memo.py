@@ -0,0 +1,156 @@
+"""
+Run-scoped memoization of Toolkit tool calls.
+
+Within one ``propagate`` the analysts fetch the same company info on every
+node invocation and the LLMs re-issue identical tool calls.  While a
+:func:`tool_memo_scope` is active, every Toolkit tool call is answered from a
+per-run :class:`ToolMemo` keyed on the tool name and its canonicalized
+arguments; identical calls running at the same time wait for the first one
+instead of fetching again.  The memo lives in a context variable, so
+concurrent runs (``propagate_many``) each get their own and the blocking pool
+and LangGraph's worker threads see the memo of the run they work for.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_current_memo: contextvars.ContextVar[Optional["ToolMemo"]] = contextvars.ContextVar(
+    "tool_memo", default=None
+)
+
+
+class ToolMemo:
+    """Results of the tool calls made during one run."""
+
+    def __init__(self):
+        self._results: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def _claim(self, name: str, key: str) -> Tuple[Future, bool]:
+        """Return the future for the call and whether the caller must compute it."""
+        with self._lock:
+            future = self._results.get((name, key))
+            if future is not None:
+                self.hits[name] += 1
+                return future, False
+            future = Future()
+            self._results[(name, key)] = future
+            self.misses[name] += 1
+            return future, True
+
+    def _settle(self, name: str, key: str, future: Future, result: Any = None, error: BaseException = None) -> None:
+        if error is None:
+            future.set_result(result)
+            return
+        # Failed calls are not memoized; callers already waiting get the error
+        with self._lock:
+            self._results.pop((name, key), None)
+        future.set_exception(error)
+
+    def call(self, name: str, key: str, func: Callable[[], Any]) -> Any:
+        future, owner = self._claim(name, key)
+        if not owner:
+            return future.result()
+        try:
+            result = func()
+        except BaseException as e:
+            self._settle(name, key, future, error=e)
+            raise
+        self._settle(name, key, future, result)
+        return result
+
+    async def acall(self, name: str, key: str, func: Callable[[], Any]) -> Any:
+        future, owner = self._claim(name, key)
+        if not owner:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await func()
+        except BaseException as e:
+            self._settle(name, key, future, error=e)
+            raise
+        self._settle(name, key, future, result)
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-tool ``{"calls": ..., "hits": ...}``; ``calls`` includes the hits."""
+        with self._lock:
+            return {
+                name: {"calls": self.misses[name] + self.hits[name], "hits": self.hits[name]}
+                for name in sorted(set(self.misses) | set(self.hits))
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+
+def get_tool_memo() -> Optional[ToolMemo]:
+    """The memo of the current run, ``None`` outside :func:`tool_memo_scope`."""
+    return _current_memo.get()
+
+
+@contextmanager
+def tool_memo_scope():
+    """Memoize tool calls made in this context until the block exits."""
+    memo = ToolMemo()
+    token = _current_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        try:
+            _current_memo.reset(token)
+        except ValueError:
+            # Exited in another context, e.g. an async generator closed by the GC
+            _current_memo.set(None)
+        memo.clear()
+
+
+def _canonical_args(signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    try:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+    except TypeError:
+        arguments = {"args": args, "kwargs": kwargs}
+    return json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def memoize_tool(func: Callable, name: Optional[str] = None) -> Callable:
+    """Wrap a sync or async tool function so calls go through the run's memo.
+
+    Async variants should pass the name of their sync tool so both share
+    results.  Outside a memo scope the function is called directly.
+    """
+    name = name or func.__name__
+    signature = inspect.signature(func)
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            memo = get_tool_memo()
+            if memo is None:
+                return await func(*args, **kwargs)
+            key = _canonical_args(signature, args, kwargs)
+            return await memo.acall(name, key, lambda: func(*args, **kwargs))
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        memo = get_tool_memo()
+        if memo is None:
+            return func(*args, **kwargs)
+        key = _canonical_args(signature, args, kwargs)
+        return memo.call(name, key, lambda: func(*args, **kwargs))
+
+    return wrapper
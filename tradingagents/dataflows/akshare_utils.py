@@ -4,6 +4,7 @@ from stockstats import StockDataFrame
 import signal
 import logging
 from ..utils import formatters
+from .segment_cache import get_segment_cache
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -16,17 +17,30 @@ def _handle_timeout(signum, frame):
 
 def get_stock_zh_a_daily(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
     """
-    获取A股历史行情数据
+    获取A股历史行情数据（经分段缓存，只请求尚未缓存的日期区间）
     :param symbol: 股票代码，如 '000001.SZ'
     :param start_date: 开始日期，如 '2020-01-01'
     :param end_date: 结束日期，如 '2021-01-01'
     :return: pd.DataFrame
     """
+    return get_segment_cache().get_range(
+        "akshare_daily",
+        symbol,
+        start_date,
+        end_date,
+        lambda start, end: _fetch_stock_zh_a_daily(symbol, start, end),
+    )
+
+def _fetch_stock_zh_a_daily(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """从 akshare 获取A股历史行情数据"""
     stock_code = formatters.format_symbol(symbol)
     start_date_formatted = formatters.format_date(start_date)
     end_date_formatted = formatters.format_date(end_date)
     try:
         df = ak.stock_zh_a_hist(symbol=stock_code, start_date=start_date_formatted, end_date=end_date_formatted, adjust="qfq")
+        if df is not None and df.empty:
+            # No trading days in the range (e.g. a holiday)
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
         df['date'] = pd.to_datetime(df['日期'])
         df.set_index('date', inplace=True)
         df.rename(columns={
@@ -0,0 +1,51 @@
+"""
+Bounded thread pool for calling blocking data sources from async code.
+
+Most data sources (akshare, yfinance, the offline files, the embedding client)
+only have synchronous APIs.  The async graph API awaits them through
+:func:`run_blocking`, which runs them on one shared pool of
+``blocking_io_workers`` threads, so any number of concurrent analyses on one
+event loop needs at most that many threads for I/O.  Context variables of the
+caller are visible inside the call.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from .config import get_config
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Return the shared pool, sized by ``blocking_io_workers`` on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(get_config().get("blocking_io_workers", 16))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="blocking-io")
+        return _executor
+
+
+def reset_blocking_executor() -> None:
+    """Shut the shared pool down so the next call re-reads the configuration."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Await ``func(*args, **kwargs)`` running on the shared blocking pool."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_blocking_executor(), call)
@@ -11,7 +11,11 @@ from typing import Dict, List, Optional, Any
 import logging
 import time
 import requests
-from functools import wraps
+from functools import partial, wraps
+
+from .hedged_fetch import fetch_settings, hedged_fetch
+from .source_health import get_health_registry
+from .segment_cache import get_segment_cache
 
 logger = logging.getLogger(__name__)
 
@@ -329,29 +333,26 @@ class ChinaStockDataManager:
         Returns:
             合并的股票数据DataFrame
         """
-        all_data = []
-        
-        # 按优先级尝试各个数据源
-        source_priority = ['jqdata', 'tushare', 'alltick']
-        
-        for source_name in source_priority:
-            source = self.sources[source_name]
-            try:
-                data = source.get_stock_data(symbol, start_date, end_date)
-                if data is not None and not data.empty:
-                    all_data.append(data)
-                    logger.info(f"Successfully retrieved data from {source_name} for {symbol}")
-                    break  # 获取到数据就停止尝试其他源
-            except Exception as e:
-                logger.warning(f"Failed to get data from {source_name} for {symbol}: {e}")
-                continue
-        
-        if all_data:
-            # 返回第一个成功的数据源的数据
-            return all_data[0]
-        else:
-            logger.error(f"Failed to retrieve data from all sources for {symbol}")
-            return None
+        # 按优先级对冲请求各个数据源：前一个数据源失败或超过对冲延迟时启动下一个，
+        # 取第一个返回有效数据的结果。熔断中的数据源被跳过，其余按实测延迟排序
+        registry = get_health_registry()
+        source_priority = registry.order(['jqdata', 'tushare', 'alltick'])
+        attempts = [
+            (
+                source_name,
+                registry.track(source_name, partial(self.sources[source_name].get_stock_data, symbol, start_date, end_date)),
+            )
+            for source_name in source_priority
+        ]
+
+        hedge_delay, deadline = fetch_settings()
+        source_name, data, _ = hedged_fetch(attempts, hedge_delay=hedge_delay, deadline=deadline, label=f" {symbol}")
+        if source_name is not None:
+            logger.info(f"Successfully retrieved data from {source_name} for {symbol}")
+            return data
+
+        logger.error(f"Failed to retrieve data from all sources for {symbol}")
+        return None
     
     def get_company_info_enhanced(self, symbol: str) -> Optional[Dict]:
         """
@@ -427,8 +428,19 @@ def get_china_stock_data(symbol: str, start_date: str, end_date: str) -> Optiona
         
     Returns:
         股票数据DataFrame
+
+    经分段缓存：已获取过的日期区间直接从缓存返回，只请求缺失的区间
     """
-    return china_stock_manager.get_stock_data_enhanced(symbol, start_date, end_date)
+    df = get_segment_cache().get_range(
+        "china_stock_data",
+        symbol,
+        start_date,
+        end_date,
+        lambda start, end: china_stock_manager.get_stock_data_enhanced(symbol, start, end),
+    )
+    if df is None or df.empty:
+        return None
+    return df
 
 def get_china_company_info(symbol: str) -> Optional[Dict]:
     """
@@ -0,0 +1,332 @@
+"""
+分层数据缓存
+为 EnhancedDataSourceManager 提供内存 LRU + 磁盘二进制缓存
+
+- 磁盘层使用 pickle 保存结果，DataFrame 的索引和 dtype 原样保留
+- SQLite 元数据索引记录每个条目的类型、大小、创建/过期时间和访问情况
+- 每种数据类型单独配置 TTL（None 表示永不过期，例如历史K线）
+- 磁盘总大小超过上限时按最近访问时间淘汰
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "cache_index.sqlite"
+
+# 默认 TTL（秒），None 表示永不过期
+DEFAULT_TTLS: Dict[str, Optional[float]] = {
+    "stock_data_historical": None,
+    "stock_data": 6 * 3600,
+    "news": 30 * 60,
+    "company_info": 3 * 24 * 3600,
+    "social_sentiment": 4 * 3600,
+}
+DEFAULT_TTL = 24 * 3600
+
+
+class TieredDataCache:
+    """内存 LRU + 磁盘 pickle 的分层缓存，带 SQLite 元数据索引"""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttls: Optional[Dict[str, Optional[float]]] = None,
+        max_bytes: Optional[int] = None,
+        memory_entries: int = 128,
+    ):
+        """
+        Args:
+            cache_dir: 缓存目录
+            ttls: 按数据类型的 TTL（秒），覆盖 DEFAULT_TTLS
+            max_bytes: 磁盘缓存总大小上限，None 表示不限制
+            memory_entries: 内存 LRU 条目数
+        """
+        self.cache_dir = cache_dir
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        # 尚未写入索引的访问记录: key -> (最近访问时间, 命中次数)
+        self._pending_access: Dict[str, Tuple[float, int]] = {}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index_path = os.path.join(cache_dir, INDEX_FILENAME)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    data_type TEXT NOT NULL,
+                    params TEXT,
+                    created_at REAL NOT NULL,
+                    expires_at REAL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries (last_access)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.index_path, timeout=30)
+
+    @staticmethod
+    def make_key(data_type: str, **params) -> str:
+        """生成缓存键"""
+        key_data = f"{data_type}_{json.dumps(params, sort_keys=True, default=str)}"
+        return hashlib.md5(key_data.encode()).hexdigest()
+
+    def _data_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def ttl_for(self, data_type: str) -> Optional[float]:
+        """数据类型对应的 TTL（秒）"""
+        return self.ttls.get(data_type, DEFAULT_TTL)
+
+    @staticmethod
+    def _detach(value: Any) -> Any:
+        # 返回 DataFrame 副本，调用方修改结果不会影响缓存
+        return value.copy() if isinstance(value, pd.DataFrame) else value
+
+    def _remember(self, key: str, expires_at: Optional[float], value: Any) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # 读写
+    # ------------------------------------------------------------------
+    def get(self, data_type: str, max_age: Optional[float] = None, **params) -> Any:
+        """读取缓存，未命中或过期时返回 None
+
+        Args:
+            data_type: 数据类型（决定 TTL）
+            max_age: 可选的最大年龄（秒），覆盖该类型的 TTL
+            **params: 组成缓存键的参数
+        """
+        key = self.make_key(data_type, **params)
+        now = time.time()
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and max_age is None:
+                expires_at, value = cached
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    self._touch(key, now)
+                    return self._detach(value)
+                del self._memory[key]
+
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT created_at, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+            if row is not None:
+                created_at, expires_at = row
+                if max_age is not None:
+                    fresh = now - created_at < max_age
+                else:
+                    fresh = expires_at is None or expires_at > now
+                path = self._data_path(key)
+                if fresh and os.path.exists(path):
+                    try:
+                        with open(path, "rb") as f:
+                            value = pickle.load(f)
+                    except Exception as e:
+                        logger.warning(f"Failed to load cache: {e}")
+                    else:
+                        self._remember(key, expires_at, value)
+                        self._stats["disk_hits"] += 1
+                        self._touch(key, now)
+                        return self._detach(value)
+
+            self._stats["misses"] += 1
+            return None
+
+    def _touch(self, key: str, now: float) -> None:
+        # 访问记录先留在内存里，避免每次命中都写 SQLite
+        _, hits = self._pending_access.get(key, (now, 0))
+        self._pending_access[key] = (now, hits + 1)
+
+    def _flush_access(self) -> None:
+        with self._lock:
+            pending, self._pending_access = self._pending_access, {}
+        if pending:
+            with self._connect() as conn:
+                conn.executemany(
+                    "UPDATE entries SET last_access = ?, hits = hits + ? WHERE key = ?",
+                    [(ts, hits, key) for key, (ts, hits) in pending.items()],
+                )
+
+    def put(self, data_type: str, value: Any, **params) -> None:
+        """写入缓存（内存 + 磁盘），并在超过大小上限时淘汰旧条目"""
+        key = self.make_key(data_type, **params)
+        now = time.time()
+        ttl = self.ttl_for(data_type)
+        expires_at = None if ttl is None else now + ttl
+
+        path = self._data_path(key)
+        tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with self._lock:
+            try:
+                with open(tmp, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+                size = os.path.getsize(path)
+                with self._connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries "
+                        "(key, data_type, params, created_at, expires_at, size, last_access, hits) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                        (key, data_type, json.dumps(params, sort_keys=True, default=str), now, expires_at, size, now),
+                    )
+            except Exception as e:
+                logger.warning(f"Failed to save cache: {e}")
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                return
+
+            self._remember(key, expires_at, self._detach(value))
+            self._enforce_size()
+
+    def _total_bytes(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _enforce_size(self) -> None:
+        """先删除过期条目，再按最近访问时间淘汰，直到总大小不超过上限"""
+        if self.max_bytes is None or self._total_bytes() <= self.max_bytes:
+            return
+
+        self.purge(expired_only=True)
+        self._flush_access()
+        with self._connect() as conn:
+            rows = conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall()
+
+        total = sum(size for _, size in rows)
+        victims = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append(key)
+            total -= size
+        if victims:
+            self._delete(victims)
+            self._stats["evictions"] += len(victims)
+            logger.info(f"Data cache: evicted {len(victims)} entries to stay under {self.max_bytes} bytes")
+
+    def _delete(self, keys: List[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._memory.pop(key, None)
+                self._pending_access.pop(key, None)
+                path = self._data_path(key)
+                if os.path.exists(path):
+                    os.remove(path)
+            with self._connect() as conn:
+                conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in keys])
+
+    # ------------------------------------------------------------------
+    # 管理接口
+    # ------------------------------------------------------------------
+    def list_entries(self, data_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """列出缓存条目（按最近访问时间倒序）"""
+        query = "SELECT key, data_type, params, created_at, expires_at, size, last_access, hits FROM entries"
+        args: tuple = ()
+        if data_type is not None:
+            query += " WHERE data_type = ?"
+            args = (data_type,)
+        query += " ORDER BY last_access DESC"
+        self._flush_access()
+        with self._connect() as conn:
+            rows = conn.execute(query, args).fetchall()
+
+        now = time.time()
+        return [
+            {
+                "key": key,
+                "data_type": dtype,
+                "params": json.loads(params) if params else {},
+                "created_at": created_at,
+                "expires_at": expires_at,
+                "expired": expires_at is not None and expires_at <= now,
+                "size": size,
+                "last_access": last_access,
+                "hits": hits,
+            }
+            for key, dtype, params, created_at, expires_at, size, last_access, hits in rows
+        ]
+
+    def purge(self, data_type: Optional[str] = None, expired_only: bool = False, key: Optional[str] = None) -> int:
+        """删除缓存条目，返回删除的数量
+
+        Args:
+            data_type: 只删除该类型的条目
+            expired_only: 只删除已过期的条目
+            key: 只删除指定的条目
+        """
+        clauses, args = [], []
+        if data_type is not None:
+            clauses.append("data_type = ?")
+            args.append(data_type)
+        if key is not None:
+            clauses.append("key = ?")
+            args.append(key)
+        if expired_only:
+            clauses.append("expires_at IS NOT NULL AND expires_at <= ?")
+            args.append(time.time())
+        query = "SELECT key FROM entries"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+
+        with self._connect() as conn:
+            keys = [row[0] for row in conn.execute(query, args).fetchall()]
+        self._delete(keys)
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计：命中/未命中次数、条目数和磁盘占用（按类型）"""
+        self._flush_access()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT data_type, COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY data_type"
+            ).fetchall()
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        stats["by_type"] = {dtype: {"entries": count, "bytes": size} for dtype, count, size in rows}
+        stats["entries"] = sum(count for _, count, _ in rows)
+        stats["bytes"] = sum(size for _, _, size in rows)
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+
+def create_data_cache(cache_dir: Optional[str] = None) -> TieredDataCache:
+    """按当前配置创建缓存（data_cache_dir / data_cache_ttls / data_cache_max_bytes）"""
+    config = get_config()
+    return TieredDataCache(
+        cache_dir or config.get("data_cache_dir") or os.path.join(os.path.dirname(__file__), "data_cache"),
+        ttls=config.get("data_cache_ttls"),
+        max_bytes=config.get("data_cache_max_bytes"),
+        memory_entries=int(config.get("data_cache_memory_entries", 128)),
+    )
@@ -11,6 +11,9 @@ except ImportError:
 
 from .config import get_config
 from . import akshare_utils, yfin_utils, finnhub_utils
+from .hedged_fetch import fetch_settings, hedged_fetch
+from .source_health import get_health_registry
+from .segment_cache import get_segment_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -49,7 +52,32 @@ class DataSourceManager:
         return sources
 
     def get_stock_data(self, symbol: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
-        """Get stock data using the appropriate data source with fallback support"""
+        """Get stock data using the appropriate data source with fallback support.
+
+        Results go through the shared segment cache, so only the parts of the
+        date range that were not fetched before hit the data sources.
+        """
+        result = get_segment_cache().get_range(
+            "stock_data",
+            symbol,
+            start_date,
+            end_date,
+            lambda start, end: self._fetch_stock_data(symbol, start, end),
+        )
+        if isinstance(result, pd.DataFrame) and result.empty:
+            error_summary = f"Failed to get data from all sources: no data for {symbol} from {start_date} to {end_date}"
+            logger.error(error_summary)
+            raise Exception(error_summary)
+        return result
+
+    def _fetch_stock_data(self, symbol: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        """Fetch stock data from the data sources in priority order.
+
+        Sources are hedged (see ``hedged_fetch``): a backup source starts when
+        the previous one fails or is slower than ``hedge_delay_seconds``.
+        Sources whose circuit breaker is open are skipped and the rest are
+        ordered by observed latency (see ``source_health``).
+        """
         logger.info(f"Fetching stock data for {symbol} from {start_date} to {end_date}")
 
         market = self.get_market_for_symbol(symbol)
@@ -58,39 +86,33 @@ class DataSourceManager:
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-        data_sources = self.get_data_sources_for_market(market)
+        registry = get_health_registry()
+        data_sources = registry.order(self.get_data_sources_for_market(market))
         logger.info(f"Using data sources for {market}: {data_sources}")
-        errors = []
-
-        for i, source in enumerate(data_sources):
-            try:
-                logger.info(f"Attempting to fetch data from {source} (attempt {i+1}/{len(data_sources)})")
-                start_time = time.time()
-
-                result = None
-                if source == "akshare" and market == "cn_market":
-                    result = akshare_utils.get_stock_zh_a_daily(symbol, start_date, end_date)
-                elif source == "finnhub":
-                    # Convert dates to UTC for Finnhub
-                    data_dir = self.config.get("data_cache_dir", "./data")
-                    result = finnhub_utils.get_data_in_range(symbol, start_date, end_date, "stock_data", data_dir)
-                elif source == "yfin":
-                    result = yfin_utils.get_stock_data(symbol, start_date, end_date)
 
-                if result is not None and not result.empty:
-                    elapsed_time = time.time() - start_time
-                    logger.info(f"Successfully fetched {len(result)} rows from {source} in {elapsed_time:.2f}s")
-                    return result
-                else:
-                    logger.warning(f"No data returned from {source}")
-                    errors.append(f"{source}: No data returned")
-
-            except Exception as e:
-                elapsed_time = time.time() - start_time
-                error_msg = f"{source}: {str(e)}"
-                logger.warning(f"Failed to fetch from {source} after {elapsed_time:.2f}s: {e}")
-                errors.append(error_msg)
-                continue
+        attempts = []
+        for source in data_sources:
+            if source == "akshare" and market == "cn_market":
+                attempts.append((source, lambda: akshare_utils.get_stock_zh_a_daily(symbol, start_date, end_date)))
+            elif source == "finnhub":
+                # Convert dates to UTC for Finnhub
+                data_dir = self.config.get("data_cache_dir", "./data")
+                attempts.append(
+                    (source, lambda: finnhub_utils.get_stock_data_frame(symbol, start_date, end_date, data_dir))
+                )
+            elif source == "yfin":
+                attempts.append((source, lambda: yfin_utils.get_stock_data(symbol, start_date, end_date)))
+            else:
+                attempts.append((source, lambda: None))
+        attempts = [(source, registry.track(source, func)) for source, func in attempts]
+
+        hedge_delay, deadline = fetch_settings()
+        source, result, errors = hedged_fetch(
+            attempts, hedge_delay=hedge_delay, deadline=deadline, label=f" {symbol}"
+        )
+        if source is not None:
+            logger.info(f"Successfully fetched {len(result)} rows from {source}")
+            return result
 
         error_summary = f"Failed to get data from all sources: {'; '.join(errors)}"
         logger.error(error_summary)
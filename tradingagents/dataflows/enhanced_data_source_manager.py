@@ -7,11 +7,12 @@ import logging
 import pandas as pd
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime, timedelta
-import hashlib
-import json
 import os
 
 from .data_source_manager import DataSourceManager
+from .data_cache import TieredDataCache, create_data_cache
+from .hedged_fetch import fetch_settings, hedged_fetch
+from .source_health import get_health_registry
 from . import akshare_utils
 from . import finnhub_utils
 from . import googlenews_utils
@@ -37,8 +38,9 @@ class EnhancedDataSourceManager(DataSourceManager):
     
     def __init__(self, cache_dir: str = None):
         super().__init__()
-        self.cache_dir = cache_dir or os.path.join(os.path.dirname(__file__), "data_cache")
-        os.makedirs(self.cache_dir, exist_ok=True)
+        # 分层缓存：内存 LRU + 磁盘 pickle，TTL 按数据类型配置
+        self.cache: TieredDataCache = create_data_cache(cache_dir)
+        self.cache_dir = self.cache.cache_dir
         
         # 数据源优先级配置
         self.data_source_priority = {
@@ -60,47 +62,37 @@ class EnhancedDataSourceManager(DataSourceManager):
     
     def _get_cache_key(self, method: str, **kwargs) -> str:
         """生成缓存键"""
-        key_data = f"{method}_{json.dumps(kwargs, sort_keys=True)}"
-        return hashlib.md5(key_data.encode()).hexdigest()
-    
-    def _get_cache_path(self, cache_key: str) -> str:
-        """获取缓存文件路径"""
-        return os.path.join(self.cache_dir, f"{cache_key}.json")
-    
-    def _is_cache_valid(self, cache_path: str, max_age_hours: int = 24) -> bool:
-        """检查缓存是否有效"""
-        if not os.path.exists(cache_path):
-            return False
-        
-        file_time = datetime.fromtimestamp(os.path.getmtime(cache_path))
-        return datetime.now() - file_time < timedelta(hours=max_age_hours)
-    
-    def _save_to_cache(self, cache_path: str, data: Any):
-        """保存数据到缓存"""
-        try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                if isinstance(data, pd.DataFrame):
-                    json.dump(data.to_dict('records'), f, ensure_ascii=False, indent=2)
-                else:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.warning(f"Failed to save cache: {e}")
-    
-    def _load_from_cache(self, cache_path: str) -> Any:
-        """从缓存加载数据"""
+        return TieredDataCache.make_key(method, **kwargs)
+
+    @staticmethod
+    def _max_age_seconds(max_cache_age: Optional[float]) -> Optional[float]:
+        """把以小时为单位的 max_cache_age 转为秒（None 表示使用按类型配置的 TTL）"""
+        return None if max_cache_age is None else max_cache_age * 3600
+
+    @staticmethod
+    def _stock_data_type(end_date: str) -> str:
+        """结束日期早于今天的K线不会再变化，使用永不过期的历史类型"""
         try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, list) and data:
-                    # 尝试转换为DataFrame
-                    return pd.DataFrame(data)
-                return data
-        except Exception as e:
-            logger.warning(f"Failed to load cache: {e}")
-            return None
-    
+            if datetime.strptime(end_date, "%Y-%m-%d").date() < datetime.now().date():
+                return "stock_data_historical"
+        except (TypeError, ValueError):
+            pass
+        return "stock_data"
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """缓存统计信息"""
+        return self.cache.stats()
+
+    def list_cache_entries(self, data_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """列出缓存条目"""
+        return self.cache.list_entries(data_type)
+
+    def purge_cache(self, data_type: Optional[str] = None, expired_only: bool = False) -> int:
+        """清理缓存条目，返回删除的数量"""
+        return self.cache.purge(data_type=data_type, expired_only=expired_only)
+
     def get_stock_data_enhanced(self, symbol: str, start_date: str, end_date: str, 
-                               use_cache: bool = True, max_cache_age: int = 6) -> Optional[pd.DataFrame]:
+                               use_cache: bool = True, max_cache_age: Optional[float] = None) -> Optional[pd.DataFrame]:
         """
         增强的股票数据获取，支持多数据源和缓存
         
@@ -109,90 +101,85 @@ class EnhancedDataSourceManager(DataSourceManager):
             start_date: 开始日期
             end_date: 结束日期
             use_cache: 是否使用缓存
-            max_cache_age: 缓存最大年龄（小时）
+            max_cache_age: 缓存最大年龄（小时），默认使用按数据类型配置的 TTL
         """
         # 检查缓存
+        data_type = self._stock_data_type(end_date)
+        cache_params = {"symbol": symbol, "start_date": start_date, "end_date": end_date}
         if use_cache:
-            cache_key = self._get_cache_key("stock_data", symbol=symbol, 
-                                          start_date=start_date, end_date=end_date)
-            cache_path = self._get_cache_path(cache_key)
-            
-            if self._is_cache_valid(cache_path, max_cache_age):
-                cached_data = self._load_from_cache(cache_path)
-                if cached_data is not None:
-                    logger.info(f"Using cached stock data for {symbol}")
-                    return cached_data
+            cached_data = self.cache.get(data_type, self._max_age_seconds(max_cache_age), **cache_params)
+            if cached_data is not None:
+                logger.info(f"Using cached stock data for {symbol}")
+                return cached_data
         
         # 确定市场和数据源优先级
         market = self.get_market_for_symbol(symbol)
         data_sources = self.data_source_priority[market]["stock_data"]
         
-        # 尝试多个数据源
-        for source in data_sources:
-            try:
-                logger.info(f"Trying {source} for stock data: {symbol}")
+        # 按优先级对冲请求多个数据源：主数据源过慢或失败时启动下一个。
+        # 熔断中的数据源被跳过，其余按实测延迟排序
+        registry = get_health_registry()
+        attempts = []
+        for source in registry.order(data_sources):
+            if source == "akshare" and market == "cn_market":
+                attempts.append((source, lambda: akshare_utils.get_stock_zh_a_daily(symbol, start_date, end_date)))
+            elif source == "china_enhanced" and market == "cn_market" and CHINA_STOCK_SOURCES_AVAILABLE:
+                # 使用新的A股数据源（JQData、Tushare、Alltick）
+                attempts.append((source, lambda: get_china_stock_data(symbol, start_date, end_date)))
+            elif source == "yfin":
+                attempts.append((source, lambda: yfin_utils.get_stock_data(symbol, start_date, end_date)))
+            elif source == "finnhub":
+                # 直接调用Finnhub，而不是再次经过父类的多数据源对冲
+                data_dir = self.config.get("data_cache_dir", "./data")
+                attempts.append(
+                    (source, lambda: finnhub_utils.get_stock_data_frame(symbol, start_date, end_date, data_dir))
+                )
+
+        attempts = [(source, registry.track(source, func)) for source, func in attempts]
+        hedge_delay, deadline = fetch_settings()
+        source, df, _ = hedged_fetch(attempts, hedge_delay=hedge_delay, deadline=deadline, label=f" {symbol}")
+        if source is not None:
+            # 保存到缓存
+            if use_cache:
+                self.cache.put(data_type, df, **cache_params)
+
+            logger.info(f"Successfully got stock data from {source}")
+            return df
 
-                if source == "akshare" and market == "cn_market":
-                    df = akshare_utils.get_stock_zh_a_daily(symbol, start_date, end_date)
-                elif source == "china_enhanced" and market == "cn_market" and CHINA_STOCK_SOURCES_AVAILABLE:
-                    # 使用新的A股数据源（JQData、Tushare、Alltick）
-                    df = get_china_stock_data(symbol, start_date, end_date)
-                elif source == "yfin":
-                    df = yfin_utils.get_stock_data(symbol, start_date, end_date)
-                elif source == "finnhub":
-                    df = self.get_stock_data(symbol, start_date, end_date)  # 使用父类方法
-                else:
-                    continue
-                
-                if df is not None and not df.empty:
-                    # 保存到缓存
-                    if use_cache:
-                        self._save_to_cache(cache_path, df)
-                    
-                    logger.info(f"Successfully got stock data from {source}")
-                    return df
-                    
-            except Exception as e:
-                logger.warning(f"Failed to get stock data from {source}: {e}")
-                continue
-        
         logger.error(f"Failed to get stock data for {symbol} from all sources")
         return None
-    
+
     def get_company_info_enhanced(self, symbol: str, use_cache: bool = True) -> Optional[Dict]:
         """
         增强的公司信息获取
         """
         if use_cache:
-            cache_key = self._get_cache_key("company_info", symbol=symbol)
-            cache_path = self._get_cache_path(cache_key)
-            
-            if self._is_cache_valid(cache_path, 24):  # 24小时缓存
-                cached_data = self._load_from_cache(cache_path)
-                if cached_data is not None:
-                    return cached_data
+            cached_data = self.cache.get("company_info", symbol=symbol)
+            if cached_data is not None:
+                return cached_data
         
         market = self.get_market_for_symbol(symbol)
         data_sources = self.data_source_priority[market]["company_info"]
+        registry = get_health_registry()
         
-        for source in data_sources:
+        for source in registry.order(data_sources):
             try:
                 logger.info(f"Trying {source} for company info: {symbol}")
 
                 if source == "china_enhanced" and market == "cn_market" and CHINA_STOCK_SOURCES_AVAILABLE:
                     # 使用新的A股数据源获取公司信息
-                    info = get_china_company_info(symbol)
+                    info = registry.track(source, lambda: get_china_company_info(symbol))()
                     if info is not None:
                         if use_cache:
-                            self._save_to_cache(cache_path, info)
+                            self.cache.put("company_info", info, symbol=symbol)
                         return info
 
                 elif source == "akshare" and market == "cn_market":
-                    df = akshare_utils.get_stock_zh_a_info(symbol)
+                    df = registry.track(source, lambda: akshare_utils.get_stock_zh_a_info(symbol))()
                     if df is not None and not df.empty:
                         info = df.iloc[0].to_dict()
                         if use_cache:
-                            self._save_to_cache(cache_path, info)
+                            self.cache.put("company_info", info, symbol=symbol)
                         return info
 
                 elif source == "finnhub":
@@ -206,30 +193,31 @@ class EnhancedDataSourceManager(DataSourceManager):
         return None
     
     def get_news_enhanced(self, symbol: str, limit: int = 10, 
-                         use_cache: bool = True, max_cache_age: int = 2) -> Optional[str]:
+                         use_cache: bool = True, max_cache_age: Optional[float] = None) -> Optional[str]:
         """
         增强的新闻获取，融合多个数据源
+
+        max_cache_age（小时）可覆盖按数据类型配置的 TTL
         """
         if use_cache:
-            cache_key = self._get_cache_key("news", symbol=symbol, limit=limit)
-            cache_path = self._get_cache_path(cache_key)
-            
-            if self._is_cache_valid(cache_path, max_cache_age):
-                cached_data = self._load_from_cache(cache_path)
-                if cached_data is not None:
-                    return cached_data
+            cached_data = self.cache.get("news", self._max_age_seconds(max_cache_age), symbol=symbol, limit=limit)
+            if cached_data is not None:
+                return cached_data
         
         market = self.get_market_for_symbol(symbol)
         data_sources = self.data_source_priority[market]["news"]
+        registry = get_health_registry()
         
         all_news = []
         
-        for source in data_sources:
+        for source in registry.order(data_sources):
             try:
                 logger.info(f"Trying {source} for news: {symbol}")
                 
                 if source == "akshare" and market == "cn_market":
-                    news = akshare_utils.get_stock_zh_a_news(symbol, limit=limit//2)
+                    news = registry.track(
+                        source, lambda: akshare_utils.get_stock_zh_a_news(symbol, limit=limit//2), is_valid=bool
+                    )()
                     if news:
                         all_news.append(f"=== AKShare新闻 ===\n{news}")
                 
@@ -237,7 +225,9 @@ class EnhancedDataSourceManager(DataSourceManager):
                     # 获取Google新闻
                     company_name = self._get_company_name(symbol)
                     if company_name:
-                        news = googlenews_utils.get_google_news(company_name, limit=limit//2)
+                        news = registry.track(
+                            source, lambda: googlenews_utils.get_google_news(company_name, limit=limit//2), is_valid=bool
+                        )()
                         if news:
                             all_news.append(f"=== Google新闻 ===\n{news}")
                 
@@ -252,7 +242,7 @@ class EnhancedDataSourceManager(DataSourceManager):
         if all_news:
             combined_news = "\n\n".join(all_news)
             if use_cache:
-                self._save_to_cache(cache_path, combined_news)
+                self.cache.put("news", combined_news, symbol=symbol, limit=limit)
             return combined_news
         
         return None
@@ -274,24 +264,23 @@ class EnhancedDataSourceManager(DataSourceManager):
         增强的社交媒体情绪分析
         """
         if use_cache:
-            cache_key = self._get_cache_key("social_sentiment", symbol=symbol)
-            cache_path = self._get_cache_path(cache_key)
-            
-            if self._is_cache_valid(cache_path, 4):  # 4小时缓存
-                cached_data = self._load_from_cache(cache_path)
-                if cached_data is not None:
-                    return cached_data
+            cached_data = self.cache.get("social_sentiment", symbol=symbol)
+            if cached_data is not None:
+                return cached_data
         
         market = self.get_market_for_symbol(symbol)
         data_sources = self.data_source_priority[market]["social_sentiment"]
+        registry = get_health_registry()
         
         sentiment_data = []
         
-        for source in data_sources:
+        for source in registry.order(data_sources):
             try:
                 if source == "reddit":
                     # Reddit情绪分析
-                    reddit_data = reddit_utils.get_reddit_stock_info(symbol)
+                    reddit_data = registry.track(
+                        source, lambda: reddit_utils.get_reddit_stock_info(symbol), is_valid=bool
+                    )()
                     if reddit_data:
                         sentiment_data.append(f"=== Reddit情绪 ===\n{reddit_data}")
                 
@@ -304,7 +293,7 @@ class EnhancedDataSourceManager(DataSourceManager):
         if sentiment_data:
             combined_sentiment = "\n\n".join(sentiment_data)
             if use_cache:
-                self._save_to_cache(cache_path, combined_sentiment)
+                self.cache.put("social_sentiment", combined_sentiment, symbol=symbol)
             return combined_sentiment
         
         return None
@@ -322,6 +311,8 @@ class EnhancedDataSourceManager(DataSourceManager):
             "overall_quality": "unknown"
         }
         
+        registry = get_health_registry()
+        
         # 测试各个数据源的可用性
         for data_type, sources in self.data_source_priority[market].items():
             report["data_sources"][data_type] = {}
@@ -337,9 +328,10 @@ class EnhancedDataSourceManager(DataSourceManager):
                             df = akshare_utils.get_stock_zh_a_daily(symbol, start_date, end_date)
                             status = "available" if df is not None and not df.empty else "no_data"
                         else:
-                            status = "not_tested"
+                            status = registry.status(source) or "not_tested"
                     else:
-                        status = "not_tested"
+                        # 使用实际调用记录的健康状态（没有记录时为 not_tested）
+                        status = registry.status(source) or "not_tested"
                     
                     report["data_sources"][data_type][source] = status
                     
@@ -367,4 +359,7 @@ class EnhancedDataSourceManager(DataSourceManager):
             else:
                 report["overall_quality"] = "poor"
         
+        # 各数据源的滑动窗口健康统计（成功率、延迟、熔断状态）
+        report["source_health"] = registry.snapshot()
+        
         return report
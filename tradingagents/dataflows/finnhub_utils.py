@@ -1,5 +1,179 @@
+import bisect
 import json
+import logging
 import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+class FinnhubStore:
+    """Process-wide reader for the offline ``*_data_formatted.json`` files.
+
+    Each file maps a date key (``YYYY-MM-DD``) to a list of records.  A file is
+    parsed once; its keys are kept sorted so a date-range query is two binary
+    searches.  Parsed files live in a small LRU and are re-read when the file
+    changes on disk.
+
+    When *sqlite_path* is set, files are instead converted once into a SQLite
+    table (one row per date key) and queries read only the matching rows, so
+    whole files are never held in memory.
+    """
+
+    def __init__(self, max_files: int = 64, sqlite_path: Optional[str] = None):
+        self.max_files = max_files
+        self.sqlite_path = sqlite_path
+        self._lock = threading.Lock()
+        # path -> (signature, sorted keys, original positions, data)
+        self._files: "OrderedDict[str, Tuple[tuple, List[str], List[int], dict]]" = OrderedDict()
+        if sqlite_path:
+            os.makedirs(os.path.dirname(os.path.abspath(sqlite_path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS files (
+                        path TEXT PRIMARY KEY,
+                        mtime REAL NOT NULL,
+                        size INTEGER NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS entries (
+                        path TEXT NOT NULL,
+                        date_key TEXT NOT NULL,
+                        position INTEGER NOT NULL,
+                        value TEXT NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_entries_range ON entries (path, date_key);
+                    """
+                )
+
+    @staticmethod
+    def _signature(path: str) -> tuple:
+        stat = os.stat(path)
+        return (stat.st_mtime, stat.st_size)
+
+    @staticmethod
+    def _read_json(path: str) -> dict:
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.sqlite_path, timeout=30)
+
+    # ------------------------------------------------------------------
+    # In-memory tier
+    # ------------------------------------------------------------------
+    def _load(self, path: str) -> Tuple[List[str], List[int], dict]:
+        signature = self._signature(path)
+        with self._lock:
+            cached = self._files.get(path)
+            if cached is not None and cached[0] == signature:
+                self._files.move_to_end(path)
+                return cached[1:]
+
+        data = self._read_json(path)
+        keys = list(data)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        sorted_keys = [keys[i] for i in order]
+
+        with self._lock:
+            self._files[path] = (signature, sorted_keys, order, data)
+            self._files.move_to_end(path)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        return sorted_keys, order, data
+
+    def _query_memory(self, path: str, start_date: str, end_date: str) -> Dict[str, list]:
+        sorted_keys, order, data = self._load(path)
+        lo = bisect.bisect_left(sorted_keys, start_date)
+        hi = bisect.bisect_right(sorted_keys, end_date)
+        # Keep the order the keys have in the file
+        hits = sorted(zip(order[lo:hi], sorted_keys[lo:hi]))
+        return {key: data[key] for _, key in hits if len(data[key]) > 0}
+
+    # ------------------------------------------------------------------
+    # SQLite tier
+    # ------------------------------------------------------------------
+    def convert(self, path: str) -> bool:
+        """Convert *path* into the SQLite store if it is new or changed."""
+        mtime, size = self._signature(path)
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT mtime, size FROM files WHERE path = ?", (path,)).fetchone()
+            if row is not None and tuple(row) == (mtime, size):
+                return False
+            data = self._read_json(path)
+            conn.execute("DELETE FROM entries WHERE path = ?", (path,))
+            conn.executemany(
+                "INSERT INTO entries (path, date_key, position, value) VALUES (?, ?, ?, ?)",
+                ((path, key, i, json.dumps(value)) for i, (key, value) in enumerate(data.items())),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO files (path, mtime, size) VALUES (?, ?, ?)", (path, mtime, size)
+            )
+        logger.info(f"Finnhub store: converted {path} ({len(data)} dates)")
+        return True
+
+    def _query_sqlite(self, path: str, start_date: str, end_date: str) -> Dict[str, list]:
+        self.convert(path)
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT date_key, value FROM entries WHERE path = ? AND date_key BETWEEN ? AND ? ORDER BY position",
+                (path, start_date, end_date),
+            ).fetchall()
+        result = {}
+        for key, value in rows:
+            value = json.loads(value)
+            if len(value) > 0:
+                result[key] = value
+        return result
+
+    def query(self, path: str, start_date: str, end_date: str) -> Dict[str, list]:
+        """Return ``{date: records}`` for keys in ``[start_date, end_date]`` with non-empty records."""
+        path = os.path.abspath(path)
+        if self.sqlite_path:
+            return self._query_sqlite(path, start_date, end_date)
+        return self._query_memory(path, start_date, end_date)
+
+    def convert_all(self, data_dir: str) -> List[str]:
+        """Convert every formatted JSON file under ``{data_dir}/finnhub_data``."""
+        converted = []
+        for root, _, files in os.walk(os.path.join(data_dir, "finnhub_data")):
+            for fname in sorted(files):
+                if fname.endswith("_data_formatted.json"):
+                    path = os.path.abspath(os.path.join(root, fname))
+                    if self.convert(path):
+                        converted.append(path)
+        return converted
+
+
+_store: Optional[FinnhubStore] = None
+_store_lock = threading.Lock()
+
+
+def get_finnhub_store() -> FinnhubStore:
+    """Return the process-wide :class:`FinnhubStore` configured from ``get_config()``."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            config = get_config()
+            _store = FinnhubStore(
+                max_files=int(config.get("finnhub_cache_files", 64)),
+                sqlite_path=config.get("finnhub_sqlite_path"),
+            )
+        return _store
+
+
+def reset_finnhub_store() -> None:
+    """Forget the shared store so the next access re-reads the configuration."""
+    global _store
+    with _store_lock:
+        _store = None
 
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
@@ -25,15 +199,25 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
         )
 
-    data = open(data_path, "r")
-    data = json.load(data)
-
     # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
-    filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
-    return filtered_data
+    return get_finnhub_store().query(data_path, start_date, end_date)
+
+
+def get_stock_data_frame(ticker, start_date, end_date, data_dir):
+    """
+    Finnhub stock data in [start_date, end_date] as a DataFrame indexed by date.
+    Records that are not dicts end up in a ``value`` column; no data gives an empty frame.
+    """
+    data = get_data_in_range(ticker, start_date, end_date, "stock_data", data_dir)
+    rows = []
+    for day, records in data.items():
+        for record in records:
+            rows.append({"date": day, **record} if isinstance(record, dict) else {"date": day, "value": record})
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows)
+    df["date"] = pd.to_datetime(df["date"])
+    return df.set_index("date")
 
 
 def get_company_profile(symbol):
@@ -0,0 +1,200 @@
+"""
+Hedged fetching across prioritized data sources.
+
+The multi-source managers used to try their sources strictly one after
+another, so a slow source that eventually times out delayed the fallback by
+its full timeout.  :func:`hedged_fetch` starts the primary source and, if it
+has not produced a valid result within ``hedge_delay`` seconds, also starts
+the next source in the priority list (and so on).  The first valid result
+wins; the other attempts are cancelled if they have not started yet and
+ignored otherwise.  A failed attempt starts the next source immediately, and
+the whole call is bounded by an overall deadline.
+
+With ``hedge_delay=None`` sources are only tried after the previous one
+failed, i.e. the old sequential behaviour (still bounded by the deadline).
+
+A hedged fetch started from inside an attempt (e.g. a source that is itself
+a multi-source manager) runs its attempts inline and sequentially: the outer
+attempt already holds a pool worker, and waiting on inner attempts queued in
+the same bounded pool could exhaust it.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+Attempt = Tuple[str, Callable[[], Any]]
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(get_config().get("fetch_max_workers", 16))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hedged-fetch")
+        return _executor
+
+
+def _run_as_attempt(func: Callable[[], Any]) -> Any:
+    _worker.active = True
+    try:
+        return func()
+    finally:
+        _worker.active = False
+
+
+def _fetch_inline(
+    attempts: Sequence[Attempt],
+    deadline: Optional[float],
+    is_valid: Callable[[Any], bool],
+    label: str,
+) -> Tuple[Optional[str], Any, List[str]]:
+    """Try *attempts* one after another in the calling thread."""
+    errors: List[str] = []
+    started = time.monotonic()
+    for name, func in attempts:
+        if deadline is not None and time.monotonic() - started >= deadline:
+            logger.warning(f"Fetch{label}: deadline of {deadline}s exceeded")
+            errors.append(f"deadline of {deadline}s exceeded")
+            break
+        try:
+            result = func()
+            valid = is_valid(result)
+        except Exception as e:
+            logger.warning(f"Fetch{label}: {name} failed: {e}")
+            errors.append(f"{name}: {e}")
+            continue
+        if valid:
+            return name, result, errors
+        logger.warning(f"Fetch{label}: no data returned from {name}")
+        errors.append(f"{name}: No data returned")
+    return None, None, errors
+
+
+def has_rows(result: Any) -> bool:
+    """Default validity check: a non-empty DataFrame (or other object with ``empty``).
+
+    Results without ``empty`` count when they are non-empty sized objects (a
+    dict of records, a string) or, if unsized, merely not ``None``.
+    """
+    if result is None:
+        return False
+    empty = getattr(result, "empty", None)
+    if empty is not None:
+        return not empty
+    try:
+        return len(result) > 0
+    except TypeError:
+        return True
+
+
+def fetch_settings() -> Tuple[Optional[float], Optional[float]]:
+    """Return ``(hedge_delay, deadline)`` in seconds from the configuration.
+
+    ``hedge_delay`` is ``None`` when ``data_fetch_mode`` is ``"sequential"``.
+    """
+    config = get_config()
+    deadline = config.get("fetch_deadline_seconds")
+    if config.get("data_fetch_mode", "hedged") == "sequential":
+        return None, deadline
+    return config.get("hedge_delay_seconds", 2.0), deadline
+
+
+def hedged_fetch(
+    attempts: Sequence[Attempt],
+    hedge_delay: Optional[float] = None,
+    deadline: Optional[float] = None,
+    is_valid: Callable[[Any], bool] = has_rows,
+    label: str = "",
+) -> Tuple[Optional[str], Any, List[str]]:
+    """Run *attempts* in priority order with hedging and return the first valid result.
+
+    Args:
+        attempts: ``(source name, zero-argument callable)`` in priority order.
+        hedge_delay: Seconds to wait for the running attempts before also
+            starting the next one; ``None`` only starts it after a failure.
+        deadline: Overall time limit in seconds; ``None`` waits indefinitely.
+        is_valid: Decides whether a result counts (an exception counts as invalid).
+        label: Context for log messages (e.g. the symbol).
+
+    Returns:
+        ``(winning source, result, errors)``; the source and result are ``None``
+        when no attempt produced a valid result before the deadline.
+    """
+    errors: List[str] = []
+    if not attempts:
+        return None, None, errors
+    if getattr(_worker, "active", False):
+        # Nested inside another hedged attempt: do not queue on the pool we occupy
+        return _fetch_inline(attempts, deadline, is_valid, label)
+
+    executor = _get_executor()
+    started = time.monotonic()
+    pending: Dict[Future, str] = {}
+    next_index = 0
+    last_launch = started
+
+    def launch() -> None:
+        nonlocal next_index, last_launch
+        name, func = attempts[next_index]
+        next_index += 1
+        last_launch = time.monotonic()
+        if next_index > 1:
+            logger.info(f"Fetch{label}: starting {name} ({next_index}/{len(attempts)})")
+        pending[executor.submit(_run_as_attempt, func)] = name
+
+    launch()
+    while pending:
+        now = time.monotonic()
+        timeouts = []
+        if hedge_delay is not None and next_index < len(attempts):
+            timeouts.append(max(0.0, last_launch + hedge_delay - now))
+        if deadline is not None:
+            timeouts.append(max(0.0, started + deadline - now))
+        done, _ = wait(list(pending), timeout=min(timeouts) if timeouts else None, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            name = pending.pop(future)
+            try:
+                result = future.result()
+                valid = is_valid(result)
+            except Exception as e:
+                logger.warning(f"Fetch{label}: {name} failed: {e}")
+                errors.append(f"{name}: {e}")
+                continue
+            if valid:
+                for other in pending:
+                    other.cancel()
+                logger.info(
+                    f"Fetch{label}: {name} won after {time.monotonic() - started:.2f}s "
+                    f"({next_index}/{len(attempts)} sources started)"
+                )
+                return name, result, errors
+            logger.warning(f"Fetch{label}: no data returned from {name}")
+            errors.append(f"{name}: No data returned")
+
+        now = time.monotonic()
+        if deadline is not None and now - started >= deadline:
+            for other in pending:
+                other.cancel()
+            waiting = ", ".join(pending.values())
+            logger.warning(f"Fetch{label}: deadline of {deadline}s exceeded (still waiting for {waiting or 'nothing'})")
+            errors.append(f"deadline of {deadline}s exceeded")
+            return None, None, errors
+
+        if next_index < len(attempts) and (
+            not pending or (hedge_delay is not None and now - last_launch >= hedge_delay)
+        ):
+            launch()
+
+    return None, None, errors
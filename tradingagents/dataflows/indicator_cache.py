@@ -0,0 +1,154 @@
+"""
+Cache for technical indicator series computed with ``stockstats``.
+
+Entries are keyed by ``(symbol, fingerprint, indicator)`` where the
+fingerprint describes the exact price history the series was computed from
+(first and last bar date, row count and a hash of the OHLCV values).  When new
+bars are appended or the history is revised the fingerprint changes, so a
+stale series is never served.
+
+Two tiers are used:
+
+- an in-memory LRU of recently used series;
+- an optional on-disk tier (one pickle file per entry) shared across runs.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from . import config as _config_module
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, str]
+
+
+def price_fingerprint(price_df: pd.DataFrame) -> str:
+    """Return a fingerprint identifying the content of a price history."""
+    if price_df.empty:
+        return "empty"
+    digest = hashlib.md5()
+    digest.update(pd.util.hash_pandas_object(price_df, index=True).values.tobytes())
+    first = pd.Timestamp(price_df.index[0]).strftime("%Y-%m-%d")
+    last = pd.Timestamp(price_df.index[-1]).strftime("%Y-%m-%d")
+    return f"{first}_{last}_{len(price_df)}_{digest.hexdigest()[:16]}"
+
+
+class IndicatorCache:
+    """Two-tier (memory LRU + optional disk) cache of indicator series."""
+
+    def __init__(self, max_entries: int = 256, cache_dir: Optional[str] = None):
+        """
+        Args:
+            max_entries: Number of series kept in the in-memory LRU.
+            cache_dir: Directory for the on-disk tier; ``None`` disables it.
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[CacheKey, pd.Series]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _disk_path(self, key: CacheKey) -> str:
+        name = hashlib.md5("|".join(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.pkl")
+
+    def _remember(self, key: CacheKey, series: pd.Series) -> None:
+        self._entries[key] = series
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, symbol: str, fingerprint: str, indicator: str) -> Optional[pd.Series]:
+        """Return the cached series or ``None`` (counts a hit or a miss)."""
+        key = (symbol, fingerprint, indicator)
+        with self._lock:
+            series = self._entries.get(key)
+            if series is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return series
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                try:
+                    with open(path, "rb") as f:
+                        series = pickle.load(f)
+                except Exception as e:
+                    logger.warning(f"Failed to read indicator cache file {path}: {e}")
+                    series = None
+                if series is not None:
+                    with self._lock:
+                        self._remember(key, series)
+                        self._stats["disk_hits"] += 1
+                    return series
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def put(self, symbol: str, fingerprint: str, indicator: str, series: pd.Series) -> None:
+        """Store a computed series in memory and, if enabled, on disk."""
+        key = (symbol, fingerprint, indicator)
+        with self._lock:
+            self._remember(key, series)
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+            try:
+                with open(tmp, "wb") as f:
+                    pickle.dump(series, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+            except Exception as e:
+                logger.warning(f"Failed to write indicator cache file {path}: {e}")
+
+    def clear(self) -> None:
+        """Drop the in-memory tier and reset the counters (disk files are kept)."""
+        with self._lock:
+            self._entries.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the hit rate."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+_cache: Optional[IndicatorCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Return the process-wide :class:`IndicatorCache` configured from ``get_config()``."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = _config_module.get_config()
+            _cache = IndicatorCache(
+                max_entries=int(config.get("indicator_cache_size", 256)),
+                cache_dir=config.get("indicator_cache_dir"),
+            )
+        return _cache
+
+
+def reset_indicator_cache() -> None:
+    """Forget the shared cache so the next access re-reads the configuration."""
+    global _cache
+    with _cache_lock:
+        _cache = None
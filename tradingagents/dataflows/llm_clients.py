@@ -0,0 +1,238 @@
+"""
+Process-wide LLM clients sharing one pool of keep-alive connections.
+
+Every ``TradingAgentsGraph`` used to build its own chat models, every OpenAI
+web-search tool call its own ``OpenAI`` client and every memory one more, so
+each of them paid for new TCP and TLS handshakes.  Here chat models are built
+once per ``(provider, base_url, api_key, model)`` and raw OpenAI clients once
+per ``(base_url, api_key)``; all OpenAI-compatible clients send their requests
+through one ``httpx`` client (HTTP/2 when the ``h2`` package is installed)
+whose limits come from the ``llm_http_*`` configuration keys, and every
+request is rate limited by :mod:`.llm_scheduler`.
+
+The async ``httpx`` client keeps one connection pool per event loop, because
+connections cannot move between loops and every ``asyncio.run`` starts a new
+one.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from .config import get_config
+from .llm_scheduler import AsyncRateLimitedTransport, RateLimitedTransport
+
+logger = logging.getLogger(__name__)
+
+
+def _backend_url(config):
+    return config.get("backend_url")
+
+
+def _endpoint(name: str) -> Callable[[Dict[str, Any]], Optional[str]]:
+    return lambda config: (config.get("api_endpoints") or {}).get(name)
+
+
+def _config_key(name: str) -> Callable[[Dict[str, Any]], Optional[str]]:
+    return lambda config: config.get(name)
+
+
+# Supported providers: which client class serves them and where their base URL and API key come from
+PROVIDERS: Dict[str, Dict[str, Any]] = {
+    "openai": {"kind": "openai", "base_url": _backend_url, "api_key": lambda config: os.getenv("OPENAI_API_KEY")},
+    # Ollama ignores the key but the OpenAI client requires one
+    "ollama": {"kind": "openai", "base_url": _backend_url, "api_key": lambda config: "ollama"},
+    "openrouter": {"kind": "openai", "base_url": _backend_url, "api_key": _config_key("openrouter_api_key")},
+    "groq": {"kind": "openai", "base_url": _endpoint("groq"), "api_key": _config_key("groq_api_key")},
+    "together": {"kind": "openai", "base_url": _endpoint("together"), "api_key": _config_key("together_api_key")},
+    "zhipuai": {"kind": "openai", "base_url": _endpoint("zhipuai"), "api_key": _config_key("zhipuai_api_key")},
+    # The Anthropic client reads ANTHROPIC_API_KEY itself
+    "anthropic": {"kind": "anthropic", "base_url": _backend_url, "api_key": lambda config: None},
+    "google": {"kind": "google", "base_url": lambda config: None, "api_key": _config_key("google_api_key")},
+}
+
+PROVIDER_ALIASES = {"智谱ai": "zhipuai"}
+
+
+def provider_name(config: Dict[str, Any]) -> str:
+    """Registry name of the configured ``llm_provider`` (descriptions after the name are ignored)."""
+    raw = config.get("llm_provider") or ""
+    name = raw.lower().split()[0] if raw.strip() else ""
+    name = PROVIDER_ALIASES.get(name, name)
+    if name not in PROVIDERS:
+        raise ValueError(f"Unsupported LLM provider: {name} (from: {raw})")
+    return name
+
+
+# ----------------------------------------------------------------------
+# Shared HTTP connection pool
+# ----------------------------------------------------------------------
+def _pool_settings() -> Dict[str, Any]:
+    config = get_config()
+    http2 = bool(config.get("llm_http2", True))
+    if http2 and importlib.util.find_spec("h2") is None:
+        http2 = False
+    return {
+        "limits": httpx.Limits(
+            max_connections=int(config.get("llm_http_max_connections", 100)),
+            max_keepalive_connections=int(config.get("llm_http_max_keepalive", 20)),
+            keepalive_expiry=float(config.get("llm_http_keepalive_expiry", 30.0)),
+        ),
+        "http2": http2,
+    }
+
+
+class _LoopLocalTransport(httpx.AsyncBaseTransport):
+    """Async transport keeping a separate connection pool for each event loop."""
+
+    def __init__(self, **transport_kwargs):
+        self._transport_kwargs = transport_kwargs
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _pool(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                pool = httpx.AsyncHTTPTransport(**self._transport_kwargs)
+                self._pools[loop] = pool
+            return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._pools.pop(loop, None)
+        if pool is not None:
+            await pool.aclose()
+
+
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+_chat_models: Dict[Tuple[str, Optional[str], Optional[str], str], Any] = {}
+_openai_clients: Dict[Tuple[bool, Optional[str], Optional[str]], Any] = {}
+_lock = threading.RLock()
+
+
+def get_http_client() -> httpx.Client:
+    """The process-wide sync ``httpx`` client used by all OpenAI-compatible clients."""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            settings = _pool_settings()
+            _http_client = httpx.Client(
+                transport=RateLimitedTransport(httpx.HTTPTransport(**settings)), follow_redirects=True
+            )
+            logger.debug(f"Opened shared LLM connection pool ({settings})")
+        return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """The process-wide async ``httpx`` client (one connection pool per event loop)."""
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None:
+            _async_http_client = httpx.AsyncClient(
+                transport=AsyncRateLimitedTransport(_LoopLocalTransport(**_pool_settings())),
+                follow_redirects=True,
+            )
+        return _async_http_client
+
+
+# ----------------------------------------------------------------------
+# Client factories
+# ----------------------------------------------------------------------
+def _build_chat_model(kind: str, model: str, base_url: Optional[str], api_key: Optional[str]):
+    if kind == "openai":
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(
+            model=model,
+            base_url=base_url,
+            api_key=api_key,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client(),
+            # Retries (429 and transient failures) belong to the scheduler (see llm_scheduler)
+            max_retries=0,
+        )
+    if kind == "anthropic":
+        from langchain_anthropic import ChatAnthropic
+
+        # ChatAnthropic builds its SDK client once per instance, so reusing the instance reuses its pool
+        return ChatAnthropic(model=model, base_url=base_url)
+    if kind == "google":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        return ChatGoogleGenerativeAI(model=model, google_api_key=api_key)
+    raise ValueError(f"Unknown client kind: {kind}")
+
+
+def get_chat_model(config: Dict[str, Any], model: str):
+    """Return the shared chat model for *model* on the configured provider.
+
+    Models are cached by ``(provider, base_url, api_key, model)``, so every
+    graph in the process configured the same way gets the same instance.
+    Callers that need to change attributes (e.g. ``cache``) should work on a
+    ``model_copy``.
+    """
+    name = provider_name(config)
+    provider = PROVIDERS[name]
+    base_url = provider["base_url"](config)
+    api_key = provider["api_key"](config)
+    key = (name, base_url, api_key, model)
+    with _lock:
+        chat_model = _chat_models.get(key)
+        if chat_model is None:
+            chat_model = _build_chat_model(provider["kind"], model, base_url, api_key)
+            _chat_models[key] = chat_model
+        return chat_model
+
+
+def get_openai_client(base_url: Optional[str] = None, api_key: Optional[str] = None):
+    """Shared ``openai.OpenAI`` client on the pooled connections (key defaults to ``OPENAI_API_KEY``)."""
+    return _openai_client(False, base_url, api_key)
+
+
+def get_async_openai_client(base_url: Optional[str] = None, api_key: Optional[str] = None):
+    """Shared ``openai.AsyncOpenAI`` client on the pooled connections."""
+    return _openai_client(True, base_url, api_key)
+
+
+def _openai_client(is_async: bool, base_url: Optional[str], api_key: Optional[str]):
+    from openai import AsyncOpenAI, OpenAI
+
+    key = (is_async, base_url, api_key)
+    with _lock:
+        client = _openai_clients.get(key)
+        if client is None:
+            if is_async:
+                client = AsyncOpenAI(
+                    base_url=base_url, api_key=api_key, http_client=get_async_http_client(), max_retries=0
+                )
+            else:
+                client = OpenAI(base_url=base_url, api_key=api_key, http_client=get_http_client(), max_retries=0)
+            _openai_clients[key] = client
+        return client
+
+
+def reset_llm_clients() -> None:
+    """Forget the shared clients and close the sync pool; the next access re-reads the configuration."""
+    global _http_client, _async_http_client
+    with _lock:
+        _chat_models.clear()
+        _openai_clients.clear()
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        _async_http_client = None
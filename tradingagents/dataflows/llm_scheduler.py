@@ -0,0 +1,464 @@
+"""
+Rate limiting and scheduling of LLM requests.
+
+The free tiers of OpenRouter, Groq and ZhipuAI allow only a few requests and
+tokens per minute, so concurrent analyses used to run into HTTP 429 and fail
+or stall.  :class:`LLMScheduler` sits in the shared ``httpx`` transport of
+:mod:`.llm_clients`, so every request of every OpenAI-compatible client goes
+through it:
+
+- each ``(provider, model)`` lane has token buckets for requests and tokens
+  per minute, configured under ``rate_limits`` (per-model overrides under
+  ``models``);
+- waiting requests are granted by priority (:func:`llm_priority`; the judges
+  run at ``HIGH``), then fairly across the analyses tagged with
+  :func:`llm_flow`, so one run cannot starve the others;
+- a 429 blocks its lane for the time given by ``Retry-After`` /
+  ``x-ratelimit-reset-*`` (exponential backoff with jitter when absent) and
+  the request is retried; ``x-ratelimit-remaining-*`` headers keep the
+  buckets in line with the provider's own counters;
+- transient failures (408, 409, 5xx, timeouts and connection errors) are
+  retried with exponential backoff, since the pooled clients are built with
+  the SDK's own retries turned off.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import json
+import logging
+import random
+import re
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Lower values are granted first
+HIGH, NORMAL, LOW = 0, 1, 2
+
+# Statuses retried like a dropped connection (5xx are retried as well)
+TRANSIENT_STATUS = {408, 409}
+
+_current_priority: contextvars.ContextVar[int] = contextvars.ContextVar("llm_priority", default=NORMAL)
+_current_flow: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_flow", default=None)
+
+
+@contextmanager
+def _scoped(var: contextvars.ContextVar, value, default):
+    token = var.set(value)
+    try:
+        yield value
+    finally:
+        try:
+            var.reset(token)
+        except ValueError:
+            # Exited in another context, e.g. an async generator closed by the GC
+            var.set(default)
+
+
+def llm_priority(priority: int):
+    """Run LLM requests made in this context at *priority* (``HIGH``, ``NORMAL`` or ``LOW``)."""
+    return _scoped(_current_priority, priority, NORMAL)
+
+
+def llm_flow(name: str):
+    """Tag LLM requests made in this context as one analysis for fair queuing."""
+    return _scoped(_current_flow, name, None)
+
+
+_DURATION = re.compile(r"([\d.]+)(ms|s|m|h)")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds until a rate limit resets, from a ``Retry-After``-style header.
+
+    Understands plain seconds, durations such as ``1m2.5s`` or ``120ms``
+    (OpenAI/Groq), epoch timestamps in seconds or milliseconds (OpenRouter)
+    and HTTP dates.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    now = time.time() if now is None else now
+    try:
+        number = float(value)
+    except ValueError:
+        parts = _DURATION.findall(value)
+        if parts and "".join(n + u for n, u in parts) == value:
+            return sum(float(n) * _UNITS[u] for n, u in parts)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+        except (TypeError, ValueError):
+            return None
+    if number > 1e11:  # epoch milliseconds
+        return max(0.0, number / 1000 - now)
+    if number > 1e9:  # epoch seconds
+        return max(0.0, number - now)
+    return max(0.0, number)
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``per_minute / 60`` per second."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity or per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until *amount* (capped at the capacity) is available."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate) if missing > 0 else 0.0
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+
+    def limit_to(self, remaining: float, now: float) -> None:
+        """Trust a lower count reported by the provider."""
+        self._refill(now)
+        self.level = min(self.level, remaining)
+
+
+class _Lane:
+    """Buckets, backoff state and waiting requests of one ``(provider, model)``."""
+
+    def __init__(self, rpm: Optional[float], tpm: Optional[float]):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.blocked_until = 0.0
+        self.failures = 0
+        self.waiting = []
+        # Flows with waiting requests only; an idle flow restarts at virtual_time
+        self.flow_clock: Dict[Optional[str], int] = {}
+        self.flow_waiting: Dict[Optional[str], int] = {}
+        self.virtual_time = 0
+        self.timer: Optional[threading.Timer] = None
+
+    def wait_time(self, tokens: float, now: float) -> float:
+        wait = self.blocked_until - now
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return max(0.0, wait)
+
+    def take(self, tokens: float, now: float) -> None:
+        if self.requests is not None:
+            self.requests.take(1, now)
+        if self.tokens is not None:
+            self.tokens.take(tokens, now)
+
+
+class LLMScheduler:
+    """Grants LLM requests per provider/model within their rate limits."""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Dict[str, Any]]] = None,
+        hosts: Optional[Dict[str, str]] = None,
+        max_retries: int = 5,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        transient_retries: int = 2,
+    ):
+        """
+        Args:
+            limits: ``{provider: {"rpm": ..., "tpm": ..., "models": {model: {...}}}}``;
+                a missing or ``None`` limit is unlimited.
+            hosts: Maps request host names to provider names.
+            max_retries: Times a request answered with 429 is retried.
+            base_backoff: First backoff in seconds when a 429 carries no reset header.
+            max_backoff: Upper bound of any backoff.
+            transient_retries: Times a request failing transiently (408, 409,
+                5xx or a transport error) is retried.
+        """
+        self.limits = limits or {}
+        self.hosts = hosts or {}
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.transient_retries = transient_retries
+        self._lanes: Dict[Tuple[str, Optional[str]], _Lane] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "delayed": 0, "wait_seconds": 0.0, "rate_limited": 0, "retries": 0}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "LLMScheduler":
+        hosts = {}
+        for name, url in (config.get("api_endpoints") or {}).items():
+            hosts[urlparse(url).netloc] = name
+        # A custom backend_url belongs to the configured provider
+        provider = (config.get("llm_provider") or "").lower().split()
+        if config.get("backend_url") and provider:
+            hosts.setdefault(urlparse(config["backend_url"]).netloc, provider[0])
+        return cls(
+            limits=config.get("rate_limits"),
+            hosts=hosts,
+            max_retries=int(config.get("rate_limit_max_retries", 5)),
+            max_backoff=float(config.get("rate_limit_max_backoff", 60.0)),
+            transient_retries=int(config.get("llm_transient_retries", 2)),
+        )
+
+    def provider_for(self, url: str) -> str:
+        host = urlparse(str(url)).netloc
+        return self.hosts.get(host, host)
+
+    def _lane(self, provider: str, model: Optional[str]) -> _Lane:
+        key = (provider, model)
+        lane = self._lanes.get(key)
+        if lane is None:
+            limits = dict(self.limits.get(provider) or {})
+            limits.update((limits.pop("models", None) or {}).get(model) or {})
+            lane = _Lane(limits.get("rpm"), limits.get("tpm"))
+            self._lanes[key] = lane
+        return lane
+
+    # ------------------------------------------------------------------
+    # Granting
+    # ------------------------------------------------------------------
+    def submit(self, provider: str, model: Optional[str], tokens: float = 0) -> Future:
+        """Queue a request; the returned future resolves once it may be sent."""
+        future = Future()
+        flow = _current_flow.get()
+        with self._lock:
+            lane = self._lane(provider, model)
+            # Start-time fair queuing: a flow's n-th waiting request sorts after
+            # every other flow's n-th one
+            start = max(lane.flow_clock.get(flow, 0), lane.virtual_time) + 1
+            lane.flow_clock[flow] = start
+            lane.flow_waiting[flow] = lane.flow_waiting.get(flow, 0) + 1
+            entry = (_current_priority.get(), start, next(self._seq), tokens, time.monotonic(), flow, future)
+            heapq.heappush(lane.waiting, entry)
+            self._stats["requests"] += 1
+        self._dispatch(provider, model)
+        return future
+
+    def acquire(self, provider: str, model: Optional[str], tokens: float = 0) -> None:
+        self.submit(provider, model, tokens).result()
+
+    async def aacquire(self, provider: str, model: Optional[str], tokens: float = 0) -> None:
+        await asyncio.wrap_future(self.submit(provider, model, tokens))
+
+    def _dispatch(self, provider: str, model: Optional[str]) -> None:
+        granted = []
+        with self._lock:
+            lane = self._lane(provider, model)
+            while lane.waiting:
+                _, start, _, tokens, queued_at, flow, future = lane.waiting[0]
+                now = time.monotonic()
+                wait = lane.wait_time(tokens, now)
+                if wait > 0:
+                    if lane.timer is not None:
+                        lane.timer.cancel()
+                    lane.timer = threading.Timer(wait, self._dispatch, args=(provider, model))
+                    lane.timer.daemon = True
+                    lane.timer.start()
+                    break
+                heapq.heappop(lane.waiting)
+                lane.flow_waiting[flow] -= 1
+                if not lane.flow_waiting[flow]:
+                    del lane.flow_waiting[flow]
+                    del lane.flow_clock[flow]
+                lane.take(tokens, now)
+                lane.virtual_time = start
+                waited = now - queued_at
+                if waited > 0.001:
+                    self._stats["delayed"] += 1
+                    self._stats["wait_seconds"] += waited
+                granted.append(future)
+        for future in granted:
+            future.set_result(None)
+
+    # ------------------------------------------------------------------
+    # Feedback from responses
+    # ------------------------------------------------------------------
+    def observe(self, provider: str, model: Optional[str], status_code: int, headers) -> None:
+        """Update the lane from a response: back off on 429, sync buckets otherwise."""
+        now = time.monotonic()
+        with self._lock:
+            lane = self._lane(provider, model)
+            if status_code == 429:
+                lane.failures += 1
+                self._stats["rate_limited"] += 1
+                delay = self._retry_delay(headers, lane.failures)
+                lane.blocked_until = max(lane.blocked_until, now + delay)
+                logger.warning(f"Rate limited by {provider} ({model}); pausing {delay:.1f}s")
+                return
+            lane.failures = 0
+            for bucket, name in ((lane.requests, "requests"), (lane.tokens, "tokens")):
+                remaining = headers.get(f"x-ratelimit-remaining-{name}")
+                if bucket is not None and remaining is not None:
+                    try:
+                        bucket.limit_to(float(remaining), now)
+                    except ValueError:
+                        pass
+            if headers.get("x-ratelimit-remaining-requests") == "0":
+                reset = parse_reset(headers.get("x-ratelimit-reset-requests"))
+                if reset:
+                    lane.blocked_until = max(lane.blocked_until, now + min(reset, self.max_backoff))
+
+    def _retry_delay(self, headers, failures: int) -> float:
+        if headers.get("retry-after-ms"):
+            try:
+                return min(self.max_backoff, float(headers["retry-after-ms"]) / 1000)
+            except ValueError:
+                pass
+        for name in ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens", "x-ratelimit-reset"):
+            delay = parse_reset(headers.get(name))
+            if delay is not None:
+                return min(self.max_backoff, delay)
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (failures - 1))
+        return backoff * random.uniform(0.5, 1.0)
+
+    def retried(self) -> None:
+        with self._lock:
+            self._stats["retries"] += 1
+
+    def retry_delay(self, attempts: Dict[str, int], status_code: Optional[int], headers=None) -> Optional[float]:
+        """Seconds to wait before retrying a response (``None`` status: a transport error).
+
+        *attempts* counts the retries of one request by kind; returns ``None``
+        when the response is final or the retries are used up.
+        """
+        if status_code == 429:
+            # observe() already blocked the lane; acquiring again waits it out
+            kind, limit, delay = "rate_limited", self.max_retries, 0.0
+        elif status_code is None or status_code in TRANSIENT_STATUS or status_code >= 500:
+            kind, limit = "transient", self.transient_retries
+            delay = self._retry_delay(headers or {}, attempts.get(kind, 0) + 1)
+        else:
+            return None
+        if attempts.get(kind, 0) >= limit:
+            return None
+        attempts[kind] = attempts.get(kind, 0) + 1
+        self.retried()
+        return delay
+
+    def stats(self) -> Dict[str, float]:
+        """Counters of requests, delayed requests, total wait, 429s and retries."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["waiting"] = sum(len(lane.waiting) for lane in self._lanes.values())
+        return stats
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Return the process-wide :class:`LLMScheduler` configured from ``get_config()``."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler.from_config(get_config())
+        return _scheduler
+
+
+def reset_llm_scheduler() -> None:
+    """Forget the shared scheduler so the next access re-reads the configuration."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = None
+
+
+# ----------------------------------------------------------------------
+# httpx transports
+# ----------------------------------------------------------------------
+def describe_request(request: httpx.Request) -> Tuple[Optional[str], float]:
+    """``(model, estimated tokens)`` of an OpenAI-style JSON request."""
+    try:
+        body = json.loads(request.content or b"{}")
+    except (ValueError, httpx.RequestNotRead):
+        return None, 0
+    if not isinstance(body, dict):
+        return None, 0
+    completion = body.get("max_completion_tokens") or body.get("max_tokens") or 0
+    # Roughly four bytes per prompt token, plus the tokens the answer may use
+    return body.get("model"), len(request.content) / 4 + completion
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """Sync transport sending requests through the shared scheduler."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        scheduler = get_llm_scheduler()
+        provider = scheduler.provider_for(request.url)
+        model, tokens = describe_request(request)
+        attempts: Dict[str, int] = {}
+        while True:
+            scheduler.acquire(provider, model, tokens)
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError as e:
+                delay = scheduler.retry_delay(attempts, None)
+                if delay is None:
+                    raise
+                logger.warning(f"LLM request to {provider} failed ({e!r}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            scheduler.observe(provider, model, response.status_code, response.headers)
+            delay = scheduler.retry_delay(attempts, response.status_code, response.headers)
+            if delay is None:
+                return response
+            response.close()
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """Async transport sending requests through the shared scheduler."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        scheduler = get_llm_scheduler()
+        provider = scheduler.provider_for(request.url)
+        model, tokens = describe_request(request)
+        attempts: Dict[str, int] = {}
+        while True:
+            await scheduler.aacquire(provider, model, tokens)
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                delay = scheduler.retry_delay(attempts, None)
+                if delay is None:
+                    raise
+                logger.warning(f"LLM request to {provider} failed ({e!r}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            scheduler.observe(provider, model, response.status_code, response.headers)
+            delay = scheduler.retry_delay(attempts, response.status_code, response.headers)
+            if delay is None:
+                return response
+            await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,266 @@
+"""
+Columnar, memory-mapped price store for offline market data.
+
+The offline tools used to call ``pd.read_csv`` on the full
+``{symbol}-YFin-data-*.csv`` file for every request and then filter rows by
+string-slicing the ``Date`` column.  This module converts each CSV once into a
+per-symbol directory of ``.npy`` arrays (one array per column plus a sorted
+``datetime64[D]`` date array).  Reads memory-map the arrays and slice the
+requested date range with a binary search, so a call only touches the rows it
+returns.
+
+Layout::
+
+    {store_dir}/{symbol}/meta.json
+    {store_dir}/{symbol}/dates.npy
+    {store_dir}/{symbol}/col_0.npy, col_1.npy, ...
+
+The store is rebuilt automatically when the source CSV changes.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import config as _config_module
+
+logger = logging.getLogger(__name__)
+
+LEGACY_CSV_TEMPLATE = "{symbol}-YFin-data-2015-01-01-2025-03-25.csv"
+STORE_VERSION = 1
+
+
+def _to_day(date_str: Optional[str]) -> Optional[np.datetime64]:
+    """Convert a ``YYYY-mm-dd`` string (or longer timestamp) to ``datetime64[D]``."""
+    if date_str is None:
+        return None
+    return np.datetime64(str(date_str)[:10], "D")
+
+
+class PriceStore:
+    """Date-indexed, per-symbol columnar price store backed by ``.npy`` files."""
+
+    def __init__(self, store_dir: str, source_dir: Optional[str] = None):
+        """
+        Args:
+            store_dir: Directory holding the converted per-symbol arrays.
+            source_dir: Directory with the original ``*.csv`` price files.  When
+                set, missing or stale symbols are converted on first access.
+        """
+        self.store_dir = store_dir
+        self.source_dir = source_dir
+        self._lock = threading.RLock()
+        # symbol -> (meta, dates, {column: array})
+        self._mapped: Dict[str, Tuple[dict, np.ndarray, Dict[str, np.ndarray]]] = {}
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.store_dir, symbol)
+
+    def find_source_csv(self, symbol: str) -> Optional[str]:
+        """Locate the CSV for *symbol* in ``source_dir`` (legacy file name first)."""
+        if not self.source_dir or not os.path.isdir(self.source_dir):
+            return None
+        legacy = os.path.join(self.source_dir, LEGACY_CSV_TEMPLATE.format(symbol=symbol))
+        if os.path.exists(legacy):
+            return legacy
+        for fname in sorted(os.listdir(self.source_dir)):
+            if fname.lower().startswith(symbol.lower()) and fname.lower().endswith(".csv"):
+                return os.path.join(self.source_dir, fname)
+        return None
+
+    def ingest_csv(self, symbol: str, csv_path: str) -> dict:
+        """Convert a YFin-style CSV (``Date`` column plus numeric columns) into the store."""
+        df = pd.read_csv(csv_path)
+        if "Date" not in df.columns:
+            raise ValueError(f"Price file {csv_path} has no 'Date' column.")
+        # Keep the local calendar date, matching the old ``Date.str[:10]`` filtering
+        dates = pd.to_datetime(df["Date"].astype(str).str[:10])
+        frame = df.drop(columns=["Date"])
+        frame.index = pd.DatetimeIndex(dates, name="Date")
+        stat = os.stat(csv_path)
+        return self.ingest_frame(
+            symbol,
+            frame,
+            source={"path": os.path.abspath(csv_path), "mtime": stat.st_mtime, "size": stat.st_size},
+        )
+
+    def ingest_frame(self, symbol: str, frame: pd.DataFrame, source: Optional[dict] = None) -> dict:
+        """Write a DatetimeIndex-ed OHLCV frame for *symbol* into the store."""
+        frame = frame.sort_index(kind="stable")
+        columns: List[str] = []
+        arrays: List[np.ndarray] = []
+        for col in frame.columns:
+            series = frame[col]
+            if not pd.api.types.is_numeric_dtype(series):
+                logger.warning(f"Skipping non-numeric column '{col}' for {symbol} in price store")
+                continue
+            columns.append(str(col))
+            arrays.append(series.to_numpy())
+
+        meta = {
+            "version": STORE_VERSION,
+            "symbol": symbol,
+            "rows": int(len(frame)),
+            "columns": columns,
+            "files": [f"col_{i}.npy" for i in range(len(columns))],
+            "first_date": str(frame.index[0].date()) if len(frame) else None,
+            "last_date": str(frame.index[-1].date()) if len(frame) else None,
+            "source": source,
+        }
+
+        with self._lock:
+            os.makedirs(self.store_dir, exist_ok=True)
+            target = self._symbol_dir(symbol)
+            tmp = f"{target}.tmp-{os.getpid()}-{threading.get_ident()}"
+            if os.path.exists(tmp):
+                shutil.rmtree(tmp)
+            os.makedirs(tmp)
+            np.save(os.path.join(tmp, "dates.npy"), frame.index.values.astype("datetime64[D]"))
+            for fname, arr in zip(meta["files"], arrays):
+                np.save(os.path.join(tmp, fname), arr)
+            with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+            self._mapped.pop(symbol, None)
+            if os.path.exists(target):
+                shutil.rmtree(target)
+            os.replace(tmp, target)
+
+        logger.info(f"Price store: wrote {meta['rows']} rows for {symbol} to {target}")
+        return meta
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def _read_meta(self, symbol: str) -> Optional[dict]:
+        meta_path = os.path.join(self._symbol_dir(symbol), "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _is_stale(self, meta: Optional[dict], csv_path: Optional[str]) -> bool:
+        if meta is None or meta.get("version") != STORE_VERSION:
+            return True
+        if csv_path is None:
+            return False
+        source = meta.get("source") or {}
+        stat = os.stat(csv_path)
+        return source.get("mtime") != stat.st_mtime or source.get("size") != stat.st_size
+
+    def _ensure(self, symbol: str) -> Tuple[dict, np.ndarray, Dict[str, np.ndarray]]:
+        """Return the mapped arrays for *symbol*, converting the source CSV if needed."""
+        with self._lock:
+            mapped = self._mapped.get(symbol)
+            csv_path = self.find_source_csv(symbol)
+            if mapped is not None and not self._is_stale(mapped[0], csv_path):
+                return mapped
+
+            meta = self._read_meta(symbol)
+            if self._is_stale(meta, csv_path):
+                if csv_path is None:
+                    raise FileNotFoundError(
+                        f"Price data for {symbol} not found in store {self.store_dir} or source {self.source_dir}."
+                    )
+                meta = self.ingest_csv(symbol, csv_path)
+
+            symbol_dir = self._symbol_dir(symbol)
+            dates = np.load(os.path.join(symbol_dir, "dates.npy"), mmap_mode="r")
+            columns = {
+                col: np.load(os.path.join(symbol_dir, fname), mmap_mode="r")
+                for col, fname in zip(meta["columns"], meta["files"])
+            }
+            mapped = (meta, dates, columns)
+            self._mapped[symbol] = mapped
+            return mapped
+
+    def has(self, symbol: str) -> bool:
+        """Whether *symbol* can be served (already stored or convertible)."""
+        return self._read_meta(symbol) is not None or self.find_source_csv(symbol) is not None
+
+    def locate(self, symbol: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Tuple[int, int]:
+        """Return the ``[start, stop)`` row positions covering the inclusive date range."""
+        _, dates, _ = self._ensure(symbol)
+        start = 0 if start_date is None else int(np.searchsorted(dates, _to_day(start_date), side="left"))
+        stop = len(dates) if end_date is None else int(np.searchsorted(dates, _to_day(end_date), side="right"))
+        return start, max(start, stop)
+
+    def load(self, symbol: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """Load rows for *symbol* between *start_date* and *end_date* (inclusive).
+
+        Returns:
+            pd.DataFrame: the stored columns indexed by a ``DatetimeIndex`` named ``Date``.
+        """
+        _, dates, columns = self._ensure(symbol)
+        start, stop = self.locate(symbol, start_date, end_date)
+        data = {col: np.array(arr[start:stop]) for col, arr in columns.items()}
+        index = pd.DatetimeIndex(np.array(dates[start:stop]).astype("datetime64[ns]"), name="Date")
+        return pd.DataFrame(data, index=index)
+
+    def load_rows(self, symbol: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """Load rows in the original CSV layout: a ``Date`` string column first and
+        the row positions of the source file as the index."""
+        start, stop = self.locate(symbol, start_date, end_date)
+        df = self.load(symbol, start_date, end_date)
+        df.insert(0, "Date", df.index.strftime("%Y-%m-%d"))
+        df.index = pd.RangeIndex(start, stop)
+        return df
+
+    def trading_dates(self, symbol: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[str]:
+        """Return the stored trading dates in the range as ``YYYY-mm-dd`` strings."""
+        _, dates, _ = self._ensure(symbol)
+        start, stop = self.locate(symbol, start_date, end_date)
+        return [str(d) for d in np.array(dates[start:stop])]
+
+    def ingest_all(self) -> List[str]:
+        """Convert every CSV in ``source_dir``; returns the symbols written."""
+        written = []
+        if not self.source_dir or not os.path.isdir(self.source_dir):
+            return written
+        for fname in sorted(os.listdir(self.source_dir)):
+            if not fname.lower().endswith(".csv"):
+                continue
+            symbol = fname.split("-YFin-data")[0] if "-YFin-data" in fname else os.path.splitext(fname)[0]
+            csv_path = os.path.join(self.source_dir, fname)
+            if self._is_stale(self._read_meta(symbol), csv_path):
+                self.ingest_csv(symbol, csv_path)
+                written.append(symbol)
+        return written
+
+
+_stores: Dict[Tuple[str, Optional[str]], PriceStore] = {}
+_stores_lock = threading.Lock()
+
+
+def default_price_data_dir() -> str:
+    """Directory with the offline YFin CSV files."""
+    return os.path.join(_config_module.get_config()["data_dir"], "market_data", "price_data")
+
+
+def get_price_store(source_dir: Optional[str] = None, store_dir: Optional[str] = None) -> PriceStore:
+    """Return the shared :class:`PriceStore` for *source_dir*.
+
+    By default the store lives next to the CSV directory
+    (``market_data/price_store``) unless ``price_store_dir`` is configured.
+    """
+    source_dir = source_dir or default_price_data_dir()
+    if store_dir is None:
+        store_dir = _config_module.get_config().get("price_store_dir") or os.path.join(
+            os.path.dirname(os.path.normpath(source_dir)), "price_store"
+        )
+    key = (os.path.abspath(store_dir), os.path.abspath(source_dir))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = PriceStore(store_dir, source_dir)
+            _stores[key] = store
+        return store
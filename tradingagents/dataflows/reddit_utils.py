@@ -1,12 +1,23 @@
 import requests
 import time
 import json
+import logging
+import sqlite3
+import threading
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Annotated
+from typing import Annotated, Dict, Iterable, List, Optional, Set, Tuple
+import hashlib
 import os
 import re
 
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+REDDIT_INDEX_FILENAME = "reddit_index.sqlite"
+TICKER_ALIASES_FILENAME = "ticker_aliases.json"
+
 ticker_to_company = {
     "AAPL": "Apple",
     "MSFT": "Microsoft",
@@ -49,6 +60,281 @@ ticker_to_company = {
 }
 
 
+def _split_aliases(value) -> List[str]:
+    """Normalise an alias entry ("A OR B" string or list of names) to a list."""
+    if isinstance(value, str):
+        return value.split(" OR ") if "OR" in value else [value]
+    return [str(v) for v in value]
+
+
+def load_ticker_aliases(data_path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Return ``{ticker: [search terms]}`` for company-news mention tagging.
+
+    The built-in ``ticker_to_company`` table is extended (or overridden per
+    ticker) by ``{data_path}/ticker_aliases.json`` and then by the
+    ``reddit_ticker_aliases`` config entry.  Values may be lists of names or
+    ``"A OR B"`` strings.  The ticker itself is always a search term.
+    """
+    merged: Dict[str, List[str]] = {t: _split_aliases(v) for t, v in ticker_to_company.items()}
+
+    sources = []
+    if data_path:
+        alias_file = os.path.join(data_path, TICKER_ALIASES_FILENAME)
+        if os.path.exists(alias_file):
+            with open(alias_file, "r", encoding="utf-8") as f:
+                sources.append(json.load(f))
+    sources.append(get_config().get("reddit_ticker_aliases") or {})
+
+    for source in sources:
+        for ticker, value in source.items():
+            merged[ticker] = _split_aliases(value)
+
+    return {ticker: terms + [ticker] for ticker, terms in merged.items()}
+
+
+class MentionMatcher:
+    """Find which tickers a text mentions, in one pass over the text.
+
+    All search terms are compiled into a single case-insensitive alternation
+    (longest terms first) wrapped in a lookahead, so the scan reports the
+    longest term starting at every position.  Shorter terms that are a prefix
+    of that term also match there, so each term maps to the tickers of all
+    its prefixes.  Matching is by substring, like the per-term ``re.search``
+    it replaces, but terms are literal text rather than regular expressions.
+    """
+
+    def __init__(self, aliases: Dict[str, Iterable[str]]):
+        term_tickers: Dict[str, Set[str]] = {}
+        for ticker, terms in aliases.items():
+            for term in terms:
+                if term:
+                    term_tickers.setdefault(term.lower(), set()).add(ticker)
+
+        terms = sorted(term_tickers, key=len, reverse=True)
+        self._tickers: Dict[str, Set[str]] = {
+            term: set().union(*(term_tickers[t] for t in term_tickers if term.startswith(t)))
+            for term in terms
+        }
+        self._pattern = (
+            re.compile("(?=(" + "|".join(re.escape(t) for t in terms) + "))", re.IGNORECASE)
+            if terms
+            else None
+        )
+        self.signature = hashlib.md5(
+            json.dumps({t: sorted(v) for t, v in sorted(term_tickers.items())}).encode("utf-8")
+        ).hexdigest()
+
+    def tickers_in(self, *texts: str) -> Set[str]:
+        found: Set[str] = set()
+        if self._pattern is None:
+            return found
+        for text in texts:
+            if not text:
+                continue
+            for match in self._pattern.finditer(text):
+                found |= self._tickers[match.group(1).lower()]
+        return found
+
+
+class RedditIndex:
+    """Per-category, per-day index of the offline Reddit ``.jsonl`` corpus.
+
+    For every post the index stores the file it lives in, its UTC posting day,
+    its byte offset and length in the file and its upvotes.  Lookups for one
+    day then seek straight to the matching lines instead of parsing every
+    file.  Posts in company-news categories are also tagged with the tickers
+    they mention (see :class:`MentionMatcher`).  The index lives in
+    ``{data_path}/reddit_index.sqlite``; a file is re-indexed whenever its
+    size or modification time changes, and company files are re-tagged when
+    the alias table changes.
+    """
+
+    def __init__(self, data_path: str, index_path: str = None, aliases: Dict[str, List[str]] = None):
+        self.data_path = data_path
+        self.index_path = index_path or os.path.join(data_path, REDDIT_INDEX_FILENAME)
+        self.aliases = aliases if aliases is not None else load_ticker_aliases(data_path)
+        self.matcher = MentionMatcher(self.aliases)
+        self._lock = threading.Lock()
+        # (category, file) -> (mtime, size) already verified in this process
+        self._fresh: Dict[Tuple[str, str], Tuple[float, int]] = {}
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    category TEXT NOT NULL,
+                    file TEXT NOT NULL,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    PRIMARY KEY (category, file)
+                );
+                CREATE TABLE IF NOT EXISTS posts (
+                    category TEXT NOT NULL,
+                    file TEXT NOT NULL,
+                    post_date TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    ups INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS idx_posts_day
+                    ON posts (category, post_date, file, offset);
+                CREATE TABLE IF NOT EXISTS mentions (
+                    category TEXT NOT NULL,
+                    file TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    ticker TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_mentions_post
+                    ON mentions (category, file, offset, ticker);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                """
+            )
+            row = conn.execute("SELECT value FROM meta WHERE key = 'alias_signature'").fetchone()
+            if row is None or row[0] != self.matcher.signature:
+                # Mentions were tagged with another alias table; re-tag company files
+                conn.execute("DELETE FROM files WHERE category LIKE '%company%'")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('alias_signature', ?)",
+                    (self.matcher.signature,),
+                )
+
+    @staticmethod
+    def tags_mentions(category: str) -> bool:
+        """Whether posts of *category* are tagged with ticker mentions."""
+        return "company" in category
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.index_path, timeout=30)
+
+    def _index_file(self, conn: sqlite3.Connection, category: str, data_file: str, stat) -> int:
+        rows = []
+        mentions = []
+        tag = self.tags_mentions(category)
+        offset = 0
+        with open(os.path.join(self.data_path, category, data_file), "rb") as f:
+            for line in f:
+                length = len(line)
+                if line.strip():
+                    parsed_line = json.loads(line)
+                    post_date = datetime.utcfromtimestamp(
+                        parsed_line["created_utc"]
+                    ).strftime("%Y-%m-%d")
+                    rows.append(
+                        (category, data_file, post_date, offset, length, parsed_line.get("ups"))
+                    )
+                    if tag:
+                        for ticker in self.matcher.tickers_in(
+                            parsed_line.get("title", ""), parsed_line.get("selftext", "")
+                        ):
+                            mentions.append((category, data_file, offset, ticker))
+                offset += length
+
+        conn.execute("DELETE FROM posts WHERE category = ? AND file = ?", (category, data_file))
+        conn.execute("DELETE FROM mentions WHERE category = ? AND file = ?", (category, data_file))
+        conn.executemany(
+            "INSERT INTO mentions (category, file, offset, ticker) VALUES (?, ?, ?, ?)",
+            mentions,
+        )
+        conn.executemany(
+            "INSERT INTO posts (category, file, post_date, offset, length, ups) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO files (category, file, mtime, size) VALUES (?, ?, ?, ?)",
+            (category, data_file, stat.st_mtime, stat.st_size),
+        )
+        return len(rows)
+
+    def ensure_category(self, category: str) -> None:
+        """(Re)index the ``.jsonl`` files of *category* that are new or changed."""
+        category_dir = os.path.join(self.data_path, category)
+        current = {}
+        for data_file in os.listdir(category_dir):
+            if data_file.endswith(".jsonl"):
+                stat = os.stat(os.path.join(category_dir, data_file))
+                current[data_file] = stat
+
+        if all(
+            self._fresh.get((category, f)) == (st.st_mtime, st.st_size)
+            for f, st in current.items()
+        ):
+            return
+
+        with self._lock, self._connect() as conn:
+            known = {
+                row[0]: (row[1], row[2])
+                for row in conn.execute(
+                    "SELECT file, mtime, size FROM files WHERE category = ?", (category,)
+                )
+            }
+            for data_file, stat in current.items():
+                if known.get(data_file) != (stat.st_mtime, stat.st_size):
+                    count = self._index_file(conn, category, data_file, stat)
+                    logger.info(f"Reddit index: indexed {count} posts from {category}/{data_file}")
+                self._fresh[(category, data_file)] = (stat.st_mtime, stat.st_size)
+            for data_file in set(known) - set(current):
+                conn.execute("DELETE FROM posts WHERE category = ? AND file = ?", (category, data_file))
+                conn.execute("DELETE FROM mentions WHERE category = ? AND file = ?", (category, data_file))
+                conn.execute("DELETE FROM files WHERE category = ? AND file = ?", (category, data_file))
+
+    def ensure_all(self) -> None:
+        """Index every category directory under ``data_path``."""
+        for category in sorted(os.listdir(self.data_path)):
+            if os.path.isdir(os.path.join(self.data_path, category)):
+                self.ensure_category(category)
+
+    def read_day(self, category: str, data_file: str, date: str, ticker: str = None) -> List[dict]:
+        """Return the parsed posts of *data_file* created on *date*, in file order.
+
+        With *ticker*, only posts tagged as mentioning it are returned.
+        """
+        with self._connect() as conn:
+            if ticker is None:
+                spans = conn.execute(
+                    "SELECT offset, length FROM posts WHERE category = ? AND post_date = ? AND file = ? ORDER BY offset",
+                    (category, date, data_file),
+                ).fetchall()
+            else:
+                spans = conn.execute(
+                    "SELECT p.offset, p.length FROM posts p JOIN mentions m "
+                    "ON m.category = p.category AND m.file = p.file AND m.offset = p.offset "
+                    "WHERE p.category = ? AND p.post_date = ? AND p.file = ? AND m.ticker = ? "
+                    "ORDER BY p.offset",
+                    (category, date, data_file, ticker),
+                ).fetchall()
+
+        parsed = []
+        if not spans:
+            return parsed
+        with open(os.path.join(self.data_path, category, data_file), "rb") as f:
+            for offset, length in spans:
+                f.seek(offset)
+                parsed.append(json.loads(f.read(length)))
+        return parsed
+
+
+_indexes: Dict[str, RedditIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_reddit_index(data_path: str) -> RedditIndex:
+    """Return the shared :class:`RedditIndex` for *data_path*."""
+    key = os.path.abspath(data_path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = RedditIndex(data_path)
+            _indexes[key] = index
+        return index
+
+
+def build_reddit_index(data_path: str = "reddit_data") -> None:
+    """One-time ingest step: index all categories of the offline Reddit corpus."""
+    get_reddit_index(data_path).ensure_all()
+
+
 def fetch_top_from_category(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
@@ -74,6 +360,9 @@ def fetch_top_from_category(
         os.listdir(os.path.join(base_path, category))
     )
 
+    index = get_reddit_index(base_path)
+    index.ensure_category(category)
+
     for data_file in os.listdir(os.path.join(base_path, category)):
         # check if data_file is a .jsonl file
         if not data_file.endswith(".jsonl"):
@@ -81,51 +370,32 @@ def fetch_top_from_category(
 
         all_content_curr_subreddit = []
 
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
+        # only the lines posted on the date are read from the file; company
+        # news is narrowed to posts tagged with the queried ticker at ingest
+        if "company" in category and query and query in index.aliases:
+            day_posts = index.read_day(category, data_file, date, ticker=query)
+        else:
+            day_posts = index.read_day(category, data_file, date)
+            if "company" in category and query:
+                # ticker without aliases: fall back to scanning the day's posts
+                day_posts = [
+                    p for p in day_posts
+                    if re.search(re.escape(query), p["title"], re.IGNORECASE)
+                    or re.search(re.escape(query), p["selftext"], re.IGNORECASE)
+                ]
+
+        for parsed_line in day_posts:
+            post_date = date
+
+            post = {
+                "title": parsed_line["title"],
+                "content": parsed_line["selftext"],
+                "url": parsed_line["url"],
+                "upvotes": parsed_line["ups"],
+                "posted_date": post_date,
+            }
+
+            all_content_curr_subreddit.append(post)
 
         # sort all_content_curr_subreddit by upvote_ratio in descending order
         all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
@@ -0,0 +1,304 @@
+"""
+Range-merging cache for daily price bars.
+
+Price fetches are keyed by ``(symbol, start_date, end_date)`` elsewhere, so a
+window shifted by one day is a full miss.  :class:`SegmentPriceCache` instead
+keeps, per ``(namespace, symbol)``, the merged bars it has fetched and the
+date intervals those fetches covered.  A request only fetches the gaps that
+are not covered yet (skipping gaps made of weekend days only), merges them in
+and serves the requested range from the merged frame.
+
+Coverage is never recorded for days from today onwards (intraday bars still
+change) nor for failed fetches.  A fetch that succeeds without rows (a
+holiday) still covers its gap so it is not fetched again; a bare
+``pd.DataFrame()`` without a date index or column is taken as a failure
+sentinel of the source and does not.
+
+Frames are either indexed by date (``DatetimeIndex``) or carry a date column
+(``date``/``Date``/``日期``/``trade_date``).  Other results (e.g. ``None``)
+count as a failed gap; they are only passed through when nothing is cached
+for the requested range.
+"""
+
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import pandas as pd
+
+from . import config as _config_module
+
+logger = logging.getLogger(__name__)
+
+DATE_COLUMNS = ("date", "Date", "日期", "trade_date")
+
+Interval = Tuple[date, date]
+
+# Marks that no gap fetch returned an unmergeable result
+_NOTHING = object()
+
+
+def _parse_day(value: str) -> date:
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+
+def _row_days(df: pd.DataFrame) -> Optional[pd.DatetimeIndex]:
+    """Return the (tz-naive, midnight) trading day of every row, or ``None``."""
+    if isinstance(df.index, pd.DatetimeIndex):
+        days = df.index
+    else:
+        column = next((c for c in DATE_COLUMNS if c in df.columns), None)
+        if column is None:
+            return None
+        days = pd.DatetimeIndex(pd.to_datetime(df[column]))
+    if days.tz is not None:
+        days = days.tz_localize(None)
+    return days.normalize()
+
+
+def _has_weekday(start: date, end: date) -> bool:
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            return True
+        day += timedelta(days=1)
+    return False
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Merge overlapping or adjacent inclusive day intervals."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def find_gaps(start: date, end: date, covered: List[Interval]) -> List[Interval]:
+    """Return the parts of ``[start, end]`` not covered by *covered* (merged, sorted)."""
+    gaps: List[Interval] = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, min(end, c_start - timedelta(days=1))))
+        cursor = max(cursor, c_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class _Segment:
+    """Merged bars and covered intervals for one (namespace, symbol)."""
+
+    def __init__(self):
+        self.frame: Optional[pd.DataFrame] = None
+        self.covered: List[Interval] = []
+        self.lock = threading.Lock()
+
+
+class SegmentPriceCache:
+    """Per-symbol cache of fetched bar ranges that only fetches missing gaps."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_symbols: int = 256):
+        """
+        Args:
+            cache_dir: Directory to persist segments in (one pickle per
+                namespace/symbol); ``None`` keeps them in memory only.
+            max_symbols: Number of segments kept in memory.
+        """
+        self.cache_dir = cache_dir
+        self.max_symbols = max_symbols
+        self._segments: "OrderedDict[Tuple[str, str], _Segment]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "full_hits": 0, "gap_fetches": 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, namespace: str, symbol: str) -> str:
+        return os.path.join(self.cache_dir, f"{quote(namespace, safe='')}__{quote(symbol, safe='')}.pkl")
+
+    def _segment(self, namespace: str, symbol: str) -> _Segment:
+        key = (namespace, symbol)
+        with self._lock:
+            segment = self._segments.get(key)
+            if segment is None:
+                segment = _Segment()
+                if self.cache_dir and os.path.exists(self._path(namespace, symbol)):
+                    try:
+                        with open(self._path(namespace, symbol), "rb") as f:
+                            segment.frame, segment.covered = pickle.load(f)
+                    except Exception as e:
+                        logger.warning(f"Failed to load price segment for {symbol}: {e}")
+                self._segments[key] = segment
+            self._segments.move_to_end(key)
+            while len(self._segments) > self.max_symbols:
+                self._segments.popitem(last=False)
+            return segment
+
+    def _persist(self, namespace: str, symbol: str, segment: _Segment) -> None:
+        if not self.cache_dir:
+            return
+        path = self._path(namespace, symbol)
+        tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump((segment.frame, segment.covered), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"Failed to save price segment for {symbol}: {e}")
+
+    @staticmethod
+    def _slice(frame: pd.DataFrame, start: date, end: date) -> pd.DataFrame:
+        days = _row_days(frame)
+        mask = (days >= pd.Timestamp(start)) & (days <= pd.Timestamp(end))
+        result = frame[mask]
+        if not isinstance(frame.index, pd.DatetimeIndex):
+            result = result.reset_index(drop=True)
+        return result
+
+    @staticmethod
+    def _merge(existing: Optional[pd.DataFrame], new: pd.DataFrame) -> pd.DataFrame:
+        if existing is None or existing.empty:
+            merged = new
+        else:
+            merged = pd.concat([existing, new])
+        days = _row_days(merged)
+        # Newer fetches win for days fetched twice
+        keep = ~pd.Series(days).duplicated(keep="last").to_numpy()
+        merged = merged[keep]
+        order = _row_days(merged).argsort(kind="stable")
+        merged = merged.iloc[order]
+        if not isinstance(merged.index, pd.DatetimeIndex):
+            merged = merged.reset_index(drop=True)
+        return merged
+
+    def get_range(
+        self,
+        namespace: str,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        fetch: Callable[[str, str], Optional[pd.DataFrame]],
+    ):
+        """Return bars of *symbol* in ``[start_date, end_date]``, fetching only the gaps.
+
+        Args:
+            namespace: Separates caches of differently shaped sources.
+            fetch: ``fetch(start_date, end_date)`` loading one inclusive range.
+        """
+        try:
+            start, end = _parse_day(start_date), _parse_day(end_date)
+        except ValueError:
+            # Dates in another format are passed straight through
+            return fetch(start_date, end_date)
+        if end < start:
+            return fetch(start_date, end_date)
+
+        segment = self._segment(namespace, symbol)
+        last_final_day = date.today() - timedelta(days=1)
+
+        with segment.lock:
+            self._stats["requests"] += 1
+            gaps = [g for g in find_gaps(start, end, segment.covered) if _has_weekday(*g)]
+            if not gaps:
+                self._stats["full_hits"] += 1
+
+            changed = False
+            error: Optional[Exception] = None
+            unmergeable = _NOTHING
+            for gap_start, gap_end in gaps:
+                self._stats["gap_fetches"] += 1
+                logger.info(f"Price segment cache: fetching {symbol} {gap_start} to {gap_end} ({namespace})")
+                try:
+                    result = fetch(gap_start.strftime("%Y-%m-%d"), gap_end.strftime("%Y-%m-%d"))
+                except Exception as e:
+                    # A gap with no bars (e.g. a holiday or today before the
+                    # open) can make the source fail; other rows may still serve
+                    logger.warning(f"Price segment cache: fetch for {symbol} {gap_start} to {gap_end} failed: {e}")
+                    error = e
+                    continue
+                if isinstance(result, pd.DataFrame) and result.empty:
+                    if _row_days(result) is not None and gap_start <= last_final_day:
+                        # No bars in the gap (e.g. a holiday): do not ask again
+                        segment.covered = merge_intervals(
+                            segment.covered + [(gap_start, min(gap_end, last_final_day))]
+                        )
+                        changed = True
+                    continue
+                if not isinstance(result, pd.DataFrame) or _row_days(result) is None:
+                    # Not a date-indexed frame (e.g. None when the source has no
+                    # data yet): nothing to merge, the cached rows still serve
+                    logger.warning(
+                        f"Price segment cache: fetch for {symbol} {gap_start} to {gap_end} "
+                        f"returned no date-indexed frame ({type(result).__name__})"
+                    )
+                    if unmergeable is _NOTHING:
+                        unmergeable = result
+                    continue
+                segment.frame = self._merge(segment.frame, result)
+                if gap_start <= last_final_day:
+                    segment.covered = merge_intervals(
+                        segment.covered + [(gap_start, min(gap_end, last_final_day))]
+                    )
+                changed = True
+
+            if changed:
+                self._persist(namespace, symbol, segment)
+            result = pd.DataFrame() if segment.frame is None else self._slice(segment.frame, start, end)
+            if result.empty:
+                # Nothing cached for the range: answer as the source did
+                if unmergeable is not _NOTHING:
+                    return unmergeable
+                if error is not None:
+                    raise error
+            return result
+
+    def coverage(self, namespace: str, symbol: str) -> List[Tuple[str, str]]:
+        """Covered date intervals of a segment as ``YYYY-mm-dd`` pairs."""
+        segment = self._segment(namespace, symbol)
+        return [(s.strftime("%Y-%m-%d"), e.strftime("%Y-%m-%d")) for s, e in segment.covered]
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, segments=len(self._segments))
+
+    def clear(self) -> None:
+        """Drop the in-memory segments (persisted files are kept)."""
+        with self._lock:
+            self._segments.clear()
+
+
+_cache: Optional[SegmentPriceCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_segment_cache() -> SegmentPriceCache:
+    """Return the process-wide :class:`SegmentPriceCache` configured from ``get_config()``."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = _config_module.get_config()
+            _cache = SegmentPriceCache(
+                cache_dir=config.get("price_segment_cache_dir"),
+                max_symbols=int(config.get("price_segment_cache_symbols", 256)),
+            )
+        return _cache
+
+
+def reset_segment_cache() -> None:
+    """Forget the shared cache so the next access re-reads the configuration."""
+    global _cache
+    with _cache_lock:
+        _cache = None
@@ -0,0 +1,260 @@
+"""
+Point-in-time store for the offline SimFin fundamentals.
+
+The SimFin bulk files (``us-balance-{freq}.csv`` etc.) cover every US company.
+Reading one of them and parsing its date columns on every tool call is the
+dominant cost of the fundamentals tools.  This module converts each bulk file
+once into per-ticker pickle partitions sorted by ``Publish Date``; an as-of
+lookup then reads one small partition and binary-searches it.
+
+Layout::
+
+    {store_dir}/{statement}/{freq}/meta.json
+    {store_dir}/{statement}/{freq}/{ticker}.pkl
+
+Partitions keep the dtypes and row labels of the full file, so the rows they
+return print exactly like the rows selected from the bulk CSV.  A statement is
+re-converted automatically when its source CSV changes.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import quote
+
+import pandas as pd
+
+from . import config as _config_module
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+
+# statement -> (directory under simfin_data_all, bulk file prefix)
+STATEMENTS: Dict[str, Tuple[str, str]] = {
+    "balance_sheet": ("balance_sheet", "us-balance"),
+    "cash_flow": ("cash_flow", "us-cashflow"),
+    "income_statements": ("income_statements", "us-income"),
+}
+
+
+def _partition_name(ticker: str) -> str:
+    return quote(str(ticker), safe="") + ".pkl"
+
+
+class SimFinStore:
+    """Per-ticker, publish-date-sorted partitions of the SimFin bulk files."""
+
+    def __init__(self, data_dir: str, store_dir: Optional[str] = None, max_partitions: int = 512):
+        """
+        Args:
+            data_dir: The project data directory containing ``fundamental_data``.
+            store_dir: Where partitions are written; defaults to
+                ``{data_dir}/fundamental_data/simfin_store``.
+            max_partitions: Number of loaded partitions kept in memory.
+        """
+        self.data_dir = data_dir
+        self.store_dir = store_dir or os.path.join(data_dir, "fundamental_data", "simfin_store")
+        self.max_partitions = max_partitions
+        self._lock = threading.RLock()
+        self._checked: Dict[Tuple[str, str], dict] = {}
+        self._partitions: "OrderedDict[Tuple[str, str, str], Optional[pd.DataFrame]]" = OrderedDict()
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+    def source_path(self, statement: str, freq: str) -> str:
+        directory, prefix = STATEMENTS[statement]
+        return os.path.join(
+            self.data_dir,
+            "fundamental_data",
+            "simfin_data_all",
+            directory,
+            "companies",
+            "us",
+            f"{prefix}-{freq}.csv",
+        )
+
+    def _statement_dir(self, statement: str, freq: str) -> str:
+        return os.path.join(self.store_dir, statement, freq)
+
+    def convert(self, statement: str, freq: str) -> dict:
+        """Partition the bulk CSV of *statement*/*freq* by ticker."""
+        csv_path = self.source_path(statement, freq)
+        df = pd.read_csv(csv_path, sep=";")
+
+        # Convert date strings to datetime objects and remove any time components
+        df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+        df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+        stat = os.stat(csv_path)
+        target = self._statement_dir(statement, freq)
+        tmp = f"{target}.tmp-{os.getpid()}-{threading.get_ident()}"
+        if os.path.exists(tmp):
+            shutil.rmtree(tmp)
+        os.makedirs(tmp)
+
+        tickers = 0
+        for ticker, part in df.groupby("Ticker", sort=False):
+            part = part.sort_values("Publish Date", kind="stable")
+            part.to_pickle(os.path.join(tmp, _partition_name(ticker)))
+            tickers += 1
+
+        meta = {
+            "version": STORE_VERSION,
+            "rows": int(len(df)),
+            "tickers": tickers,
+            "source": {"path": os.path.abspath(csv_path), "mtime": stat.st_mtime, "size": stat.st_size},
+        }
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        with self._lock:
+            if os.path.exists(target):
+                shutil.rmtree(target)
+            os.replace(tmp, target)
+            for key in [k for k in self._partitions if k[:2] == (statement, freq)]:
+                del self._partitions[key]
+            self._checked[(statement, freq)] = meta
+
+        logger.info(f"SimFin store: partitioned {meta['rows']} rows of {statement}/{freq} into {tickers} tickers")
+        return meta
+
+    def _ensure(self, statement: str, freq: str) -> None:
+        """Convert *statement*/*freq* if it is missing or its source changed."""
+        with self._lock:
+            csv_path = self.source_path(statement, freq)
+            meta = self._checked.get((statement, freq))
+            if meta is None:
+                meta_path = os.path.join(self._statement_dir(statement, freq), "meta.json")
+                if os.path.exists(meta_path):
+                    with open(meta_path, "r", encoding="utf-8") as f:
+                        meta = json.load(f)
+
+            if meta is not None and meta.get("version") == STORE_VERSION:
+                if not os.path.exists(csv_path):
+                    self._checked[(statement, freq)] = meta
+                    return
+                stat = os.stat(csv_path)
+                source = meta.get("source") or {}
+                if source.get("mtime") == stat.st_mtime and source.get("size") == stat.st_size:
+                    self._checked[(statement, freq)] = meta
+                    return
+
+            self.convert(statement, freq)
+
+    def convert_all(self, freqs: Iterable[str] = ("annual", "quarterly")) -> None:
+        """One-time conversion of every statement type with a bulk file on disk."""
+        for statement in STATEMENTS:
+            for freq in freqs:
+                if os.path.exists(self.source_path(statement, freq)):
+                    self._ensure(statement, freq)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def load_ticker(self, statement: str, freq: str, ticker: str) -> Optional[pd.DataFrame]:
+        """Return all rows of *ticker* sorted by ``Publish Date`` (``None`` if absent)."""
+        self._ensure(statement, freq)
+        key = (statement, freq, ticker)
+        with self._lock:
+            if key in self._partitions:
+                self._partitions.move_to_end(key)
+                return self._partitions[key]
+
+        path = os.path.join(self._statement_dir(statement, freq), _partition_name(ticker))
+        part = pd.read_pickle(path) if os.path.exists(path) else None
+
+        with self._lock:
+            self._partitions[key] = part
+            while len(self._partitions) > self.max_partitions:
+                self._partitions.popitem(last=False)
+        return part
+
+    def as_of(self, statement: str, freq: str, ticker: str, curr_date: str) -> Optional[pd.Series]:
+        """Latest statement of *ticker* published on or before *curr_date*.
+
+        Among statements published on the same day the first one in the bulk
+        file wins, as with ``idxmax`` on the unpartitioned data.
+        """
+        part = self.load_ticker(statement, freq, ticker)
+        if part is None or part.empty:
+            return None
+
+        curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+        publish = part["Publish Date"]
+        pos = int(publish.searchsorted(curr_date_dt, side="right")) - 1
+        if pos < 0:
+            return None
+        first = int(publish.searchsorted(publish.iloc[pos], side="left"))
+        return part.iloc[first]
+
+    def as_of_batch(self, statement: str, freq: str, requests: pd.DataFrame) -> pd.DataFrame:
+        """Vectorized as-of lookup for many ``(Ticker, Date)`` pairs.
+
+        Args:
+            requests: A frame with ``Ticker`` and ``Date`` columns.
+
+        Returns:
+            pd.DataFrame: one row per request in the original order, with the
+            request columns followed by the matching statement columns (all
+            missing when nothing was published on or before the date).
+        """
+        requests = requests.reset_index(drop=True)
+        parts = [
+            self.load_ticker(statement, freq, ticker)
+            for ticker in requests["Ticker"].dropna().unique()
+        ]
+        parts = [p for p in parts if p is not None and not p.empty]
+
+        left = requests.assign(
+            _order=range(len(requests)),
+            _as_of=pd.to_datetime(requests["Date"], utc=True).dt.normalize(),
+        ).sort_values("_as_of", kind="stable")
+
+        if not parts:
+            result = left.sort_values("_order")
+            return result.drop(columns=["_order", "_as_of"]).reset_index(drop=True)
+
+        right = (
+            pd.concat(parts)
+            .drop_duplicates(subset=["Ticker", "Publish Date"], keep="first")
+            .sort_values("Publish Date", kind="stable")
+            .rename(columns={"Ticker": "_ticker"})
+        )
+        merged = pd.merge_asof(
+            left,
+            right,
+            left_on="_as_of",
+            right_on="Publish Date",
+            left_by="Ticker",
+            right_by="_ticker",
+            direction="backward",
+        )
+        merged = merged.sort_values("_order").drop(columns=["_order", "_as_of", "_ticker"])
+        return merged.reset_index(drop=True)
+
+
+_stores: Dict[Tuple[str, str], SimFinStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_simfin_store(data_dir: Optional[str] = None) -> SimFinStore:
+    """Return the shared :class:`SimFinStore` for *data_dir*.
+
+    The partitions are written to ``simfin_store_dir`` when configured.
+    """
+    config = _config_module.get_config()
+    data_dir = data_dir or config["data_dir"]
+    store_dir = config.get("simfin_store_dir") or os.path.join(data_dir, "fundamental_data", "simfin_store")
+    key = (os.path.abspath(data_dir), os.path.abspath(store_dir))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = SimFinStore(data_dir, store_dir)
+            _stores[key] = store
+        return store
@@ -0,0 +1,276 @@
+"""
+Shared health scoreboard and circuit breakers for the market data sources.
+
+Every fetch from a source (akshare, yfin, finnhub, jqdata, tushare, alltick,
+googlenews, reddit, ...) records its latency and whether it produced data.
+Outcomes are kept over a sliding window per source.  When the failure rate in
+the window reaches the threshold the source's breaker *opens* and the source
+is skipped.  After a cool-down one *half-open* probe call is let through; if it
+succeeds the breaker closes again, otherwise it re-opens.
+
+:meth:`SourceHealthRegistry.order` applies this to a priority list without
+changing any breaker: sources with an open breaker are dropped and the rest
+are ordered by observed mean latency, with sources that have no successful
+call yet after the measured ones in their configured order.  The probe is
+only claimed when a call wrapped by :meth:`SourceHealthRegistry.track`
+actually runs, so ordering a list does not use up the probe of a source that
+is never called.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .config import get_config
+from .hedged_fetch import has_rows
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised by a tracked call refused because another probe of the source is in flight."""
+
+
+class _SourceHealth:
+    def __init__(self, window: int):
+        # (timestamp, ok, latency seconds)
+        self.calls: Deque[Tuple[float, bool, float]] = deque(maxlen=window)
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.probe_started: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.total_calls = 0
+        self.total_failures = 0
+
+
+class SourceHealthRegistry:
+    """Sliding-window health statistics and circuit breaker per data source."""
+
+    def __init__(
+        self,
+        window: int = 50,
+        failure_threshold: float = 0.5,
+        min_calls: int = 5,
+        open_seconds: float = 60.0,
+    ):
+        """
+        Args:
+            window: Number of recent calls kept per source.
+            failure_threshold: Failure rate in the window that opens the breaker.
+            min_calls: Calls needed in the window before the breaker can open.
+            open_seconds: Cool-down before a half-open probe is allowed.
+        """
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self._sources: Dict[str, _SourceHealth] = {}
+        self._lock = threading.Lock()
+
+    def _health(self, source: str) -> _SourceHealth:
+        health = self._sources.get(source)
+        if health is None:
+            health = _SourceHealth(self.window)
+            self._sources[source] = health
+        return health
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def record(self, source: str, ok: bool, latency: float, error: Optional[str] = None) -> None:
+        """Record the outcome of one call to *source*."""
+        now = time.time()
+        with self._lock:
+            health = self._health(source)
+            health.calls.append((now, ok, latency))
+            health.total_calls += 1
+            if not ok:
+                health.total_failures += 1
+                health.last_error = error
+
+            if health.state == HALF_OPEN:
+                health.probe_started = None
+                if ok:
+                    health.state = CLOSED
+                    health.opened_at = None
+                    # Start the window afresh so old failures do not re-open it
+                    health.calls.clear()
+                    health.calls.append((now, ok, latency))
+                    logger.info(f"Source health: {source} recovered, breaker closed")
+                else:
+                    health.state = OPEN
+                    health.opened_at = now
+                    logger.warning(f"Source health: {source} probe failed, breaker re-opened")
+            elif health.state == CLOSED and not ok:
+                failures = sum(1 for _, call_ok, _ in health.calls if not call_ok)
+                if len(health.calls) >= self.min_calls and failures / len(health.calls) >= self.failure_threshold:
+                    health.state = OPEN
+                    health.opened_at = now
+                    logger.warning(
+                        f"Source health: opening breaker for {source} "
+                        f"({failures}/{len(health.calls)} recent calls failed)"
+                    )
+
+    def track(
+        self,
+        source: str,
+        func: Callable[[], Any],
+        is_valid: Callable[[Any], bool] = has_rows,
+    ) -> Callable[[], Any]:
+        """Wrap *func* so each call records its latency and outcome for *source*.
+
+        A call fails when it raises or returns a result *is_valid* rejects; the
+        default is the check ``hedged_fetch`` uses, so both agree on a result.
+        """
+
+        def tracked():
+            if not self._claim(source):
+                raise CircuitOpenError(f"{source}: breaker half-open, probe already in flight")
+            started = time.monotonic()
+            try:
+                result = func()
+            except Exception as e:
+                self.record(source, False, time.monotonic() - started, str(e))
+                raise
+            try:
+                ok = is_valid(result)
+            except Exception:
+                ok = False
+            self.record(source, ok, time.monotonic() - started, None if ok else "no data returned")
+            return result
+
+        return tracked
+
+    # ------------------------------------------------------------------
+    # Decisions
+    # ------------------------------------------------------------------
+    def _available(self, health: Optional[_SourceHealth], now: float) -> bool:
+        if health is None or health.state == CLOSED:
+            return True
+        if health.state == OPEN:
+            return now - health.opened_at >= self.open_seconds
+        # Half-open: one probe at a time, but do not wait forever on a lost probe
+        return health.probe_started is None or now - health.probe_started >= self.open_seconds
+
+    def allow(self, source: str) -> bool:
+        """Whether *source* may be called now (read-only, claims no probe)."""
+        with self._lock:
+            return self._available(self._sources.get(source), time.time())
+
+    def _claim(self, source: str) -> bool:
+        """Claim a call to *source* as it starts, taking the half-open probe if due."""
+        now = time.time()
+        with self._lock:
+            health = self._sources.get(source)
+            if health is None or health.state == CLOSED:
+                return True
+            if not self._available(health, now):
+                # Still cooling down: only reached when every source was open
+                # and the caller makes a last attempt; the breaker is unchanged
+                return health.state == OPEN
+            if health.state == OPEN:
+                health.state = HALF_OPEN
+                logger.info(f"Source health: probing {source} (half-open)")
+            health.probe_started = now
+            return True
+
+    def _mean_latency(self, source: str) -> float:
+        health = self._sources.get(source)
+        latencies = [lat for _, ok, lat in health.calls if ok] if health else []
+        return sum(latencies) / len(latencies) if latencies else float("inf")
+
+    def order(self, sources: Sequence[str]) -> List[str]:
+        """Drop sources with an open breaker and order the rest by mean latency.
+
+        Sources without a successful call yet sort after measured ones (in
+        their configured order).  If every breaker is open the configured
+        order is returned unchanged, so callers still get a last attempt.
+        """
+        now = time.time()
+        with self._lock:
+            allowed = [s for s in sources if self._available(self._sources.get(s), now)]
+            if not allowed:
+                return list(sources)
+            return sorted(allowed, key=self._mean_latency)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def status(self, source: str) -> Optional[str]:
+        """``available``/``degraded``/``circuit_open`` from recorded calls, ``None`` if unseen."""
+        with self._lock:
+            health = self._sources.get(source)
+            if health is None or not health.calls:
+                return None
+            if health.state != CLOSED:
+                return "circuit_open" if health.state == OPEN else "half_open"
+            ok = sum(1 for _, call_ok, _ in health.calls if call_ok)
+            return "available" if ok / len(health.calls) >= 0.8 else "degraded"
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-source statistics for reports and dashboards."""
+        result = {}
+        with self._lock:
+            sources = list(self._sources)
+        for source in sorted(sources):
+            with self._lock:
+                health = self._sources[source]
+                calls = list(health.calls)
+                state = health.state
+                opened_at = health.opened_at
+                last_error = health.last_error
+                totals = (health.total_calls, health.total_failures)
+            ok_latencies = [lat for _, ok, lat in calls if ok]
+            result[source] = {
+                "state": state,
+                "status": self.status(source),
+                "window_calls": len(calls),
+                "success_rate": (sum(1 for _, ok, _ in calls if ok) / len(calls)) if calls else None,
+                "avg_latency": (sum(ok_latencies) / len(ok_latencies)) if ok_latencies else None,
+                "last_call": calls[-1][0] if calls else None,
+                "opened_at": opened_at,
+                "last_error": last_error,
+                "total_calls": totals[0],
+                "total_failures": totals[1],
+            }
+        return result
+
+    def reset(self, source: Optional[str] = None) -> None:
+        """Forget statistics for *source* (or all sources)."""
+        with self._lock:
+            if source is None:
+                self._sources.clear()
+            else:
+                self._sources.pop(source, None)
+
+
+_registry: Optional[SourceHealthRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_health_registry() -> SourceHealthRegistry:
+    """Return the process-wide :class:`SourceHealthRegistry` configured from ``get_config()``."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            settings = get_config().get("source_health", {}) or {}
+            _registry = SourceHealthRegistry(
+                window=int(settings.get("window", 50)),
+                failure_threshold=float(settings.get("failure_threshold", 0.5)),
+                min_calls=int(settings.get("min_calls", 5)),
+                open_seconds=float(settings.get("open_seconds", 60.0)),
+            )
+        return _registry
+
+
+def reset_health_registry() -> None:
+    """Forget the shared registry so the next access re-reads the configuration."""
+    global _registry
+    with _registry_lock:
+        _registry = None
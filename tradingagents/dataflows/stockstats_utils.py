@@ -5,6 +5,9 @@ import yfinance as yf
 from stockstats import StockDataFrame
 from typing import Optional, Union
 
+from .indicator_cache import get_indicator_cache, price_fingerprint
+from .price_store import get_price_store
+
 def get_stock_indicators(symbol: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
     """
     Get technical indicators for a stock using yfinance and stock-pandas.
@@ -84,18 +87,18 @@ class StockstatsUtils:
         return df
 
     @staticmethod
-    def _read_cached_price_data(symbol: str, data_dir: str) -> pd.DataFrame:
-        """Read cached CSV price data created by the project (offline mode)."""
-        for fname in os.listdir(data_dir):
-            if fname.lower().startswith(symbol.lower()) and fname.lower().endswith(".csv"):
-                df = pd.read_csv(os.path.join(data_dir, fname))
-                # Ensure a proper datetime index for StockStats
-                if "Date" in df.columns:
-                    df["Date"] = pd.to_datetime(df["Date"])
-                    df = df.set_index("Date")
-                df.columns = [c.lower() for c in df.columns]
-                return df
-        raise FileNotFoundError(f"Cached price data for {symbol} not found in {data_dir}.")
+    def _read_cached_price_data(symbol: str, data_dir: str, end_date: str | None = None) -> pd.DataFrame:
+        """Read cached price data created by the project (offline mode).
+
+        Rows come from the columnar price store built from the CSV files in
+        *data_dir*; only rows up to *end_date* (inclusive) are loaded.
+        """
+        store = get_price_store(source_dir=data_dir)
+        if not store.has(symbol):
+            raise FileNotFoundError(f"Cached price data for {symbol} not found in {data_dir}.")
+        df = store.load(symbol, end_date=end_date)
+        df.columns = [c.lower() for c in df.columns]
+        return df
 
     @staticmethod
     def _to_stockstats(df: pd.DataFrame) -> StockDataFrame:
@@ -103,6 +106,47 @@ class StockstatsUtils:
         df.index = pd.to_datetime(df.index)
         return StockDataFrame.retype(df)
 
+    @staticmethod
+    def _load_price_data(
+        symbol: str,
+        end_date: str,
+        data_dir: str,
+        online: bool,
+        lookback_days: int | None = None,
+    ) -> pd.DataFrame:
+        """Load the price history ending at *end_date* from Yahoo Finance or the offline store."""
+        if online:
+            return StockstatsUtils._download_price_data(symbol, end_date, lookback_days)
+
+        # Only historical dates up to *end_date* are read from the store
+        price_df = StockstatsUtils._read_cached_price_data(symbol, data_dir, end_date=end_date)
+        if price_df.empty:
+            raise ValueError(f"Offline data for {symbol} does not cover {end_date}.")
+        return price_df
+
+    @staticmethod
+    def _compute_indicator(price_df: pd.DataFrame, indicator: str, symbol: str | None = None) -> pd.Series:
+        """Compute the full *indicator* series for a price history.
+
+        When *symbol* is given the result is looked up in (and stored to) the
+        shared indicator cache, keyed by a fingerprint of *price_df*.
+        """
+        if symbol is None:
+            return StockstatsUtils._to_stockstats(price_df)[indicator]
+
+        cache = get_indicator_cache()
+        fingerprint = price_fingerprint(price_df)
+        series = cache.get(symbol, fingerprint, indicator)
+        if series is None:
+            series = StockstatsUtils._to_stockstats(price_df)[indicator].copy()
+            cache.put(symbol, fingerprint, indicator, series)
+        return series
+
+    @staticmethod
+    def cache_stats() -> dict:
+        """Hit/miss counters of the shared indicator cache."""
+        return get_indicator_cache().stats()
+
     @staticmethod
     def get_stock_stats(
         symbol: str,
@@ -117,31 +161,46 @@ class StockstatsUtils:
         running offline we expect to find a cached CSV in *data_dir* (the path
         is controlled by `dataflows.config.DATA_DIR`).
         """
-        # Acquire price data
-        if online:
-            price_df = StockstatsUtils._download_price_data(symbol, date_str)
-        else:
-            price_df = StockstatsUtils._read_cached_price_data(symbol, data_dir)
-            # Trim to historical dates up to *date_str*
-            max_date = datetime.strptime(date_str, "%Y-%m-%d")
-            price_df = price_df[price_df.index <= max_date]
-            if price_df.empty:
-                raise ValueError(f"Offline data for {symbol} does not cover {date_str}.")
-
-        # Compute indicators via stockstats
-        ss_df = StockstatsUtils._to_stockstats(price_df)
-        # Trigger calculation if not yet present
-        _ = ss_df[indicator]
+        price_df = StockstatsUtils._load_price_data(symbol, date_str, data_dir, online)
+        indicator_series = StockstatsUtils._compute_indicator(price_df, indicator, symbol)
 
         # Safely extract value at (or before) date_str
         target_date = datetime.strptime(date_str, "%Y-%m-%d")
-        if target_date in ss_df.index:
-            value = ss_df.loc[target_date, indicator]
+        if target_date in indicator_series.index:
+            value = indicator_series.loc[target_date]
         else:
             # fallback: the last available value before the date
-            value_series = ss_df[indicator][ss_df.index <= target_date]
+            value_series = indicator_series[indicator_series.index <= target_date]
             if value_series.empty:
                 raise ValueError(f"Indicator {indicator} unavailable for {symbol} on {date_str}.")
             value = value_series.iloc[-1]
 
         return value.item() if hasattr(value, "item") else value
+
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: str,
+        indicator: str,
+        start_date: str,
+        end_date: str,
+        data_dir: str,
+        online: bool = True,
+    ) -> pd.Series:
+        """Return the *indicator* series for *symbol* between *start_date* and *end_date*.
+
+        The price history is loaded once (with the usual warm-up lookback before
+        *start_date*) and the indicator is computed once for the whole window.
+        The result also keeps the last bar before *start_date*, if any, so
+        callers can carry values forward over non-trading days at the start of
+        the window.
+        """
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+        lookback_days = StockstatsUtils._DEFAULT_LOOKBACK_DAYS + (end_dt - start_dt).days
+
+        price_df = StockstatsUtils._load_price_data(symbol, end_date, data_dir, online, lookback_days)
+        indicator_series = StockstatsUtils._compute_indicator(price_df, indicator, symbol)
+        indicator_series = indicator_series[indicator_series.index <= end_dt]
+
+        first = max(int(indicator_series.index.searchsorted(start_dt, side="left")) - 1, 0)
+        return indicator_series.iloc[first:]
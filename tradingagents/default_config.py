@@ -12,6 +12,47 @@ DEFAULT_CONFIG = {
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "dataflows/data_cache",
     ),
+    # Per-data-type TTLs in seconds for the enhanced data cache (None = never
+    # expires); see dataflows/data_cache.py for the defaults
+    "data_cache_ttls": {
+        "stock_data_historical": None,
+        "stock_data": 6 * 3600,
+        "news": 30 * 60,
+        "company_info": 3 * 24 * 3600,
+        "social_sentiment": 4 * 3600,
+    },
+    "data_cache_max_bytes": int(os.getenv("DATA_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+    "data_cache_memory_entries": 128,
+    # Columnar price store built from the offline YFin CSVs
+    # (defaults to {data_dir}/market_data/price_store)
+    "price_store_dir": os.getenv("PRICE_STORE_DIR"),
+    # Range-merging cache for fetched daily bars (memory only unless a
+    # directory is set)
+    "price_segment_cache_dir": os.getenv("PRICE_SEGMENT_CACHE_DIR"),
+    "price_segment_cache_symbols": 256,
+    # Multi-source fetching: "hedged" starts the next source when the current
+    # one is slower than hedge_delay_seconds, "sequential" only after it fails;
+    # every fetch gives up after fetch_deadline_seconds
+    "data_fetch_mode": os.getenv("DATA_FETCH_MODE", "hedged"),
+    "hedge_delay_seconds": float(os.getenv("HEDGE_DELAY_SECONDS", "2.0")),
+    "fetch_deadline_seconds": float(os.getenv("FETCH_DEADLINE_SECONDS", "60")),
+    "fetch_max_workers": 16,
+    # Threads for blocking data-source calls made from the async graph API
+    "blocking_io_workers": int(os.getenv("BLOCKING_IO_WORKERS", "16")),
+    # Data source circuit breakers: a source is skipped for open_seconds once
+    # failure_threshold of its last `window` calls failed (after min_calls)
+    "source_health": {"window": 50, "failure_threshold": 0.5, "min_calls": 5, "open_seconds": 60.0},
+    # Per-ticker SimFin fundamentals partitions
+    # (defaults to {data_dir}/fundamental_data/simfin_store)
+    "simfin_store_dir": os.getenv("SIMFIN_STORE_DIR"),
+    # Offline Finnhub JSON files: number of parsed files kept in memory, or a
+    # SQLite file to convert them into instead
+    "finnhub_cache_files": int(os.getenv("FINNHUB_CACHE_FILES", "64")),
+    "finnhub_sqlite_path": os.getenv("FINNHUB_SQLITE_PATH"),
+    # Computed technical indicator cache (memory LRU size; disk tier is
+    # enabled when a directory is set)
+    "indicator_cache_size": int(os.getenv("INDICATOR_CACHE_SIZE", "256")),
+    "indicator_cache_dir": os.getenv("INDICATOR_CACHE_DIR"),
     # =============================================================================
     # LLM Provider Configuration
     # =============================================================================
@@ -39,6 +80,21 @@ DEFAULT_CONFIG = {
         "google": "https://generativelanguage.googleapis.com/v1beta",
         "zhipuai": "https://open.bigmodel.cn/api/paas/v4"
     },
+    # Rate limits per provider (requests/tokens per minute, None = unlimited),
+    # applied to each model separately; per-model overrides go under "models",
+    # e.g. "groq": {"rpm": 30, "models": {"gemma2-9b-it": {"tpm": 15000}}}
+    "rate_limits": {
+        "openrouter": {"rpm": 20, "tpm": None},
+        "groq": {"rpm": 30, "tpm": 6000},
+        "together": {"rpm": 60, "tpm": None},
+        "zhipuai": {"rpm": 30, "tpm": None},
+    },
+    # Retries of a request answered with HTTP 429, and the longest pause between them
+    "rate_limit_max_retries": int(os.getenv("RATE_LIMIT_MAX_RETRIES", "5")),
+    "rate_limit_max_backoff": float(os.getenv("RATE_LIMIT_MAX_BACKOFF", "60")),
+    # Retries of an LLM request failing transiently (408, 409, 5xx, timeouts,
+    # dropped connections); the SDK clients' own retries are turned off
+    "llm_transient_retries": int(os.getenv("LLM_TRANSIENT_RETRIES", "2")),
 
     # =============================================================================
     # Model Options by Provider
@@ -120,6 +176,31 @@ DEFAULT_CONFIG = {
     "embedding_provider": os.getenv("EMBEDDING_PROVIDER", "ollama"),
     "embedding_model": os.getenv("EMBEDDING_MODEL", "nomic-embed-text:latest"),
     "ollama_base_url": os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+    # Embedding cache shared by the agent memories (memory LRU size; disk
+    # tier is off unless a directory is set)
+    "embedding_cache_size": int(os.getenv("EMBEDDING_CACHE_SIZE", "1024")),
+    "embedding_cache_dir": os.getenv("EMBEDDING_CACHE_DIR"),
+    # Agent memories persist under memory_dir (in-process only when unset);
+    # HNSW index parameters of their collections
+    "memory_dir": os.getenv("MEMORY_DIR"),
+    "memory_hnsw": {
+        "space": "l2",
+        "ef_construction": 100,
+        "ef_search": 100,
+        "max_neighbors": 16,
+    },
+
+    # LLM response cache: "read_through", "record", "replay" or unset (off);
+    # defaults to llm_cache.sqlite under data_cache_dir
+    "llm_cache_mode": os.getenv("LLM_CACHE_MODE"),
+    "llm_cache_path": os.getenv("LLM_CACHE_PATH"),
+
+    # Connection pool shared by all LLM and embedding clients in the process
+    # (HTTP/2 is used only when the h2 package is installed)
+    "llm_http_max_connections": int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+    "llm_http_max_keepalive": int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20")),
+    "llm_http_keepalive_expiry": float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")),
+    "llm_http2": os.getenv("LLM_HTTP2", "true").lower() == "true",
 
     # =============================================================================
     # Application Settings
@@ -127,6 +208,19 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": int(os.getenv("MAX_DEBATE_ROUNDS", "1")),
     "max_risk_discuss_rounds": int(os.getenv("MAX_RISK_DISCUSS_ROUNDS", "1")),
     "max_recur_limit": int(os.getenv("MAX_RECUR_LIMIT", "100")),
+    # Debate prompts: estimated tokens for reports + debate, turns kept
+    # verbatim (older ones are folded into a rolling summary), summary length
+    "debate_token_budget": int(os.getenv("DEBATE_TOKEN_BUDGET", "16000")),
+    "debate_recent_turns": int(os.getenv("DEBATE_RECENT_TURNS", "3")),
+    "debate_summary_tokens": int(os.getenv("DEBATE_SUMMARY_TOKENS", "800")),
+    # Jobs running at the same time in TradingAgentsGraph.propagate_many
+    "batch_max_concurrency": int(os.getenv("BATCH_MAX_CONCURRENCY", "4")),
+    # Concurrent LLM calls when reflecting on a decision (one per memory)
+    "reflection_max_workers": int(os.getenv("REFLECTION_MAX_WORKERS", "5")),
+    # Decisions extracted by rules with at least this confidence skip the LLM (> 1 disables)
+    "signal_fast_path_min_confidence": float(os.getenv("SIGNAL_FAST_PATH_MIN_CONFIDENCE", "0.8")),
+    # Run the selected analysts concurrently instead of one after another
+    "parallel_analysts": os.getenv("PARALLEL_ANALYSTS", "false").lower() == "true",
     "online_tools": os.getenv("ONLINE_TOOLS", "true").lower() == "true",
 
     # =============================================================================
@@ -141,6 +235,9 @@ DEFAULT_CONFIG = {
     "reddit_client_id": os.getenv("REDDIT_CLIENT_ID"),
     "reddit_client_secret": os.getenv("REDDIT_CLIENT_SECRET"),
     "reddit_user_agent": os.getenv("REDDIT_USER_AGENT", "TradingAgents/1.0"),
+    # Extra ticker -> company aliases for offline Reddit company news
+    # (e.g. {"COIN": ["Coinbase"]}); also read from reddit_data/ticker_aliases.json
+    "reddit_ticker_aliases": {},
     # =============================================================================
     # Market Settings
     # =============================================================================
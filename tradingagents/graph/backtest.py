@@ -0,0 +1,279 @@
+# TradingAgents/graph/backtest.py
+
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.dataflows.price_store import get_price_store
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+# Signal text -> position (long / short / flat)
+POSITIONS = {"买入": 1, "BUY": 1, "卖出": -1, "SELL": -1, "持有": 0, "HOLD": 0}
+
+# Final-state fields the Reflector reads; kept for decisions awaiting reflection
+REFLECTION_FIELDS = [
+    "company_of_interest",
+    "trade_date",
+    "market_report",
+    "sentiment_report",
+    "news_report",
+    "fundamentals_report",
+    "trader_investment_plan",
+    "investment_plan",
+    "final_trade_decision",
+]
+
+
+def decision_to_position(decision: Optional[str]) -> Optional[int]:
+    """Map a processed signal (e.g. ``"买入"`` or ``"SELL"``) to +1/-1/0, ``None`` if unknown."""
+    if not decision:
+        return None
+    text = decision.strip().upper()
+    for word, position in POSITIONS.items():
+        if word in text:
+            return position
+    return None
+
+
+def _reflection_state(final_state: Dict[str, Any]) -> Dict[str, Any]:
+    """The JSON-serializable part of a final state that reflection needs."""
+    state = {key: final_state.get(key, "") for key in REFLECTION_FIELDS}
+    invest = final_state.get("investment_debate_state") or {}
+    risk = final_state.get("risk_debate_state") or {}
+    state["investment_debate_state"] = {
+        key: invest.get(key, "") for key in ("bull_history", "bear_history", "history", "judge_decision")
+    }
+    state["risk_debate_state"] = {
+        key: risk.get(key, "") for key in ("risky_history", "safe_history", "neutral_history", "history", "judge_decision")
+    }
+    return state
+
+
+class Backtester:
+    """Walk-forward backtest of a TradingAgentsGraph over a date range.
+
+    Every trading day the graph decides for each ticker with a bar on that
+    day.  A decision's realized return over ``horizon`` trading days is only
+    computed once the simulation reaches its exit day, and decisions are
+    reflected on in the order their returns become known, so neither the
+    decisions nor the memories see prices after the day being simulated.
+    Progress is checkpointed after each day and each reflection and resumed
+    from the checkpoint.
+    """
+
+    def __init__(
+        self,
+        graph,
+        tickers: Iterable[str],
+        start_date: str,
+        end_date: str,
+        horizon: int = 5,
+        checkpoint_path: Optional[str] = None,
+        reflect: bool = True,
+        price_store=None,
+    ):
+        """Initialize the backtest.
+
+        Args:
+            graph: The TradingAgentsGraph making the decisions.
+            tickers: Symbols to trade; prices come from the local price store.
+            start_date: First trading day (``YYYY-mm-dd``).
+            end_date: Last trading day (``YYYY-mm-dd``).
+            horizon: Trading days after the decision day at which its return is realized.
+            checkpoint_path: JSON file to checkpoint to and resume from.
+            reflect: Whether to call ``reflect_and_remember`` with realized returns.
+            price_store: Price store to read from; defaults to the shared one.
+        """
+        if horizon < 1:
+            raise ValueError("Backtest horizon must be at least one trading day")
+        self.graph = graph
+        self.tickers = list(tickers)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.horizon = int(horizon)
+        self.checkpoint_path = checkpoint_path
+        self.reflect = reflect
+        self.price_store = price_store or get_price_store()
+        self.current_day: Optional[str] = None
+
+        self.completed_days: List[str] = []
+        self.decisions: List[Dict[str, Any]] = []
+        # Timings returned by reflect_and_remember, one per reflected decision
+        self.reflection_timings: List[Dict[str, float]] = []
+        self._load_checkpoint()
+
+    # ------------------------------------------------------------------
+    # Checkpointing
+    # ------------------------------------------------------------------
+    def _params(self) -> Dict[str, Any]:
+        return {
+            "tickers": self.tickers,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "horizon": self.horizon,
+        }
+
+    def _load_checkpoint(self) -> None:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("version") != CHECKPOINT_VERSION or checkpoint.get("params") != self._params():
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} belongs to a different backtest: {checkpoint.get('params')}"
+            )
+        self.completed_days = checkpoint["completed_days"]
+        self.decisions = checkpoint["decisions"]
+        logger.info(f"Backtest: resuming after {len(self.completed_days)} completed days")
+
+    def _save_checkpoint(self) -> None:
+        if not self.checkpoint_path:
+            return
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "params": self._params(),
+            "completed_days": self.completed_days,
+            "decisions": self.decisions,
+        }
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.checkpoint_path}.tmp-{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        os.replace(tmp, self.checkpoint_path)
+
+    # ------------------------------------------------------------------
+    # Prices
+    # ------------------------------------------------------------------
+    def _closes(self, ticker: str, as_of: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Trading dates and closes of *ticker* up to and including *as_of*."""
+        df = self.price_store.load(ticker, None, as_of)
+        column = "Adj Close" if "Adj Close" in df.columns else "Close"
+        return df.index.values.astype("datetime64[D]"), df[column].to_numpy(dtype=float)
+
+    def trading_days(self) -> List[str]:
+        """Union of the tickers' trading days in the backtest range."""
+        days = set()
+        for ticker in self.tickers:
+            days.update(self.price_store.trading_dates(ticker, self.start_date, self.end_date))
+        return sorted(days)
+
+    def _mature(self, as_of: str) -> None:
+        """Realize returns of decisions whose exit day is on or before *as_of*, then reflect."""
+        for ticker in self.tickers:
+            pending = [d for d in self.decisions if d["ticker"] == ticker and d["exit_date"] is None and d["position"] is not None]
+            if not pending:
+                continue
+            dates, closes = self._closes(ticker, as_of)
+            entry = np.searchsorted(dates, np.array([d["date"] for d in pending], dtype="datetime64[D]"))
+            exit_pos = entry + self.horizon
+            ready = exit_pos < len(dates)
+            safe_exit = np.where(ready, exit_pos, 0)
+            returns = closes[safe_exit] / closes[entry] - 1.0
+            for decision, is_ready, ret, exit_index in zip(pending, ready, returns, safe_exit):
+                if not is_ready:
+                    continue
+                decision["exit_date"] = str(dates[exit_index])
+                decision["return"] = float(ret)
+                decision["strategy_return"] = float(decision["position"] * ret)
+
+        # Reflect in the order the returns became known.  A cleared state marks a
+        # decision as reflected; the checkpoint records that after every
+        # reflection, so a resumed run neither repeats nor skips a lesson.
+        matured = [d for d in self.decisions if d["exit_date"] is not None and d["state"] is not None]
+        for decision in sorted(matured, key=lambda d: (d["exit_date"], d["date"], d["ticker"])):
+            if self.reflect:
+                self.graph.curr_state = decision["state"]
+                timings = self.graph.reflect_and_remember(decision["strategy_return"])
+                if timings:
+                    self.reflection_timings.append(timings)
+            decision["state"] = None
+            if self.reflect:
+                self._save_checkpoint()
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+    def _decide(self, day: str) -> None:
+        tickers = [t for t in self.tickers if day in self.price_store.trading_dates(t, day, day)]
+        runner = self.graph.propagate_many([(ticker, day) for ticker in tickers])
+        for result in sorted(runner, key=lambda r: r["index"]):
+            ok = result["status"] == "ok"
+            self.decisions.append(
+                {
+                    "date": day,
+                    "ticker": result["ticker"],
+                    "decision": result["decision"],
+                    "position": decision_to_position(result["decision"]) if ok else None,
+                    "error": result["error"],
+                    "exit_date": None,
+                    "return": None,
+                    "strategy_return": None,
+                    "state": _reflection_state(result["final_state"]) if ok else None,
+                }
+            )
+
+    def run(self) -> Tuple[pd.DataFrame, pd.Series]:
+        """Run (or resume) the backtest and return ``(results_table, equity_curve)``."""
+        done = set(self.completed_days)
+        for day in self.trading_days():
+            if day in done:
+                continue
+            self.current_day = day
+            logger.info(f"Backtest: {day}")
+            self._mature(day)
+            self._decide(day)
+            self.completed_days.append(day)
+            self._save_checkpoint()
+
+        # Realize what the data allows for the decisions near the end of the range
+        self.current_day = None
+        self._mature(None)
+        self._save_checkpoint()
+        return self.results_table(), self.equity_curve()
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+    def results_table(self) -> pd.DataFrame:
+        """One row per decision with its realized return over the horizon."""
+        columns = ["date", "ticker", "decision", "position", "exit_date", "return", "strategy_return", "error"]
+        return pd.DataFrame([{c: d[c] for c in columns} for d in self.decisions], columns=columns)
+
+    def equity_curve(self) -> pd.Series:
+        """Equal-weight daily equity of holding each ticker's latest position.
+
+        A decision made on day ``d`` is held from the close of ``d`` until the
+        next decision for that ticker.
+        """
+        days = sorted(self.completed_days)
+        if not days:
+            return pd.Series(dtype=float, name="equity")
+        index = pd.DatetimeIndex(days)
+
+        closes = {}
+        for ticker in self.tickers:
+            dates, values = self._closes(ticker, days[-1])
+            closes[ticker] = pd.Series(values, index=pd.DatetimeIndex(dates.astype("datetime64[ns]")))
+        prices = pd.DataFrame(closes).reindex(index).ffill()
+
+        decisions = pd.DataFrame(
+            [(d["date"], d["ticker"], d["position"]) for d in self.decisions if d["position"] is not None],
+            columns=["date", "ticker", "position"],
+        )
+        positions = pd.DataFrame(np.nan, index=index, columns=self.tickers)
+        if not decisions.empty:
+            pivot = decisions.pivot_table(index="date", columns="ticker", values="position", aggfunc="last")
+            pivot.index = pd.DatetimeIndex(pivot.index)
+            positions.update(pivot)
+        held = positions.ffill().shift(1).fillna(0.0)
+
+        daily = (held * prices.pct_change().fillna(0.0)).mean(axis=1)
+        return (1.0 + daily).cumprod().rename("equity")
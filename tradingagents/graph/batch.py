@@ -0,0 +1,183 @@
+# TradingAgents/graph/batch.py
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+logger = logging.getLogger(__name__)
+
+Job = Tuple[str, str]
+
+
+class TokenUsageCounter(BaseCallbackHandler):
+    """Callback handler summing the token usage reported by chat models."""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        self.llm_calls = 0
+        self._lock = threading.Lock()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        prompt = completion = total = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    prompt += usage.get("input_tokens", 0)
+                    completion += usage.get("output_tokens", 0)
+                    total += usage.get("total_tokens", 0)
+        if not total and response.llm_output:
+            usage = response.llm_output.get("token_usage") or {}
+            prompt = usage.get("prompt_tokens", 0)
+            completion = usage.get("completion_tokens", 0)
+            total = usage.get("total_tokens", prompt + completion)
+
+        with self._lock:
+            self.prompt_tokens += prompt
+            self.completion_tokens += completion
+            self.total_tokens += total
+            self.llm_calls += 1
+
+
+class BatchRunner:
+    """Runs many (ticker, trade_date) jobs on one TradingAgentsGraph with bounded concurrency.
+
+    All jobs share the graph's LLM clients, data caches and memories.  Iterate
+    the runner (``for`` or ``async for``) to receive one result dict per job
+    as soon as it finishes; :meth:`summary` then reports the throughput.
+    """
+
+    def __init__(
+        self,
+        graph,
+        jobs: Iterable[Job],
+        max_concurrency: int = 4,
+        progress_callback: Optional[Callable[[int, int, Dict[str, Any]], None]] = None,
+    ):
+        """Initialize the runner.
+
+        Args:
+            graph: The TradingAgentsGraph to run the jobs on.
+            jobs: ``(ticker, trade_date)`` pairs.
+            max_concurrency: Number of jobs running at the same time.
+            progress_callback: Called as ``progress_callback(done, total, result)``
+                after every finished job.
+        """
+        self.graph = graph
+        self.jobs: List[Job] = [tuple(job) for job in jobs]
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.progress_callback = progress_callback
+        self.results: List[Dict[str, Any]] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    async def _run_job(self, index: int, job: Job, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        ticker, trade_date = job
+        async with semaphore:
+            counter = TokenUsageCounter()
+            started = time.monotonic()
+            result = {"index": index, "ticker": ticker, "trade_date": trade_date}
+            try:
+                final_state, decision = await self.graph.apropagate(
+                    ticker, trade_date, callbacks=[counter]
+                )
+                result.update(status="ok", decision=decision, final_state=final_state, error=None)
+            except Exception as e:
+                # One failing job must not stop the batch
+                logger.warning(f"Batch job {ticker} {trade_date} failed: {e}")
+                result.update(status="error", decision=None, final_state=None, error=f"{type(e).__name__}: {e}")
+            result["elapsed"] = time.monotonic() - started
+            result["tokens"] = counter.total_tokens
+            result["llm_calls"] = counter.llm_calls
+            return result
+
+    def _record(self, result: Dict[str, Any]) -> None:
+        self.results.append(result)
+        if self.progress_callback is not None:
+            try:
+                self.progress_callback(len(self.results), len(self.jobs), result)
+            except Exception as e:
+                logger.warning(f"Batch progress callback failed: {e}")
+
+    async def astream(self):
+        """Run the jobs and yield their results in completion order."""
+        self.results = []
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.ensure_future(self._run_job(index, job, semaphore))
+            for index, job in enumerate(self.jobs)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                self._record(result)
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.finished_at = time.monotonic()
+
+    def __aiter__(self):
+        return self.astream()
+
+    def __iter__(self):
+        """Run the jobs on a private event loop thread and yield results as they finish."""
+        results: "queue.Queue" = queue.Queue()
+        stop = threading.Event()
+        done = object()
+
+        async def pump():
+            async for result in self.astream():
+                results.put(result)
+                if stop.is_set():
+                    break
+
+        def run():
+            try:
+                asyncio.run(pump())
+            except BaseException as e:
+                results.put(e)
+            finally:
+                results.put(done)
+
+        thread = threading.Thread(target=run, name="batch-runner", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def summary(self) -> Dict[str, Any]:
+        """Job counts and throughput of the last run."""
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        elapsed = end - self.started_at if self.started_at is not None else 0.0
+        minutes = elapsed / 60 if elapsed > 0 else 0.0
+        tokens = sum(r["tokens"] for r in self.results)
+        succeeded = sum(1 for r in self.results if r["status"] == "ok")
+        return {
+            "jobs": len(self.jobs),
+            "completed": len(self.results),
+            "succeeded": succeeded,
+            "failed": len(self.results) - succeeded,
+            "elapsed_seconds": elapsed,
+            "jobs_per_min": len(self.results) / minutes if minutes else 0.0,
+            "tokens": tokens,
+            "tokens_per_min": tokens / minutes if minutes else 0.0,
+            "llm_calls": sum(r["llm_calls"] for r in self.results),
+        }
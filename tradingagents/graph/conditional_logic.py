@@ -43,6 +43,19 @@ class ConditionalLogic:
             return "tools_fundamentals"
         return "Msg Clear Fundamentals"
 
+    def analyst_router(self, analyst_type: str, messages_key: str):
+        """Tools-or-clear router for an analyst whose conversation is in *messages_key*."""
+        tools_node = f"tools_{analyst_type}"
+        clear_node = f"Msg Clear {analyst_type.capitalize()}"
+
+        def should_continue(state: AgentState):
+            last_message = state[messages_key][-1]
+            if last_message.tool_calls:
+                return tools_node
+            return clear_node
+
+        return should_continue
+
     def should_continue_debate(self, state: AgentState) -> str:
         """Determine if debate should continue."""
 
@@ -27,7 +27,14 @@ class Propagator:
             "trade_date": start_date,  # For compatibility with original analyst node
             "messages": [("human", company_name)],
             "investment_debate_state": InvestDebateState(
-                {"history": "", "current_response": "", "count": 0}
+                {
+                    "history": "",
+                    "current_response": "",
+                    "count": 0,
+                    "turns": [],
+                    "summary": "",
+                    "summarized_turns": 0,
+                }
             ),
             "risk_debate_state": RiskDebateState(
                 {
@@ -36,6 +43,9 @@ class Propagator:
                     "current_safe_response": "",
                     "current_neutral_response": "",
                     "count": 0,
+                    "turns": [],
+                    "summary": "",
+                    "summarized_turns": 0,
                 }
             ),
             "market_report": "",
@@ -1,8 +1,19 @@
 # TradingAgents/graph/reflection.py
 
-from typing import Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
 from langchain_openai import ChatOpenAI
 
+# Component -> (label in the reflection prompt, decision text in the final state)
+COMPONENTS = {
+    "bull": ("BULL", lambda state: state["investment_debate_state"]["bull_history"]),
+    "bear": ("BEAR", lambda state: state["investment_debate_state"]["bear_history"]),
+    "trader": ("TRADER", lambda state: state["trader_investment_plan"]),
+    "invest_judge": ("INVEST JUDGE", lambda state: state["investment_debate_state"]["judge_decision"]),
+    "risk_manager": ("RISK JUDGE", lambda state: state["risk_debate_state"]["judge_decision"]),
+}
+
 
 class Reflector:
     """Handles reflection on decisions and updating memory."""
@@ -57,52 +68,89 @@ class Reflector:
         result = self.quick_thinking_llm.invoke(messages).content
         return result
 
-    def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
-        """Reflect on bull researcher's analysis and update memory."""
-        situation = self._extract_current_situation(current_state)
-        bull_debate_history = current_state["investment_debate_state"]["bull_history"]
+    def _reflect_and_store(
+        self, component, current_state, returns_losses, memory, situation=None, embedding=None
+    ) -> float:
+        """Reflect on one component and add the lesson to its memory; returns seconds taken."""
+        started = time.monotonic()
+        if situation is None:
+            situation = self._extract_current_situation(current_state)
+        label, decision = COMPONENTS[component]
 
         result = self._reflect_on_component(
-            "BULL", bull_debate_history, situation, returns_losses
+            label, decision(current_state), situation, returns_losses
         )
-        bull_memory.add_situations([(situation, result)])
+        if embedding is None:
+            memory.add_situations([(situation, result)])
+        else:
+            memory.add_situations([(situation, result)], embeddings=[embedding])
+        return time.monotonic() - started
+
+    def reflect_all(
+        self,
+        current_state: Dict[str, Any],
+        returns_losses,
+        memories: Dict[str, Any],
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """Reflect on all components concurrently and update their memories.
+
+        The situation is extracted and embedded once and shared by every
+        memory insert; the LLM calls run on a pool of ``max_workers`` threads.
+
+        Args:
+            current_state: Final state of the run being reflected on.
+            returns_losses: Realized returns of the decision.
+            memories: Component name (see ``COMPONENTS``) -> memory.
+            max_workers: Concurrent reflections (defaults to one per component).
+
+        Returns:
+            Seconds spent per component, on the shared ``situation`` and
+            ``embedding`` steps, and ``total`` wall time.
+        """
+        started = time.monotonic()
+        timings = {}
 
-    def reflect_bear_researcher(self, current_state, returns_losses, bear_memory):
-        """Reflect on bear researcher's analysis and update memory."""
         situation = self._extract_current_situation(current_state)
-        bear_debate_history = current_state["investment_debate_state"]["bear_history"]
+        timings["situation"] = time.monotonic() - started
+
+        step = time.monotonic()
+        first_memory = next(iter(memories.values()))
+        embedding = first_memory.get_embedding(situation)
+        timings["embedding"] = time.monotonic() - step
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers or len(memories), thread_name_prefix="reflection"
+        ) as pool:
+            futures = {
+                component: pool.submit(
+                    self._reflect_and_store,
+                    component, current_state, returns_losses, memory, situation, embedding,
+                )
+                for component, memory in memories.items()
+            }
+            for component, future in futures.items():
+                timings[component] = future.result()
+
+        timings["total"] = time.monotonic() - started
+        return timings
 
-        result = self._reflect_on_component(
-            "BEAR", bear_debate_history, situation, returns_losses
-        )
-        bear_memory.add_situations([(situation, result)])
+    def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
+        """Reflect on bull researcher's analysis and update memory."""
+        self._reflect_and_store("bull", current_state, returns_losses, bull_memory)
+
+    def reflect_bear_researcher(self, current_state, returns_losses, bear_memory):
+        """Reflect on bear researcher's analysis and update memory."""
+        self._reflect_and_store("bear", current_state, returns_losses, bear_memory)
 
     def reflect_trader(self, current_state, returns_losses, trader_memory):
         """Reflect on trader's decision and update memory."""
-        situation = self._extract_current_situation(current_state)
-        trader_decision = current_state["trader_investment_plan"]
-
-        result = self._reflect_on_component(
-            "TRADER", trader_decision, situation, returns_losses
-        )
-        trader_memory.add_situations([(situation, result)])
+        self._reflect_and_store("trader", current_state, returns_losses, trader_memory)
 
     def reflect_invest_judge(self, current_state, returns_losses, invest_judge_memory):
         """Reflect on investment judge's decision and update memory."""
-        situation = self._extract_current_situation(current_state)
-        judge_decision = current_state["investment_debate_state"]["judge_decision"]
-
-        result = self._reflect_on_component(
-            "INVEST JUDGE", judge_decision, situation, returns_losses
-        )
-        invest_judge_memory.add_situations([(situation, result)])
+        self._reflect_and_store("invest_judge", current_state, returns_losses, invest_judge_memory)
 
     def reflect_risk_manager(self, current_state, returns_losses, risk_manager_memory):
         """Reflect on risk manager's decision and update memory."""
-        situation = self._extract_current_situation(current_state)
-        judge_decision = current_state["risk_debate_state"]["judge_decision"]
-
-        result = self._reflect_on_component(
-            "RISK JUDGE", judge_decision, situation, returns_losses
-        )
-        risk_manager_memory.add_situations([(situation, result)])
+        self._reflect_and_store("risk_manager", current_state, returns_losses, risk_manager_memory)
@@ -1,6 +1,9 @@
 # TradingAgents/graph/setup.py
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.runnables.base import coerce_to_runnable
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
@@ -8,10 +11,46 @@ from langgraph.prebuilt import ToolNode
 from tradingagents.agents import *
 from tradingagents.agents.utils.agent_states import AgentState
 from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.agents.utils.debate_context import DebateContext
 
 from .conditional_logic import ConditionalLogic
 
 
+def _on_message_channel(node, messages_key: str):
+    """Run an analyst node against its own message channel instead of ``messages``.
+
+    The channel starts from the shared initial messages, so the analyst sees
+    the same conversation it would see as the first analyst of the chain.
+    The analyst's final answer (the AI message without tool calls) is also
+    appended to ``messages``, where the CLI and the debug trace read progress.
+    """
+    node = coerce_to_runnable(node)
+
+    def channel_input(state):
+        messages = list(state.get(messages_key) or [])
+        seed = [] if messages else list(state["messages"])
+        return seed, {**state, "messages": seed + messages}
+
+    def channel_output(seed, result):
+        result = dict(result)
+        new_messages = list(result.pop("messages", []))
+        result[messages_key] = seed + new_messages
+        final = [m for m in new_messages if isinstance(m, AIMessage) and not m.tool_calls]
+        if final:
+            result["messages"] = final[-1:]
+        return result
+
+    def channel_node(state, config):
+        seed, channel_state = channel_input(state)
+        return channel_output(seed, node.invoke(channel_state, config))
+
+    async def achannel_node(state, config):
+        seed, channel_state = channel_input(state)
+        return channel_output(seed, await node.ainvoke(channel_state, config))
+
+    return RunnableLambda(channel_node, afunc=achannel_node)
+
+
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
 
@@ -27,8 +66,13 @@ class GraphSetup:
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        debate_context: Optional[DebateContext] = None,
     ):
-        """Initialize with required components."""
+        """Initialize with required components.
+
+        ``debate_context`` bounds the debaters' and judges' prompts; by default
+        one is built on the quick thinking model.
+        """
         self.quick_thinking_llm = quick_thinking_llm
         self.deep_thinking_llm = deep_thinking_llm
         self.toolkit = toolkit
@@ -39,9 +83,12 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.debate_context = debate_context or DebateContext(quick_thinking_llm)
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        parallel_analysts=False,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -51,6 +98,11 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Run the analysts concurrently from START,
+                each on its own ``{analyst}_messages`` channel (their final
+                answers are also appended to ``messages``), and join them
+                before the Bull Researcher. Otherwise they run one after another
+                on the shared ``messages`` channel.
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -88,24 +140,38 @@ class GraphSetup:
             delete_nodes["fundamentals"] = create_msg_delete()
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
 
+        if parallel_analysts:
+            # Give every analyst its own conversation so that clearing one
+            # analyst's messages cannot touch another's
+            for analyst_type in analyst_nodes:
+                messages_key = f"{analyst_type}_messages"
+                analyst_nodes[analyst_type] = _on_message_channel(
+                    analyst_nodes[analyst_type], messages_key
+                )
+                delete_nodes[analyst_type] = create_msg_delete(messages_key)
+                tool_nodes[analyst_type] = ToolNode(
+                    list(tool_nodes[analyst_type].tools_by_name.values()),
+                    messages_key=messages_key,
+                )
+
         # Create researcher and manager nodes
         bull_researcher_node = create_bull_researcher(
-            self.quick_thinking_llm, self.bull_memory
+            self.quick_thinking_llm, self.bull_memory, self.debate_context
         )
         bear_researcher_node = create_bear_researcher(
-            self.quick_thinking_llm, self.bear_memory
+            self.quick_thinking_llm, self.bear_memory, self.debate_context
         )
         research_manager_node = create_research_manager(
-            self.deep_thinking_llm, self.invest_judge_memory
+            self.deep_thinking_llm, self.invest_judge_memory, self.debate_context
         )
         trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
+        risky_analyst = create_risky_debator(self.quick_thinking_llm, self.debate_context)
+        neutral_analyst = create_neutral_debator(self.quick_thinking_llm, self.debate_context)
+        safe_analyst = create_safe_debator(self.quick_thinking_llm, self.debate_context)
         risk_manager_node = create_risk_manager(
-            self.deep_thinking_llm, self.risk_manager_memory
+            self.deep_thinking_llm, self.risk_manager_memory, self.debate_context
         )
 
         # Create workflow
@@ -130,30 +196,52 @@ class GraphSetup:
         workflow.add_node("Risk Judge", risk_manager_node)
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
-
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
+        if parallel_analysts:
+            # Fan out from START and join before the Bull Researcher
+            for analyst_type in selected_analysts:
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+                workflow.add_edge(START, current_analyst)
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    self.conditional_logic.analyst_router(
+                        analyst_type, f"{analyst_type}_messages"
+                    ),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
+
+            workflow.add_edge(
+                [f"Msg Clear {a.capitalize()}" for a in selected_analysts],
+                "Bull Researcher",
             )
-            workflow.add_edge(current_tools, current_analyst)
-
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+
+            # Connect analysts in sequence
+            for i, analyst_type in enumerate(selected_analysts):
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+                # Add conditional edges for current analyst
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
+
+                # Connect to next analyst or to Bull Researcher if this is the last analyst
+                if i < len(selected_analysts) - 1:
+                    next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                    workflow.add_edge(current_clear, next_analyst)
+                else:
+                    workflow.add_edge(current_clear, "Bull Researcher")
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -1,14 +1,145 @@
 # TradingAgents/graph/signal_processing.py
 
+import re
+import threading
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
 from langchain_openai import ChatOpenAI
 
+# Every decision word maps to the label the LLM path returns
+DECISION_WORDS = {
+    "买入": "买入", "BUY": "买入",
+    "卖出": "卖出", "SELL": "卖出",
+    "持有": "持有", "HOLD": "持有", "观望": "持有",
+}
+# English words must stand alone ("selling", "buyback", "shareholders" and
+# "sell-off" do not count); \b is not enough for hyphens and would reject
+# words glued to CJK text (建议BUY), so letters and hyphens are excluded instead
+_WORD = r"(买入|卖出|持有|观望|(?<![A-Za-z-])(?:BUY|SELL|HOLD)(?![A-Za-z-]))"
+# A negation up to a few characters (or two words) before the decision word:
+# 不建议卖出, 无需买入, "do not recommend to SELL"
+_NEGATED_ZH = re.compile(r"(?:不要|不|勿|避免|无需|无须)[^，。,.；;！!？?\n]{0,3}$")
+_NEGATED_EN = re.compile(r"\b(?:NOT|DON'T|DO NOT|NO|NEVER)\b(?:\s+[A-Z']+){0,2}\s*$", re.I)
+_NEGATION_WINDOW = 24
+
+_MARK = r"\s*[:：]\s*[*_`\s]*"
+
+# (rule name, confidence, pattern), strongest first; the first rule that
+# matches decides, unless its matches disagree
+DECISION_RULES = [
+    ("final_proposal", 0.98, re.compile(r"FINAL\s+TRANSACTION\s+PROPOSAL" + _MARK + _WORD, re.I)),
+    (
+        "final_marker",
+        0.95,
+        re.compile(
+            r"(?:最终|最後)(?:交易|操作|投资)?(?:决策|決策|建议|建議|评级)" + _MARK + _WORD
+            + r"|FINAL\s+(?:DECISION|RECOMMENDATION|ACTION)" + _MARK + _WORD,
+            re.I,
+        ),
+    ),
+    (
+        "marker",
+        0.9,
+        re.compile(
+            r"(?:交易|操作|投资)?(?:决策|決策|建议|建議|评级)" + _MARK + _WORD
+            + r"|(?:DECISION|RECOMMENDATION|ACTION)" + _MARK + _WORD,
+            re.I,
+        ),
+    ),
+    (
+        "table",
+        0.88,
+        re.compile(
+            r"\|\s*[*_`]*(?:最终)?(?:决策|建议|操作|评级|DECISION|RECOMMENDATION|ACTION)[*_`]*\s*\|\s*[*_`]*\s*" + _WORD,
+            re.I,
+        ),
+    ),
+]
+
+# Confidence when the matches of one rule name different decisions, so the LLM decides
+CONFLICT_CONFIDENCE = 0.5
+
+
+def _negated(text: str, start: int) -> bool:
+    before = text[max(0, start - _NEGATION_WINDOW):start]
+    return bool(_NEGATED_ZH.search(before) or _NEGATED_EN.search(before))
+
+
+def extract_decision(full_signal: str) -> Tuple[Optional[str], float, str]:
+    """Pull 买入/卖出/持有 out of a decision text without an LLM.
+
+    Accepts a bare decision word, then looks for an explicit
+    ``FINAL TRANSACTION PROPOSAL`` line, final decision markers
+    (``最终决策：卖出``, ``Final decision: BUY``), other decision markers
+    (``建议：持有``), decision table cells, and finally counts decision
+    keywords (skipping negated ones).  Markers of one kind that disagree
+    (e.g. two different recommendations) only yield a low confidence.
+
+    Returns:
+        ``(decision, confidence, rule)``; decision is ``None`` when nothing was found.
+    """
+    text = full_signal or ""
+    bare = text.strip().strip("*_`'\"。.!！ ").upper()
+    if bare in DECISION_WORDS:
+        return DECISION_WORDS[bare], 1.0, "exact"
+
+    for rule, confidence, pattern in DECISION_RULES:
+        found = [
+            DECISION_WORDS[next(group for group in match.groups() if group).upper()]
+            for match in pattern.finditer(text)
+        ]
+        if found:
+            if len(set(found)) > 1:
+                return found[-1], CONFLICT_CONFIDENCE, f"{rule}_conflict"
+            return found[-1], confidence, rule
+
+    counts = Counter()
+    for match in re.finditer(_WORD, text, re.I):
+        if not _negated(text, match.start()):
+            counts[DECISION_WORDS[match.group(1).upper()]] += 1
+    if not counts:
+        return None, 0.0, "none"
+    decision, top = counts.most_common(1)[0]
+    share = top / sum(counts.values())
+    # A single mention or a split vote is weak evidence
+    confidence = share * min(1.0, top / 3) * 0.9
+    return decision, confidence, "keywords"
+
 
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
-        """Initialize with an LLM for processing."""
+    def __init__(self, quick_thinking_llm: ChatOpenAI, min_confidence: float = 0.8):
+        """Initialize with an LLM for processing.
+
+        Decisions the rule-based extractor finds with at least
+        ``min_confidence`` skip the LLM call (``> 1`` always calls it).
+        """
         self.quick_thinking_llm = quick_thinking_llm
+        self.min_confidence = min_confidence
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def _fast_path(self, full_signal: str) -> Optional[str]:
+        decision, confidence, rule = extract_decision(full_signal)
+        with self._lock:
+            if decision is not None and confidence >= self.min_confidence:
+                self._counts["fast_path"] += 1
+                self._counts[f"rule:{rule}"] += 1
+                return decision
+            self._counts["llm"] += 1
+        return None
+
+    def stats(self) -> Dict[str, float]:
+        """How many signals took the fast path, per rule, and how many needed the LLM."""
+        with self._lock:
+            stats = dict(self._counts)
+        total = stats.get("fast_path", 0) + stats.get("llm", 0)
+        stats.setdefault("fast_path", 0)
+        stats.setdefault("llm", 0)
+        stats["fast_path_rate"] = stats["fast_path"] / total if total else 0.0
+        return stats
 
     def process_signal(self, full_signal: str) -> str:
         """
@@ -18,14 +149,27 @@ class SignalProcessor:
             full_signal: Complete trading signal text
 
         Returns:
-            Extracted decision (BUY, SELL, or HOLD)
+            Extracted decision (买入, 卖出 or 持有)
         """
-        messages = [
+        decision = self._fast_path(full_signal)
+        if decision is not None:
+            return decision
+        return self.quick_thinking_llm.invoke(self._messages(full_signal)).content
+
+    async def aprocess_signal(self, full_signal: str, config=None) -> str:
+        """Async version of :meth:`process_signal`."""
+        decision = self._fast_path(full_signal)
+        if decision is not None:
+            return decision
+        response = await self.quick_thinking_llm.ainvoke(self._messages(full_signal), config)
+        return response.content
+
+    @staticmethod
+    def _messages(full_signal: str):
+        return [
             (
                 "system",
                 "你是一名高效的助手，专门分析分析师团队提供的段落或财报。你的任务是用中文提取投资决策：买入、卖出或持有。只输出决策（买入、卖出或持有），不要添加任何额外内容。",
             ),
             ("human", full_signal),
         ]
-
-        return self.quick_thinking_llm.invoke(messages).content
@@ -0,0 +1,75 @@
+# TradingAgents/graph/streaming.py
+
+"""
+Incremental events of a running analysis for the CLI and the web app.
+
+``graph.stream(..., stream_mode="values")`` only reports a node once it has
+finished.  Streaming with the ``values``, ``messages`` and ``custom`` modes
+together also yields every LLM token as it arrives (``messages``) and the
+progress events nodes write themselves (``custom``).  :func:`to_event` turns
+those chunks into plain dicts:
+
+- ``{"type": "token", "node", "agent", "section", "text"}``: a piece of the
+  report *section* being written by *agent*;
+- ``{"type": "status", "node", "agent", "status"}``: an agent started working;
+- ``{"type": "state", "state"}``: the full state after a node finished.
+"""
+
+from typing import Any, Dict, Optional
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+STREAM_MODES = ["values", "messages", "custom"]
+
+# Graph node -> (agent name shown in the UIs, report section it writes)
+NODE_SECTIONS = {
+    "Market Analyst": ("Market Analyst", "market_report"),
+    "Social Analyst": ("Social Analyst", "sentiment_report"),
+    "News Analyst": ("News Analyst", "news_report"),
+    "Fundamentals Analyst": ("Fundamentals Analyst", "fundamentals_report"),
+    "Bull Researcher": ("Bull Researcher", "investment_plan"),
+    "Bear Researcher": ("Bear Researcher", "investment_plan"),
+    "Research Manager": ("Research Manager", "investment_plan"),
+    "Trader": ("Trader", "trader_investment_plan"),
+    "Risky Analyst": ("Risky Analyst", "final_trade_decision"),
+    "Safe Analyst": ("Safe Analyst", "final_trade_decision"),
+    "Neutral Analyst": ("Neutral Analyst", "final_trade_decision"),
+    "Risk Judge": ("Portfolio Manager", "final_trade_decision"),
+}
+
+
+def message_text(content) -> str:
+    """Text of a message or chunk content (a string or a list of content blocks)."""
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content or []:
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict) and block.get("type") == "text":
+            parts.append(block.get("text", ""))
+    return "".join(parts)
+
+
+def to_event(mode: str, payload: Any) -> Optional[Dict[str, Any]]:
+    """Convert one ``(mode, payload)`` chunk of a multi-mode stream into an event."""
+    if mode == "values":
+        return {"type": "state", "state": payload}
+
+    if mode == "messages":
+        message, metadata = payload
+        node = metadata.get("langgraph_node")
+        if node not in NODE_SECTIONS or not isinstance(message, (AIMessage, AIMessageChunk)):
+            return None
+        text = message_text(message.content)
+        if not text:
+            # Tool call chunks of the analysts carry no report text
+            return None
+        agent, section = NODE_SECTIONS[node]
+        return {"type": "token", "node": node, "agent": agent, "section": section, "text": text}
+
+    if mode == "custom" and isinstance(payload, dict) and payload.get("event") == "llm_start":
+        node = payload.get("node")
+        if node in NODE_SECTIONS:
+            return {"type": "status", "node": node, "agent": NODE_SECTIONS[node][0], "status": "in_progress"}
+    return None
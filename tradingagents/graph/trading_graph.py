@@ -1,15 +1,12 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
+import threading
 from pathlib import Path
 import json
 from datetime import date
 from typing import Dict, Any, Tuple, List, Optional
 
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
-
 from langgraph.prebuilt import ToolNode
 
 from tradingagents.agents import *
@@ -21,17 +18,28 @@ from tradingagents.agents.utils.agent_states import (
     RiskDebateState,
 )
 from tradingagents.dataflows.interface import set_config
+from tradingagents.agents.utils.agent_utils import as_async_tool
+from tradingagents.agents.utils.debate_context import DebateContext
+from tradingagents.agents.utils.llm_cache import create_llm_cache
+from tradingagents.dataflows.llm_clients import get_chat_model
+from tradingagents.dataflows.llm_scheduler import llm_flow
+from tradingagents.agents.utils.tool_memo import tool_memo_scope
 
 from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .batch import BatchRunner
+from .streaming import STREAM_MODES, to_event
 
 
 class TradingAgentsGraph:
     """Main class that orchestrates the trading agents framework."""
 
+    # Serializes state logging of concurrent runs
+    _log_lock = threading.Lock()
+
     def __init__(
         self,
         selected_analysts=["market", "social", "news", "fundamentals"],
@@ -57,80 +65,17 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
-        # Initialize LLMs
-        # 提取提供商名称（去除描述文字）
-        provider_name = self.config["llm_provider"].lower().split()[0] if self.config["llm_provider"] else ""
-
-        if provider_name == "openai" or provider_name == "ollama" or provider_name == "openrouter":
-            # Get the appropriate API key based on provider
-            if provider_name == "ollama":
-                api_key = "ollama"  # Dummy key for Ollama
-            elif provider_name == "openrouter":
-                api_key = self.config["openrouter_api_key"]
-            else:  # openai
-                api_key = os.getenv("OPENAI_API_KEY")
-
-            self.deep_thinking_llm = ChatOpenAI(
-                model=self.config["deep_think_llm"],
-                base_url=self.config["backend_url"],
-                api_key=api_key
-            )
-            self.quick_thinking_llm = ChatOpenAI(
-                model=self.config["quick_think_llm"],
-                base_url=self.config["backend_url"],
-                api_key=api_key
-            )
-        elif provider_name == "groq":
-            # Groq uses OpenAI-compatible API
-            self.deep_thinking_llm = ChatOpenAI(
-                model=self.config["deep_think_llm"],
-                base_url=self.config["api_endpoints"]["groq"],
-                api_key=self.config["groq_api_key"]
-            )
-            self.quick_thinking_llm = ChatOpenAI(
-                model=self.config["quick_think_llm"],
-                base_url=self.config["api_endpoints"]["groq"],
-                api_key=self.config["groq_api_key"]
-            )
-        elif provider_name == "together":
-            # Together AI uses OpenAI-compatible API
-            self.deep_thinking_llm = ChatOpenAI(
-                model=self.config["deep_think_llm"],
-                base_url=self.config["api_endpoints"]["together"],
-                api_key=self.config["together_api_key"]
-            )
-            self.quick_thinking_llm = ChatOpenAI(
-                model=self.config["quick_think_llm"],
-                base_url=self.config["api_endpoints"]["together"],
-                api_key=self.config["together_api_key"]
-            )
-        elif provider_name == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
-        elif provider_name == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(
-                model=self.config["deep_think_llm"],
-                google_api_key=self.config["google_api_key"]
-            )
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(
-                model=self.config["quick_think_llm"],
-                google_api_key=self.config["google_api_key"]
-            )
-        elif provider_name == "智谱ai" or provider_name == "zhipuai":
-            # 智谱AI使用OpenAI兼容的API
-            self.deep_thinking_llm = ChatOpenAI(
-                model=self.config["deep_think_llm"],
-                base_url=self.config["api_endpoints"]["zhipuai"],
-                api_key=self.config["zhipuai_api_key"]
-            )
-            self.quick_thinking_llm = ChatOpenAI(
-                model=self.config["quick_think_llm"],
-                base_url=self.config["api_endpoints"]["zhipuai"],
-                api_key=self.config["zhipuai_api_key"]
-            )
-        else:
-            raise ValueError(f"Unsupported LLM provider: {provider_name} (from: {self.config['llm_provider']})")
-        
+        # Initialize LLMs (shared with other graphs configured the same way)
+        self.deep_thinking_llm = get_chat_model(self.config, self.config["deep_think_llm"])
+        self.quick_thinking_llm = get_chat_model(self.config, self.config["quick_think_llm"])
+
+        # Optional disk cache of LLM responses shared by both models
+        self.llm_cache = create_llm_cache(self.config)
+        if self.llm_cache is not None:
+            # Copies, so the shared models stay uncached; the copies keep the shared connections
+            self.deep_thinking_llm = self.deep_thinking_llm.model_copy(update={"cache": self.llm_cache})
+            self.quick_thinking_llm = self.quick_thinking_llm.model_copy(update={"cache": self.llm_cache})
+
         self.toolkit = Toolkit(config=self.config)
 
         # Initialize memories
@@ -156,57 +101,69 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            DebateContext.from_config(self.quick_thinking_llm, self.config),
         )
 
         self.propagator = Propagator()
         self.reflector = Reflector(self.quick_thinking_llm)
-        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
+        self.signal_processor = SignalProcessor(
+            self.quick_thinking_llm,
+            min_confidence=self.config.get("signal_fast_path_min_confidence", 0.8),
+        )
 
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.log_states_dict = {}  # ticker to {date: full state dict}
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            parallel_analysts=self.config.get("parallel_analysts", False),
+        )
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
-        """Create tool nodes for different data sources."""
+        """Create tool nodes for different data sources.
+
+        The tools also run under ``ainvoke``: the OpenAI web-search tools use
+        the async client, the others run on the bounded blocking pool.
+        """
+        toolkit = self.toolkit
         return {
             "market": ToolNode(
                 [
-                    self.toolkit.get_stock_data,
-                    self.toolkit.get_stock_indicators,
+                    as_async_tool(toolkit.get_stock_data),
+                    as_async_tool(toolkit.get_stock_indicators),
                 ]
             ),
             "social": ToolNode(
                 [
                     # online tools
-                    self.toolkit.get_stock_news_openai,
+                    as_async_tool(toolkit.get_stock_news_openai, toolkit.aget_stock_news_openai),
                     # offline tools
-                    self.toolkit.get_reddit_stock_info,
+                    as_async_tool(toolkit.get_reddit_stock_info),
                 ]
             ),
             "news": ToolNode(
                 [
                     # online tools
-                    self.toolkit.get_global_news_openai,
-                    self.toolkit.get_google_news,
+                    as_async_tool(toolkit.get_global_news_openai, toolkit.aget_global_news_openai),
+                    as_async_tool(toolkit.get_google_news),
                     # offline tools
-                    self.toolkit.get_finnhub_news,
-                    self.toolkit.get_reddit_news,
+                    as_async_tool(toolkit.get_finnhub_news),
+                    as_async_tool(toolkit.get_reddit_news),
                 ]
             ),
             "fundamentals": ToolNode(
                 [
                     # online tools
-                    self.toolkit.get_fundamentals,
+                    as_async_tool(toolkit.get_fundamentals, toolkit.aget_fundamentals),
                     # offline tools
-                    self.toolkit.get_finnhub_company_insider_sentiment,
-                    self.toolkit.get_finnhub_company_insider_transactions,
-                    self.toolkit.get_simfin_balance_sheet,
-                    self.toolkit.get_simfin_cashflow,
-                    self.toolkit.get_simfin_income_stmt,
+                    as_async_tool(toolkit.get_finnhub_company_insider_sentiment),
+                    as_async_tool(toolkit.get_finnhub_company_insider_transactions),
+                    as_async_tool(toolkit.get_simfin_balance_sheet),
+                    as_async_tool(toolkit.get_simfin_cashflow),
+                    as_async_tool(toolkit.get_simfin_income_stmt),
                 ]
             ),
         }
@@ -218,37 +175,149 @@ class TradingAgentsGraph:
 
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
+            company_name, trade_date, trade_date
         )
         args = self.propagator.get_graph_args()
 
-        if self.debug:
-            # Debug mode with tracing
-            trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    trace.append(chunk)
-
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+        # Identical tool calls within this run are fetched once; its LLM
+        # requests queue fairly against those of concurrent runs
+        with tool_memo_scope() as tool_memo, llm_flow(f"{company_name}:{trade_date}"):
+            if self.debug:
+                # Debug mode with tracing
+                trace = []
+                for chunk in self.graph.stream(init_agent_state, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+
+                final_state = trace[-1]
+            else:
+                # Standard mode without tracing
+                final_state = self.graph.invoke(init_agent_state, **args)
+            tool_calls = tool_memo.stats()
 
         # Store current state for reflection
         self.curr_state = final_state
 
         # Log state
-        self._log_state(trade_date, final_state)
+        self._log_state(trade_date, final_state, tool_calls)
 
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
-    def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+    async def apropagate(self, company_name, trade_date, callbacks=None):
+        """Async version of :meth:`propagate` built on ``graph.ainvoke``.
+
+        LLM calls use the async clients and blocking data sources run on the
+        bounded blocking pool, so one event loop can drive many analyses.
+        Concurrent runs may share one instance; ``curr_state`` then holds the
+        run that finished last. ``callbacks`` are attached to every LLM call
+        of this run (e.g. to count tokens).
+        """
+        self.ticker = company_name
+
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date, trade_date
+        )
+        args = self.propagator.get_graph_args()
+        if callbacks:
+            args["config"]["callbacks"] = callbacks
+
+        with tool_memo_scope() as tool_memo, llm_flow(f"{company_name}:{trade_date}"):
+            if self.debug:
+                trace = []
+                async for chunk in self.graph.astream(init_agent_state, **args):
+                    if len(chunk["messages"]) > 0:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+
+                final_state = trace[-1]
+            else:
+                final_state = await self.graph.ainvoke(init_agent_state, **args)
+            tool_calls = tool_memo.stats()
+
+        self.curr_state = final_state
+        self._log_state(trade_date, final_state, tool_calls)
+
+        decision = await self.signal_processor.aprocess_signal(
+            final_state["final_trade_decision"], config=args["config"]
+        )
+        return final_state, decision
+
+    def propagate_many(self, jobs, max_concurrency=None, progress_callback=None):
+        """Run many ``(ticker, trade_date)`` jobs with bounded concurrency.
+
+        Returns a :class:`BatchRunner`; iterate it (``for`` or ``async for``)
+        to get each job's result as soon as it finishes, then call its
+        ``summary()`` for jobs/min and tokens/min. A failing job yields a
+        result with ``status == "error"`` instead of stopping the batch.
+        """
+        if max_concurrency is None:
+            max_concurrency = self.config.get("batch_max_concurrency", 4)
+        return BatchRunner(self, jobs, max_concurrency, progress_callback)
+
+    async def astream(self, company_name, trade_date, stream_mode="values"):
+        """Stream graph updates of one run with ``graph.astream``.
+
+        Yields the chunks of *stream_mode*; the final state is neither logged
+        nor turned into a signal (use :meth:`apropagate` for that).
+        """
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date, trade_date
+        )
+        args = self.propagator.get_graph_args()
+        args["stream_mode"] = stream_mode
+
+        with tool_memo_scope(), llm_flow(f"{company_name}:{trade_date}"):
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                yield chunk
+
+    def _stream_args(self, company_name, trade_date, initial_state):
+        if initial_state is None:
+            initial_state = self.propagator.create_initial_state(
+                company_name, trade_date, trade_date
+            )
+        args = self.propagator.get_graph_args()
+        args["stream_mode"] = STREAM_MODES
+        return initial_state, args
+
+    def stream_events(self, company_name, trade_date, initial_state=None):
+        """Run one analysis and yield its events as they happen.
+
+        Besides the state after every node, report text arrives token by
+        token and agents announce when they start; see
+        :mod:`tradingagents.graph.streaming` for the event format.  Like
+        :meth:`astream`, the final state is neither logged nor turned into a
+        signal.
+
+        Args:
+            initial_state: State to start from instead of the default one.
+        """
+        initial_state, args = self._stream_args(company_name, trade_date, initial_state)
+        with tool_memo_scope(), llm_flow(f"{company_name}:{trade_date}"):
+            for mode, payload in self.graph.stream(initial_state, **args):
+                event = to_event(mode, payload)
+                if event is not None:
+                    yield event
+
+    async def astream_events(self, company_name, trade_date, initial_state=None):
+        """Async version of :meth:`stream_events`."""
+        initial_state, args = self._stream_args(company_name, trade_date, initial_state)
+        with tool_memo_scope(), llm_flow(f"{company_name}:{trade_date}"):
+            async for mode, payload in self.graph.astream(initial_state, **args):
+                event = to_event(mode, payload)
+                if event is not None:
+                    yield event
+
+    def _log_state(self, trade_date, final_state, tool_calls=None):
+        """Log the final state to a JSON file.
+
+        ``tool_calls`` holds the run's per-tool call and memo hit counts.
+        """
+        ticker = final_state["company_of_interest"]
+        entry = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -276,36 +345,48 @@ class TradingAgentsGraph:
             },
             "investment_plan": final_state["investment_plan"],
             "final_trade_decision": final_state["final_trade_decision"],
+            "tool_calls": tool_calls or {},
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
+        # Concurrent jobs (propagate_many) share this graph; each ticker's file
+        # holds only that ticker's runs
+        with self._log_lock:
+            ticker_states = self.log_states_dict.setdefault(ticker, {})
+            ticker_states[str(trade_date)] = entry
+
+            # Save to file
+            directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
+            directory.mkdir(parents=True, exist_ok=True)
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+            with open(
+                f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log.json",
+                "w",
+            ) as f:
+                json.dump(ticker_states, f, indent=4)
 
     def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+        """Reflect on decisions and update memory based on returns.
+
+        The five reflections run concurrently (``reflection_max_workers``).
+        Returns the seconds spent per component and in total.
+        """
+        return self.reflector.reflect_all(
+            self.curr_state,
+            returns_losses,
+            {
+                "bull": self.bull_memory,
+                "bear": self.bear_memory,
+                "trader": self.trader_memory,
+                "invest_judge": self.invest_judge_memory,
+                "risk_manager": self.risk_manager_memory,
+            },
+            max_workers=self.config.get("reflection_max_workers"),
         )
 
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    async def aprocess_signal(self, full_signal):
+        """Async version of :meth:`process_signal`."""
+        return await self.signal_processor.aprocess_signal(full_signal)
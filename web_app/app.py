@@ -12,6 +12,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 import json
+import time
 
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent
@@ -22,6 +23,18 @@ from tradingagents.agents.utils.agent_utils import Toolkit
 from tradingagents.dataflows.enhanced_data_source_manager import EnhancedDataSourceManager
 from tradingagents.config.model_capabilities import validate_model_config, get_recommended_config
 from tradingagents.config.model_recommendations import model_recommendations
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+# 多智能体报告各部分的标题
+SECTION_TITLES = {
+    "market_report": "📊 市场分析",
+    "sentiment_report": "💬 社交情绪",
+    "news_report": "📰 新闻分析",
+    "fundamentals_report": "💰 基本面分析",
+    "investment_plan": "🔬 研究团队决策",
+    "trader_investment_plan": "💼 交易计划",
+    "final_trade_decision": "⚖️ 风险管理与最终决策",
+}
 
 # 页面配置
 st.set_page_config(
@@ -173,6 +186,9 @@ def main():
             help="选择要包含的分析师类型"
         )
         
+        # 多智能体分析（报告随模型输出逐字显示）
+        run_agents = st.checkbox("运行多智能体分析", value=False, help="调用LLM生成完整分析报告，报告内容实时流式显示")
+
         # 分析按钮
         analyze_button = st.button("🚀 开始分析", type="primary", use_container_width=True)
     
@@ -209,6 +225,13 @@ def main():
                     
                 except Exception as e:
                     st.error(f"分析过程中出现错误: {e}")
+
+            # 不放在spinner中，报告边生成边显示
+            if run_agents:
+                try:
+                    run_agent_analysis(ticker, end_date.strftime("%Y-%m-%d"), analysts)
+                except Exception as e:
+                    st.error(f"多智能体分析过程中出现错误: {e}")
         else:
             st.info("请在左侧输入股票代码并点击'开始分析'按钮")
     
@@ -235,6 +258,75 @@ def main():
         st.header("系统状态")
         display_system_status()
 
+def run_agent_analysis(ticker, trade_date, analysts):
+    """运行多智能体分析，各部分报告随模型输出逐字显示"""
+    st.subheader("🤖 多智能体分析")
+    graph = TradingAgentsGraph(analysts, config=DEFAULT_CONFIG.copy())
+
+    status = st.empty()
+    placeholders = {}  # 报告部分 -> 显示位置
+    blocks = {}  # 报告部分 -> [[智能体, 本轮生成的文本], ...]，每次模型调用一段
+    finished = {}  # 报告部分 -> 节点完成后状态中的最终文本
+    new_turn = set()  # 刚开始新一轮模型调用、下一个片段需另起一段的智能体
+    last_render = {}
+    final_state = None
+
+    def ensure_section(section):
+        if section not in placeholders:
+            st.markdown(f"### {SECTION_TITLES[section]}")
+            placeholders[section] = st.empty()
+            blocks[section] = []
+
+    def render(section):
+        if section in finished and not blocks[section]:
+            body = finished[section]
+        elif len(blocks[section]) == 1:
+            body = blocks[section][0][1]
+        else:
+            body = "\n\n".join(f"#### {agent}\n{text}" for agent, text in blocks[section])
+        placeholders[section].markdown(body)
+        last_render[section] = time.monotonic()
+
+    for event in graph.stream_events(ticker, trade_date):
+        if event["type"] == "state":
+            final_state = event["state"]
+            # 节点完成后用状态中的最终报告替换逐字拼接的文本
+            for section in SECTION_TITLES:
+                value = final_state.get(section)
+                if value and finished.get(section) != value:
+                    ensure_section(section)
+                    finished[section] = value
+                    blocks[section] = []
+                    render(section)
+            continue
+        status.info(f"🔄 {event['agent']} 正在分析...")
+        if event["type"] == "status":
+            new_turn.add(event["agent"])
+            continue
+        if event["type"] != "token":
+            continue
+
+        section = event["section"]
+        ensure_section(section)
+        agent = event["agent"]
+        section_blocks = blocks[section]
+        if agent in new_turn or not section_blocks or section_blocks[-1][0] != agent:
+            # 新一轮发言（或工具调用后的最终回答）另起一段
+            new_turn.discard(agent)
+            section_blocks.append([agent, ""])
+        section_blocks[-1][1] += event["text"]
+        # 每个部分最多每0.1秒刷新一次
+        if time.monotonic() - last_render.get(section, 0.0) >= 0.1:
+            render(section)
+
+    for section in placeholders:
+        render(section)
+    status.empty()
+
+    if final_state is not None:
+        decision = graph.process_signal(final_state["final_trade_decision"])
+        st.success(f"最终决策: {decision}")
+
 @st.cache_data(ttl=300)  # 缓存5分钟
 def get_company_info(ticker):
     """获取公司信息"""
@@ -407,10 +499,32 @@ def display_data_source_status(ticker):
                     st.success(f"  ✅ {source}: 可用")
                 elif status == "no_data":
                     st.warning(f"  ⚠️ {source}: 无数据")
+                elif status == "degraded":
+                    st.warning(f"  ⚠️ {source}: 部分失败")
+                elif status == "circuit_open":
+                    st.error(f"  ⛔ {source}: 已熔断，暂时跳过")
+                elif status == "half_open":
+                    st.info(f"  🔄 {source}: 熔断恢复探测中")
                 elif status.startswith("error"):
                     st.error(f"  ❌ {source}: {status}")
                 else:
                     st.info(f"  ℹ️ {source}: {status}")
+        
+        # 数据源健康统计（来自实际调用）
+        health = quality_report.get("source_health") or {}
+        if health:
+            st.subheader("数据源健康")
+            rows = []
+            for source, stats in health.items():
+                rows.append({
+                    "数据源": source,
+                    "状态": stats["state"],
+                    "成功率": f"{stats['success_rate']:.0%}" if stats["success_rate"] is not None else "-",
+                    "平均延迟": f"{stats['avg_latency']:.2f}s" if stats["avg_latency"] is not None else "-",
+                    "窗口调用数": stats["window_calls"],
+                    "最近错误": stats["last_error"] or "",
+                })
+            st.dataframe(pd.DataFrame(rows), use_container_width=True)
     
     except Exception as e:
         st.error(f"获取数据源状态失败: {e}")